@@ -0,0 +1,116 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from app.game_logic import CARDS, Card
+
+# Brotli is optional; SVGs are always precompressed with gzip.
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+_MEDIA_TYPES = {"svg": "image/svg+xml", "png": "image/png", "json": "application/json"}
+# PNGs are already compressed
+_COMPRESSIBLE = {"svg", "json"}
+
+_SVG_ROOT = re.compile(r"<svg\b([^>]*)>(.*)</svg>", re.S)
+_SVG_SIZE = re.compile(r'\b(width|height)="(\d+(?:\.\d+)?)(?:px)?"')
+
+
+@dataclass
+class Asset:
+    """One servable file with its precompressed variants, keyed by content encoding."""
+    name: str
+    media_type: str
+    body: bytes
+    encoded: Dict[str, bytes] = field(default_factory=dict)
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.name}"'
+
+
+def card_filename(card: Card, ext: str) -> str:
+    """File name of a card's image in the cards directory."""
+    return f"{card.color}_{card.shape}_{card.number}_{card.shading}.{ext}"
+
+
+def _hashed_name(stem: str, ext: str, body: bytes) -> str:
+    return f"{stem}.{hashlib.sha256(body).hexdigest()[:12]}.{ext}"
+
+
+def _make_asset(stem: str, ext: str, body: bytes) -> Asset:
+    asset = Asset(_hashed_name(stem, ext, body), _MEDIA_TYPES[ext], body)
+    if ext in _COMPRESSIBLE:
+        asset.encoded["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+        if brotli is not None:
+            asset.encoded["br"] = brotli.compress(body, quality=11)
+    return asset
+
+
+def build_sprite(svgs: List[bytes]) -> bytes:
+    """
+    Combines card SVGs, in card code order, into one sprite sheet whose
+    symbols are addressed as #card-<code>.
+    """
+    symbols = []
+    for code, svg in enumerate(svgs):
+        match = _SVG_ROOT.search(svg.decode())
+        if match is None:
+            raise ValueError(f"Card {code} is not an SVG document")
+        size = dict(_SVG_SIZE.findall(match.group(1)))
+        view_box = f'0 0 {size.get("width", "100")} {size.get("height", "150")}'
+        symbols.append(f'<symbol id="card-{code}" viewBox="{view_box}">{match.group(2)}</symbol>')
+    return (
+        '<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink">'
+        + "".join(symbols)
+        + "</svg>"
+    ).encode()
+
+
+class AssetBundle:
+    """
+    Card images served under content-hash names, so they can be cached forever.
+
+    Every card is available as SVG and PNG, and all SVGs are also combined into
+    one sprite sheet, so a client loads the whole deck in a single request.
+    The manifest maps card IDs (the same 0–80 IDs used by the game API) to
+    the current asset URLs.
+    """
+
+    def __init__(self, directory: str, url_prefix: str = "/cards"):
+        self.assets: Dict[str, Asset] = {}
+        cards = {}
+        svgs = []
+        for card in CARDS:
+            urls = {}
+            for ext in ("svg", "png"):
+                filename = card_filename(card, ext)
+                with open(os.path.join(directory, filename), "rb") as f:
+                    body = f.read()
+                asset = self._add(_make_asset(filename.rsplit(".", 1)[0], ext, body))
+                urls[ext] = f"{url_prefix}/{asset.name}"
+                if ext == "svg":
+                    svgs.append(body)
+            cards[card.code] = urls
+
+        sprite = self._add(_make_asset("sprite", "svg", build_sprite(svgs)))
+        self.manifest = {
+            "sprite": f"{url_prefix}/{sprite.name}",
+            "symbol": "card-{id}",
+            "cards": cards,
+        }
+        manifest_body = json.dumps(self.manifest, separators=(",", ":")).encode()
+        self.manifest_asset = _make_asset("manifest", "json", manifest_body)
+
+    def _add(self, asset: Asset) -> Asset:
+        self.assets[asset.name] = asset
+        return asset
+
+    def get(self, name: str) -> Asset | None:
+        return self.assets.get(name)
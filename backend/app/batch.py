@@ -0,0 +1,93 @@
+"""
+Vectorized set validation for bulk workloads (submission replay, audits, load tests).
+
+Requires NumPy (the "batch" extra). Cards are given by their code (Card.code, 0–80).
+"""
+from typing import Sequence
+
+import numpy as np
+
+from app.game_logic import THIRD_CARD
+
+# Sentinel code used to pad boards of different sizes; it never completes a set.
+PAD = 81
+
+# _THIRD[a, b] is the code completing {a, b}; any pair involving PAD maps to PAD.
+_THIRD = np.full((82, 82), PAD, dtype=np.uint8)
+_THIRD[:81, :81] = np.frombuffer(b"".join(THIRD_CARD), dtype=np.uint8).reshape(81, 81)
+
+
+def _as_codes(cards, what: str) -> np.ndarray:
+    codes = np.asarray(cards)
+    if codes.dtype.kind not in "iu":
+        raise TypeError(f"{what} must contain integer card codes")
+    return codes
+
+
+def _check_range(codes: np.ndarray, highest: int) -> None:
+    # negative codes would silently wrap around in the lookup tables
+    if codes.size and (codes.min() < 0 or codes.max() > highest):
+        raise ValueError("card codes must be in 0..80" + (", or PAD" if highest == PAD else ""))
+
+
+def is_set_batch(triples) -> np.ndarray:
+    """
+    Checks many triples at once.
+    :param triples: (N, 3) array-like of card codes.
+    :return np.ndarray: boolean mask of length N, True where the triple is a set.
+    """
+    triples = _as_codes(triples, "triples")
+    if triples.ndim != 2 or triples.shape[1] != 3:
+        raise ValueError("triples must have shape (N, 3)")
+    _check_range(triples, 80)
+    return _THIRD[triples[:, 0], triples[:, 1]] == triples[:, 2]
+
+
+def pack_boards(boards: Sequence[Sequence[int]]) -> np.ndarray:
+    """Packs boards of different sizes into one (B, n) array padded with PAD."""
+    width = max((len(b) for b in boards), default=0)
+    packed = np.full((len(boards), width), PAD, dtype=np.uint8)
+    for row, board in enumerate(boards):
+        codes = _as_codes(board, "boards")
+        _check_range(codes, PAD)
+        packed[row, :len(board)] = codes
+    return packed
+
+
+def find_any_set_batch(boards) -> np.ndarray:
+    """
+    Finds the first set on each of many boards, matching find_any_set.
+    :param boards: (B, n) array of card codes padded with PAD, or a list of boards.
+    :return np.ndarray: (B, 3) array of card codes in board order, -1 where a board has no set.
+    """
+    if not isinstance(boards, np.ndarray):
+        boards = pack_boards(boards)
+    boards = _as_codes(boards, "boards")
+    if boards.ndim != 2:
+        raise ValueError("boards must have shape (B, n)")
+    _check_range(boards, PAD)
+    boards = boards.astype(np.intp, copy=False)
+    count, width = boards.shape
+    result = np.full((count, 3), -1, dtype=np.int16)
+    if width < 3 or count == 0:
+        return result
+
+    # position of each card code on its board, -1 if absent (PAD is always absent)
+    rows = np.arange(count)[:, None]
+    position = np.full((count, 82), -1, dtype=np.int16)
+    position[rows, boards] = np.arange(width, dtype=np.int16)
+    position[:, PAD] = -1
+
+    # pairs in lexicographic order, so the first hit is the first combination
+    i, j = np.triu_indices(width, k=1)
+    third = _THIRD[boards[:, i], boards[:, j]]
+    k = position[rows, third]
+    hits = k > j
+
+    found = hits.any(axis=1)
+    first = hits.argmax(axis=1)[found]
+    winners = np.flatnonzero(found)
+    result[found, 0] = boards[winners, i[first]]
+    result[found, 1] = boards[winners, j[first]]
+    result[found, 2] = boards[winners, k[winners, first]]
+    return result
@@ -0,0 +1,61 @@
+import secrets
+from pathlib import Path
+from typing import List
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_file=".env", env_prefix="SET_", extra="ignore")
+
+    # Token required in the X-Admin-Token header for admin-only endpoints.
+    # Admin endpoints are disabled while it is unset.
+    admin_token: str | None = None
+
+    # SQLite file for persisting games across restarts; in-memory only if unset.
+    database_path: str | None = None
+
+    # Directory for per-game binary event logs and snapshots, used for crash
+    # recovery and replays; no logs are written if unset.
+    event_log_dir: str | None = None
+
+    # Seconds after which a round is resolved with the submissions so far;
+    # rounds wait for every player if unset.
+    round_timeout: float | None = None
+
+    # Matchmaking: games start once match_size players are queued, or with at
+    # least match_min_players once the first has waited match_max_wait seconds.
+    match_size: int = 4
+    match_min_players: int = 2
+    match_max_wait: float = 30.0
+
+    # Metrics players are ranked by on the cross-game leaderboard, any of
+    # wins, best_time and mean_time (of won rounds).
+    leaderboard_metrics: List[str] = ["wins", "best_time", "mean_time"]
+
+    # Seconds between applying the database's changed results rows to the
+    # leaderboard on the default game's shard, which picks up rounds won on
+    # the other shards; only when sharded with a database_path.
+    leaderboard_refresh: float = 5.0
+
+    # This process's shard when games are partitioned across worker
+    # processes, see app.sharding; a single shard serves every game.
+    shard_index: int = 0
+    shard_count: int = 1
+
+    # Requests taking at least this many milliseconds are logged with their
+    # per-phase timings and listed under /admin/slow-requests; off if unset.
+    slow_request_ms: float | None = 250.0
+
+    # Directory holding the card images served under /cards.
+    cards_dir: str = str(Path(__file__).resolve().parents[2] / "cards")
+
+
+settings = Settings()
+
+
+def check_admin_token(token: str | None) -> bool:
+    """True if the given token matches the configured admin token."""
+    if not settings.admin_token or token is None:
+        return False
+    return secrets.compare_digest(token, settings.admin_token)
@@ -0,0 +1,268 @@
+import json
+import logging
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Tuple
+
+from app.leaderboard import global_leaderboard
+from app.stats import global_stats
+
+if TYPE_CHECKING:
+    from app.game_manager import GameManager
+
+logger = logging.getLogger(__name__)
+
+# Record layout: type (u8), payload length (u16), payload.
+JOIN, START, SUBMIT, RESOLVE = 1, 2, 3, 4
+
+_HEADER = struct.Struct("<BH")
+_START = struct.Struct("<Q")            # seed
+_SUBMIT = struct.Struct("<H3Bd")        # player index, 3 card codes, elapsed time
+_RESOLVE = struct.Struct("<I")          # round number
+
+Event = Tuple[int, object]
+
+# Log files are written by one dedicated thread, so requests never block on
+# disk and every file sees its writes in order.
+_file_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="event-log")
+
+
+def flush() -> None:
+    """Blocks until every queued log file write has completed."""
+    _file_writer.submit(lambda: None).result()
+
+
+def _append_file(path: str, data: bytes) -> None:
+    with open(path, "ab") as f:
+        f.write(data)
+
+
+def _replace_file(path: str, data: bytes) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _remove_files(*paths: str) -> None:
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def encode_event(kind: int, payload: bytes) -> bytes:
+    return _HEADER.pack(kind, len(payload)) + payload
+
+
+def decode_events(data: bytes, offset: int = 0) -> Iterator[Tuple[int, Event]]:
+    """
+    Decodes records starting at offset.
+    Yields (offset after the record, (kind, value)); a truncated last record,
+    e.g. from a crash mid-write, is ignored.
+    """
+    end = len(data)
+    while offset + _HEADER.size <= end:
+        kind, length = _HEADER.unpack_from(data, offset)
+        start = offset + _HEADER.size
+        if start + length > end:
+            return
+        payload = data[start:start + length]
+        offset = start + length
+
+        if kind == JOIN:
+            value = payload.decode()
+        elif kind == START:
+            value = _START.unpack(payload)[0]
+        elif kind == SUBMIT:
+            player, a, b, c, elapsed = _SUBMIT.unpack(payload)
+            value = (player, [a, b, c], elapsed)
+        elif kind == RESOLVE:
+            value = _RESOLVE.unpack(payload)[0]
+        else:
+            raise ValueError(f"Unknown event type {kind} at offset {offset}")
+        yield offset, (kind, value)
+
+
+class EventLog:
+    """
+    Append-only binary log of one game's lobby joins, start, submissions and
+    resolutions, with a snapshot of the whole game every snapshot_every events.
+
+    Recovery loads the latest snapshot and replays only the events after it.
+    With path=None everything stays in memory.
+    """
+
+    def __init__(self, path: str | None = None, snapshot_every: int = 200):
+        self.path = path
+        self.snapshot_every = snapshot_every
+        self.buffer = bytearray()
+        self.count = 0
+        # latest snapshot: (log offset it covers, encoded snapshot)
+        self.snapshot: Tuple[int, bytes] | None = None
+
+    @property
+    def snapshot_path(self) -> str | None:
+        return self.path + ".snap" if self.path else None
+
+    def _append(self, gm: "GameManager", record: bytes) -> None:
+        self.buffer += record
+        self.count += 1
+        if self.path:
+            _file_writer.submit(_append_file, self.path, record)
+        if self.count % self.snapshot_every == 0:
+            self.write_snapshot(gm)
+
+    def record_join(self, gm: "GameManager", name: str) -> None:
+        self._append(gm, encode_event(JOIN, name.encode()))
+
+    def record_start(self, gm: "GameManager", seed: int) -> None:
+        self._append(gm, encode_event(START, _START.pack(seed)))
+
+    def record_submit(self, gm: "GameManager", player_index: int, card_ids: List[int], elapsed: float) -> None:
+        self._append(gm, encode_event(SUBMIT, _SUBMIT.pack(player_index, *card_ids, elapsed)))
+
+    def record_resolve(self, gm: "GameManager", round_number: int) -> None:
+        self._append(gm, encode_event(RESOLVE, _RESOLVE.pack(round_number)))
+
+    def write_snapshot(self, gm: "GameManager") -> None:
+        """Stores a snapshot covering every event logged so far."""
+        encoded = json.dumps(
+            {"offset": len(self.buffer), "count": self.count, "game": gm.to_snapshot()},
+            separators=(",", ":"),
+        ).encode()
+        self.snapshot = (len(self.buffer), encoded)
+        if self.path:
+            _file_writer.submit(_replace_file, self.snapshot_path, encoded)
+
+    def delete(self) -> None:
+        """Removes the log and snapshot files, e.g. when the game is dropped."""
+        if self.path:
+            _file_writer.submit(_remove_files, self.path, self.snapshot_path)
+
+    @classmethod
+    def open(cls, path: str, snapshot_every: int = 200) -> "EventLog":
+        """
+        Loads an existing log and its latest snapshot from disk. A torn last
+        record is cut off the file, so new records follow the last complete one.
+        """
+        flush()
+        log = cls(path, snapshot_every)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                log.buffer = bytearray(f.read())
+            end = 0
+            for end, _ in decode_events(log.buffer):
+                log.count += 1
+            if end < len(log.buffer):
+                del log.buffer[end:]
+                os.truncate(path, end)
+        if os.path.exists(log.snapshot_path):
+            with open(log.snapshot_path, "rb") as f:
+                encoded = f.read()
+            log.snapshot = (json.loads(encoded)["offset"], encoded)
+        return log
+
+
+# ----------------------
+# Replay
+# ----------------------
+
+def apply_event(gm: "GameManager", event: Event) -> None:
+    """
+    Applies one logged event to a game that has no log attached.
+    Raises RuntimeError if the game diverges from what was logged.
+    """
+    kind, value = event
+    if kind == JOIN:
+        gm.join_lobby(value)
+    elif kind == START:
+        gm.start_game(value)
+    elif kind == SUBMIT:
+        player_index, card_ids, elapsed = value
+        player = list(gm.game.players)[player_index]
+        if not gm.submit_set(player, card_ids, elapsed):
+            raise RuntimeError(f"Logged submission by {player} was rejected on replay")
+    elif kind == RESOLVE:
+        if gm.game.round_number != value:
+            raise RuntimeError(f"Replay is at round {gm.game.round_number}, log resolves {value}")
+        gm._resolve_round()
+
+
+def replay(log: EventLog, until_round: int | None = None) -> "GameManager":
+    """
+    Rebuilds a game from scratch by replaying its log.
+    With until_round, stops as soon as that round is the current one.
+    """
+    from app.game_manager import GameManager
+
+    gm = GameManager()
+    gm.shared_stats = None
+    gm.leaderboard = None
+    for _, event in decode_events(log.buffer):
+        if until_round is not None and gm.game and gm.game.round_number >= until_round:
+            break
+        apply_event(gm, event)
+    return gm
+
+
+def recover(log: EventLog) -> "GameManager":
+    """Rebuilds a game from its latest snapshot plus the events logged after it."""
+    from app.game_manager import GameManager
+
+    if log.snapshot is None:
+        return replay(log)
+    offset, encoded = log.snapshot
+    gm = GameManager.from_snapshot(json.loads(encoded)["game"])
+    gm.shared_stats = None
+    gm.leaderboard = None
+    for _, event in decode_events(log.buffer, offset):
+        apply_event(gm, event)
+    return gm
+
+
+def verify(log: EventLog) -> Dict:
+    """
+    Checks that replaying from scratch and recovering from the snapshot agree.
+    Returns a report with the final state of both.
+    """
+    full = replay(log)
+    fast = recover(log)
+    return {
+        "events": log.count,
+        "snapshot_offset": log.snapshot[0] if log.snapshot else None,
+        "deterministic": full.to_snapshot() == fast.to_snapshot(),
+        "state": full.get_state(),
+    }
+
+
+def load_logs(
+    directory: str, snapshot_every: int = 200, keep: Callable[[str], bool] = lambda game_id: True
+) -> Dict[str, "GameManager"]:
+    """
+    Recovers every game logged in directory whose id passes keep, keyed by
+    game id, with its log attached again; games that fail to recover are
+    logged and skipped. Their statistics are not yet part of global_stats,
+    nor their won rounds of the leaderboard.
+    """
+    managers = {}
+    for name in sorted(os.listdir(directory)):
+        game_id = name[:-len(".log")]
+        if not name.endswith(".log") or not keep(game_id):
+            continue
+        try:
+            managers[game_id] = load_log(os.path.join(directory, name), snapshot_every)
+        except Exception:
+            # one damaged log must not keep every other game from loading
+            logger.exception("Could not recover game %s from its log", game_id)
+    return managers
+
+
+def load_log(path: str, snapshot_every: int = 200) -> "GameManager":
+    """Recovers the game logged at path, with the log attached again."""
+    log = EventLog.open(path, snapshot_every)
+    gm = recover(log)
+    gm.shared_stats = global_stats
+    gm.leaderboard = global_leaderboard
+    gm.attach_log(log)
+    return gm
@@ -0,0 +1,90 @@
+import asyncio
+import json
+import threading
+from typing import Dict, Set
+
+
+class Event:
+    """An event encoded once and shared by every subscriber."""
+
+    __slots__ = ("text", "sse")
+
+    def __init__(self, payload: Dict):
+        self.text = json.dumps(payload, separators=(",", ":"))
+        self.sse = f"data: {self.text}\n\n".encode()
+
+    @classmethod
+    def raw(cls, text: str) -> "Event":
+        """Wraps already-encoded JSON text."""
+        event = cls.__new__(cls)
+        event.text = text
+        event.sse = f"data: {text}\n\n".encode()
+        return event
+
+
+# Sent in place of the backlog to a subscriber that fell behind.
+RESYNC = Event({"type": "resync"})
+
+
+class Subscriber:
+    """
+    Bounded event queue owned by one connection's event loop.
+    A subscriber that falls more than max_queue events behind has its backlog
+    replaced by a single resync event, telling the client to refetch the state.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_queue: int):
+        self.loop = loop
+        self.queue: asyncio.Queue[Event] = asyncio.Queue(maxsize=max_queue)
+
+    def offer(self, event: Event) -> None:
+        """Queues an event, must run on the subscriber's loop."""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+    async def get(self) -> Event:
+        return await self.queue.get()
+
+
+class EventHub:
+    """
+    Per-game publish/subscribe hub.
+    publish() may be called from any thread; it encodes the event once and
+    hands it to each subscriber's loop without blocking the publisher.
+    """
+
+    def __init__(self, max_queue: int = 64):
+        self.max_queue = max_queue
+        self._subscribers: Set[Subscriber] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> Subscriber:
+        """Registers a subscriber on the running event loop."""
+        sub = Subscriber(asyncio.get_running_loop(), self.max_queue)
+        with self._lock:
+            self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscriber) -> None:
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    def publish(self, payload: Dict) -> None:
+        if not self._subscribers:
+            return
+        event = Event(payload)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            try:
+                sub.loop.call_soon_threadsafe(sub.offer, event)
+            except RuntimeError:
+                # loop already closed, connection is gone
+                self.unsubscribe(sub)
@@ -1,7 +1,19 @@
 from dataclasses import dataclass, field
-from typing import List, Dict
-from itertools import product, combinations
-from random import shuffle
+from typing import Iterable, List, Dict, Tuple
+from itertools import product
+from random import Random, shuffle
+
+from app.history import RoundHistory
+
+COLORS = ("red", "green", "purple")
+SHAPES = ("diamond", "oval", "squiggle")
+NUMBERS = (1, 2, 3)
+SHADINGS = ("solid", "striped", "open")
+
+_COLOR_INDEX = {v: i for i, v in enumerate(COLORS)}
+_SHAPE_INDEX = {v: i for i, v in enumerate(SHAPES)}
+_NUMBER_INDEX = {v: i for i, v in enumerate(NUMBERS)}
+_SHADING_INDEX = {v: i for i, v in enumerate(SHADINGS)}
 
 
 @dataclass(frozen=True)
@@ -10,6 +22,88 @@ class Card:
     shape: str
     number: int
     shading: str
+    # base-3 encoding (0–80): color, shape, number, shading digits
+    code: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        try:
+            code = (
+                _COLOR_INDEX[self.color] * 27
+                + _SHAPE_INDEX[self.shape] * 9
+                + _NUMBER_INDEX[self.number] * 3
+                + _SHADING_INDEX[self.shading]
+            )
+        except KeyError as e:
+            raise ValueError(f"Unknown card attribute: {e.args[0]!r}") from None
+        object.__setattr__(self, "code", code)
+
+    @classmethod
+    def from_code(cls, code: int) -> "Card":
+        """Returns the shared card instance for the given code (0–80)."""
+        return CARDS[code]
+
+
+# All 81 cards, indexed by their code.
+CARDS: Tuple[Card, ...] = tuple(
+    Card(c, s, n, sh) for c, s, n, sh in product(COLORS, SHAPES, NUMBERS, SHADINGS)
+)
+
+# CARD_DIGITS[code] = (color, shape, number, shading) attribute indices
+CARD_DIGITS: Tuple[Tuple[int, int, int, int], ...] = tuple(
+    (code // 27, code // 9 % 3, code // 3 % 3, code % 3) for code in range(81)
+)
+
+
+def _complete_set(a: int, b: int) -> int:
+    """Code of the unique card that forms a set with cards a and b."""
+    return sum(
+        (-(da + db) % 3) * w
+        for da, db, w in zip(CARD_DIGITS[a], CARD_DIGITS[b], (27, 9, 3, 1))
+    )
+
+
+# THIRD_CARD[a][b] is the code of the card completing the set {a, b, ?}
+THIRD_CARD: Tuple[bytes, ...] = tuple(
+    bytes(_complete_set(a, b) for b in range(81)) for a in range(81)
+)
+
+
+# Cards on a regular board; more are dealt only while the board has no set.
+BOARD_SIZE = 12
+
+
+class BoardIndex:
+    """
+    Incrementally maintained set count of a board.
+    Adding or removing a card only checks the pairs involving that card, O(n).
+    """
+
+    def __init__(self, board: Iterable[Card] = ()):
+        self.mask = 0
+        self.codes: set[int] = set()
+        self.count = 0
+        # the board list this index is kept in sync with, see board_index
+        self.board: List[Card] | None = None
+        for card in board:
+            self.add(card)
+
+    def _sets_with(self, code: int) -> int:
+        row = THIRD_CARD[code]
+        mask = self.mask
+        # every set {code, a, b} is seen from both a and b
+        return sum(1 for a in self.codes if mask >> row[a] & 1) // 2
+
+    def add(self, card: Card) -> None:
+        code = card.code
+        self.count += self._sets_with(code)
+        self.codes.add(code)
+        self.mask |= 1 << code
+
+    def remove(self, card: Card) -> None:
+        code = card.code
+        self.codes.discard(code)
+        self.mask &= ~(1 << code)
+        self.count -= self._sets_with(code)
 
 
 @dataclass
@@ -25,25 +119,34 @@ class Game:
     players: Dict[str, Player] = field(default_factory=dict)
     round_number: int = 1
     submissions: Dict[str, Dict] = field(default_factory=dict)
-    history: List[Dict] = field(default_factory=list)
+    history: RoundHistory = field(default_factory=RoundHistory)
     # submissions[player_name] = {"cards": List[Card], "time": int}
+    index: BoardIndex | None = field(default=None, repr=False, compare=False)
 
 
-def create_deck() -> List[Card]:
+def create_deck(seed: int | None = None) -> List[Card]:
     """
     Create a deck of cards.
+    :param seed: optional shuffle seed, the same seed always gives the same deck
     :return List[Card]: Deck of cards.
     """
-    colors = ["red", "green", "purple"]
-    shapes = ["diamond", "oval", "squiggle"]
-    numbers = [1, 2, 3]
-    shadings = ["solid", "striped", "open"]
-
-    deck = [Card(c, s, n, sh) for c, s, n, sh in product(colors, shapes, numbers, shadings)]
-    shuffle(deck)
+    deck = list(CARDS)
+    if seed is None:
+        shuffle(deck)
+    else:
+        Random(seed).shuffle(deck)
     return deck
 
 
+def deck_from_order(order: bytes) -> List[Card]:
+    """
+    Rebuilds a deck from its compact encoding, one card code per byte.
+    :param order: encoded deck, e.g. bytes(card.code for card in deck)
+    :return List[Card]: the shared card instances in that order.
+    """
+    return [CARDS[code] for code in order]
+
+
 def deal_board(deck: List[Card], count: int = 12) -> List[Card]:
     """
     creates the first board of a game
@@ -53,12 +156,46 @@ def deal_board(deck: List[Card], count: int = 12) -> List[Card]:
     """
     board = deck[:count]
     del deck[:count]
-    if find_any_set(board) is None:
-        board.extend(deck[:3])
-        del deck[:3]
+    index = BoardIndex(board)
+    _deal_until_set(board, deck, index)
     return board
 
 
+def _deal_until_set(board: List[Card], deck: List[Card], index: BoardIndex) -> None:
+    """Deals 3 more cards at a time while the board has no set and the deck has cards."""
+    while index.count == 0 and deck:
+        for card in deck[:3]:
+            board.append(card)
+            index.add(card)
+        del deck[:3]
+
+
+def board_index(game: Game) -> BoardIndex:
+    """
+    The game's board index, O(1) while it is in sync.
+    The functions here update the index along with the board. A board that
+    was replaced or grew or shrank behind its back is noticed and the index
+    rebuilt in O(n); after replacing cards of game.board in place, set
+    game.index to None.
+    :param game: current game state.
+    :return BoardIndex: index in sync with game.board.
+    """
+    index = game.index
+    if index is None or index.board is not game.board or len(index.codes) != len(game.board):
+        index = game.index = BoardIndex(game.board)
+        index.board = game.board
+    return index
+
+
+def is_finished(game: Game) -> bool:
+    """
+    A game is over once the deck is empty and no set is left on the board.
+    :param game: current game state.
+    :return bool: True if no further round can be won.
+    """
+    return not game.deck and board_index(game).count == 0
+
+
 def is_set(cards: List[Card]) -> bool:
     """
     checks if the cards are a set
@@ -67,31 +204,77 @@ def is_set(cards: List[Card]) -> bool:
     """
     if len(cards) != 3:
         return False
+    a, b, c = cards
+    return THIRD_CARD[a.code][b.code] == c.code
+
 
-    def all_same_or_all_different(attrs: List) -> bool:
-        """
-        helper function to check if all cards have the same value
-        :param attrs: attributes for checking if all cards have the same value or all cards have different values
-        :return: True if all cards have the same value or all cards have different values False otherwise
-        """
-        return len(set(attrs)) in (1, 3)
-
-    return all(
-        all_same_or_all_different([getattr(card, attr) for card in cards])
-        for attr in ["color", "shape", "number", "shading"]
-    )
 def find_any_set(board: List[Card]) -> List[Card] | None:
     """
     Returns the first set of cards found in the given board.
+    For every pair the third card is looked up in THIRD_CARD, so the search is O(n²).
     :param board: current board state.
     :return List[Card] | None: first set of cards found or None.
     """
-    for cards in combinations(board, 3):
-        if is_set(list(cards)):
-            return list(cards)
+    codes = [card.code for card in board]
+    position = {code: i for i, code in enumerate(codes)}
+    for i, a in enumerate(codes):
+        row = THIRD_CARD[a]
+        for j in range(i + 1, len(codes)):
+            k = position.get(row[codes[j]], -1)
+            if k > j:
+                return [board[i], board[j], board[k]]
     return None
 
 
+def board_mask(board: List[Card]) -> int:
+    """
+    Bitmask of the cards on the board, bit `code` set for every card.
+    :param board: current board state.
+    :return int: membership bitmask.
+    """
+    mask = 0
+    for card in board:
+        mask |= 1 << card.code
+    return mask
+
+
+def find_all_sets(board: List[Card]) -> List[List[Card]]:
+    """
+    Returns every set on the given board, each ordered by card code.
+    :param board: current board state.
+    :return List[List[Card]]: all sets on the board.
+    """
+    by_code = {card.code: card for card in board}
+    codes = sorted(by_code)
+    mask = board_mask(board)
+    sets = []
+    for i, a in enumerate(codes):
+        row = THIRD_CARD[a]
+        for b in codes[i + 1:]:
+            c = row[b]
+            if c > b and mask >> c & 1:
+                sets.append([by_code[a], by_code[b], by_code[c]])
+    return sets
+
+
+def count_sets(board: List[Card]) -> int:
+    """
+    Counts the sets on the given board without building them.
+    :param board: current board state.
+    :return int: number of sets on the board.
+    """
+    codes = sorted({card.code for card in board})
+    mask = board_mask(board)
+    count = 0
+    for i, a in enumerate(codes):
+        row = THIRD_CARD[a]
+        for b in codes[i + 1:]:
+            c = row[b]
+            if c > b and mask >> c & 1:
+                count += 1
+    return count
+
+
 def submit_set(game: Game, player_name: str, selected_cards: List[Card], elapsed_time_ms: int) -> bool:
     """
     Submits a set of cards selected by the given game to the given player.
@@ -132,18 +315,18 @@ def resolve_round(game: Game) -> str | None:
     winning_cards = winning_data["cards"]
 
     # Safely remove winning cards from the board
-    game.board = [c for c in game.board if c not in winning_cards]
-
-    # Replenish board
-    if len(game.deck) >= 3:
-        game.board.extend(game.deck[:3])
-        del game.deck[:3]
-        if find_any_set(game.board) is None:
-            game.board.extend(game.deck[:3])
-            del game.deck[:3]
-    else:
-        game.board.extend(game.deck)
-        game.deck.clear()
+    index = board_index(game)
+    game.board = index.board = [c for c in game.board if c not in winning_cards]
+    for card in winning_cards:
+        index.remove(card)
+
+    # Replenish board back to its regular size, then keep dealing until a set exists
+    refill = game.deck[:max(0, BOARD_SIZE - len(game.board))]
+    del game.deck[:len(refill)]
+    for card in refill:
+        game.board.append(card)
+        index.add(card)
+    _deal_until_set(game.board, game.deck, index)
 
     # Track winner time
     game.players[winner].times.append(winning_data["time"])
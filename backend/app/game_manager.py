@@ -1,59 +1,236 @@
-from typing import Dict, List, Optional
-from app.game_logic import Card, create_deck, deal_board, is_set, resolve_round, Game, Player
+import math
+import secrets
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+from app.events import Event, EventHub, Subscriber
+from app.metrics import BOARD_CARDS, ROUND_RESOLUTION, SET_SEARCH, SUBMISSIONS
+from app.serialization import dumps
+from app.leaderboard import Leaderboard, global_leaderboard
+from app.stats import StatsAggregator, global_stats
+from app.game_logic import (
+    CARDS, Card, create_deck, deal_board, resolve_round, submit_set, Game, Player,
+    board_index, deck_from_order, find_all_sets, is_finished,
+)
+
+if TYPE_CHECKING:
+    from app.event_log import EventLog
+    from app.persistence import Store
+    from app.round_timer import RoundTimer
+
+# Number of most recent rounds included in state snapshots; older rounds
+# are available through get_history.
+STATE_HISTORY_ROUNDS = 10
+
+# Longest player name; keeps names well within the event log's record size.
+MAX_NAME_LENGTH = 64
 
 
 class GameManager:
+    # Card IDs are the card codes, so every game shares one immutable lookup table.
+    card_lookup: Tuple[Card, ...] = CARDS
+
     def __init__(self):
-        self.card_lookup_inv: Dict[Card, int] | None = None
-        self.card_lookup: Dict[int, Card] = {}
         self.game: Optional[Game] = None
+        # Deck shuffle seed and the resulting 81-byte card order, for replays
+        self.seed: int | None = None
+        self.deck_order: bytes = b""
 
         # Lobby / lifecycle
         self.state: str = "lobby"  # lobby | running | finished
         self.lobby_players: List[str] = []
 
+        # Concurrency / registry bookkeeping
+        self.lock = threading.RLock()
+        # Time of the last mutation, subscription or lookup; the registry
+        # sets the clock so idle eviction uses its own
+        self.clock: Callable[[], float] = time.monotonic
+        self.last_active: float = 0.0
+
+        # State versioning: bumped on every mutation, orders pushed events
+        self.version: int = 0
+        self._etag_prefix = secrets.token_hex(4)
+        # Encoded state (JSON and binary wire format), cached until its
+        # content changes (see _state_key); the generation counts those
+        # changes and keys the ETag
+        self._state_key_cached: Tuple | None = None
+        self._state_generation: int = 0
+        self._state_body: bytes | None = None
+        self._state_wire: bytes | None = None
+
+        # Push channel for state deltas
+        self.events = EventHub()
+
+        # Submission time statistics for this game, and the process-wide
+        # aggregate it also feeds (None when replaying, to avoid double counts)
+        self.stats = StatsAggregator()
+        self.shared_stats: StatsAggregator | None = global_stats
+        self.leaderboard: Leaderboard | None = global_leaderboard
+
+        # Optional write-behind persistence, see attach_store
+        self.game_id: str | None = None
+        self.store: Optional["Store"] = None
+
+        # Optional append-only event log, see attach_log
+        self.log: Optional["EventLog"] = None
+
+        # Optional round deadlines, see attach_timer
+        self.timer: Optional["RoundTimer"] = None
+
     # ----------------------
     # Helpers
     # ----------------------
 
     def _card_to_id(self, card: Card) -> int:
         """Maps a card to a stable ID (0–80)."""
-        return self.card_lookup_inv[card]
+        return card.code
 
     def _id_to_card(self, cid: int) -> Card:
-        return self.card_lookup[cid]
+        return CARDS[cid]
+
+    def _bump_version(self) -> None:
+        self.version += 1
+        self.last_active = self.clock()
+
+    def _publish(self, event_type: str, **data) -> None:
+        self.events.publish({"type": event_type, "version": self.version, **data})
+
+    def attach_store(self, game_id: str, store: "Store") -> None:
+        """Persists this game under game_id from now on."""
+        with self.lock:
+            self.game_id = game_id
+            self.store = store
+            store.save_game(game_id, self)
+
+    def attach_log(self, log: "EventLog") -> None:
+        """Records every event of this game to log from now on."""
+        with self.lock:
+            self.log = log
+            if not log.count:
+                log.write_snapshot(self)
+
+    def attach_timer(self, timer: "RoundTimer") -> None:
+        """Resolves rounds when timer's deadline passes, even if not everyone submitted."""
+        with self.lock:
+            self.timer = timer
+            if self.state == "running":
+                timer.schedule(self, self.game.round_number)
+
+    # ----------------------
+    # Snapshots
+    # ----------------------
+
+    def to_snapshot(self) -> Dict:
+        """Complete JSON-serializable game state, see from_snapshot."""
+        with self.lock:
+            snapshot = {
+                "state": self.state,
+                "lobby": list(self.lobby_players),
+                "seed": self.seed,
+                "deck_order": list(self.deck_order),
+                "game": None,
+            }
+            if self.game:
+                snapshot["game"] = {
+                    "deck": [c.code for c in self.game.deck],
+                    "board": [c.code for c in self.game.board],
+                    "round": self.game.round_number,
+                    "players": {n: list(p.times) for n, p in self.game.players.items()},
+                    "submissions": {
+                        n: {"cards": [c.code for c in s["cards"]], "time": s["time"]}
+                        for n, s in self.game.submissions.items()
+                    },
+                    "history": list(self.game.history),
+                }
+            return snapshot
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Dict) -> "GameManager":
+        """Rebuilds a game from to_snapshot output; its stats come from the history."""
+        gm = cls()
+        gm.state = snapshot["state"]
+        gm.lobby_players = list(snapshot["lobby"])
+        gm.seed = snapshot["seed"]
+        gm.deck_order = bytes(snapshot["deck_order"])
+        data = snapshot["game"]
+        if data:
+            game = Game(
+                deck=deck_from_order(data["deck"]),
+                board=deck_from_order(data["board"]),
+                players={n: Player(name=n, times=list(t)) for n, t in data["players"].items()},
+                round_number=data["round"],
+                submissions={
+                    n: {"cards": deck_from_order(s["cards"]), "time": s["time"]}
+                    for n, s in data["submissions"].items()
+                },
+            )
+            for entry in data["history"]:
+                game.history.append(entry["round"], entry["winner"], entry["submissions"])
+                for player, elapsed_time in entry["submissions"].items():
+                    gm.stats.record(player, elapsed_time)
+            gm.game = game
+        return gm
 
     # ----------------------
     # Lobby
     # ----------------------
 
     def join_lobby(self, player_name: str) -> None:
-        if self.state != "lobby":
-            raise RuntimeError("Cannot join, game already started")
+        with self.lock:
+            if self.state != "lobby":
+                raise RuntimeError("Cannot join, game already started")
 
-        if player_name in self.lobby_players:
-            raise ValueError("Player name already taken")
+            if len(player_name) > MAX_NAME_LENGTH:
+                raise ValueError(f"Player name longer than {MAX_NAME_LENGTH} characters")
 
-        self.lobby_players.append(player_name)
+            if player_name in self.lobby_players:
+                raise ValueError("Player name already taken")
 
-    def start_game(self) -> None:
-        if self.state != "lobby":
-            raise RuntimeError("Game already started or finished")
+            self.lobby_players.append(player_name)
+            self._bump_version()
+            self._publish("player_joined", player=player_name)
+            if self.store:
+                self.store.save_game(self.game_id, self)
+            if self.log:
+                self.log.record_join(self, player_name)
 
-        if not self.lobby_players:
-            raise RuntimeError("Cannot start without players")
+    def start_game(self, seed: int | None = None) -> None:
+        """
+        Deals the first board to the lobby players.
+        The deck is shuffled from seed, a random one if not given, so the game
+        can be replayed exactly from its seed and submissions.
+        """
+        with self.lock:
+            if self.state != "lobby":
+                raise RuntimeError("Game already started or finished")
 
-        deck = create_deck()
-        self.card_lookup = {i: card for i, card in enumerate(deck)}
-        self.card_lookup_inv = {card: i for i, card in enumerate(deck)}
+            if not self.lobby_players:
+                raise RuntimeError("Cannot start without players")
 
-        board = deal_board(deck, 12)
+            self.seed = secrets.randbits(63) if seed is None else seed
+            deck = create_deck(self.seed)
+            self.deck_order = bytes(card.code for card in deck)
 
-        players = {name: Player(name=name) for name in self.lobby_players}
-        self.game = Game(deck=deck, board=board, players=players)
+            board = deal_board(deck, 12)
 
-        self.state = "running"
-        self.lobby_players.clear()
+            players = {name: Player(name=name) for name in self.lobby_players}
+            self.game = Game(deck=deck, board=board, players=players)
+
+            self.state = "running"
+            self.lobby_players.clear()
+            self._bump_version()
+            self._publish(
+                "game_started",
+                board=[self._card_to_id(c) for c in board],
+                players=list(players),
+            )
+            if self.store:
+                self.store.save_game(self.game_id, self)
+                self.store.save_players(self.game_id, list(players))
+            if self.log:
+                self.log.record_start(self, self.seed)
+            if self.timer is not None:
+                self.timer.schedule(self, self.game.round_number)
 
     # ----------------------
     # State Snapshot
@@ -61,35 +238,163 @@ class GameManager:
 
     def get_state(self) -> Dict:
         """Return a serializable snapshot of the game state."""
-        if not self.game:
-            return {"state": self.state, "players": self.lobby_players}
-
-        return {
-            "state": self.state,
-            "round": self.game.round_number,
-            "board": [self._card_to_id(c) for c in self.game.board],
-            "players": {
-                name: {"times": p.times} for name, p in self.game.players.items()
-            },
-            "history": getattr(self.game, "history", []),
-        }
+        with self.lock:
+            if not self.game:
+                return {"state": self.state, "players": list(self.lobby_players)}
+
+            return {
+                "state": self.state,
+                "round": self.game.round_number,
+                "board": [self._card_to_id(c) for c in self.game.board],
+                "players": {
+                    name: {"times": list(p.times)}
+                    for name, p in self.game.players.items()
+                },
+                "history": self.game.history.last(STATE_HISTORY_ROUNDS),
+                "rounds_played": len(self.game.history),
+            }
+
+    @property
+    def etag(self) -> str:
+        """
+        Entity tag of the current state content; unlike version, it stays the
+        same across submissions, so pollers get 304s until the round ends.
+        """
+        with self.lock:
+            self._refresh_state_cache()
+            return f'"{self._etag_prefix}-{self._state_generation}"'
+
+    def _state_key(self) -> Tuple:
+        """
+        Changes whenever get_state's content does. Submissions are not part of
+        the state, so the encoding survives a round's submissions; joins grow
+        the lobby and everything else happens at start or resolution.
+        """
+        return (self.state, len(self.lobby_players), self.game.round_number if self.game else 0)
+
+    def _refresh_state_cache(self) -> None:
+        key = self._state_key()
+        if self._state_key_cached != key:
+            self._state_body = self._state_wire = None
+            self._state_key_cached = key
+            self._state_generation += 1
+
+    def get_state_bytes(self) -> Tuple[bytes, str]:
+        """
+        JSON-encoded state snapshot and its ETag.
+        The encoding is cached until the state's content changes.
+        """
+        with self.lock:
+            self._refresh_state_cache()
+            if self._state_body is None:
+                self._state_body = dumps(self.get_state())
+            return self._state_body, self.etag
+
+    def get_state_wire(self) -> Tuple[bytes, str]:
+        """State in the binary wire format (see app.wire) and its ETag, cached likewise."""
+        from app.wire import encode_state
+
+        with self.lock:
+            self._refresh_state_cache()
+            if self._state_wire is None:
+                self._state_wire = encode_state(self)
+            return self._state_wire, f'"{self._etag_prefix}-{self._state_generation}-wire"'
+
+    def subscribe(self) -> Tuple[Subscriber, Event]:
+        """
+        Subscribes to state deltas from the running event loop.
+        Returns the subscriber and a snapshot event of the current state; no
+        delta can slip in between the two.
+        """
+        with self.lock:
+            self.last_active = self.clock()
+            body, _ = self.get_state_bytes()
+            snapshot = Event.raw(
+                f'{{"type":"snapshot","version":{self.version},"state":{body.decode()}}}'
+            )
+            return self.events.subscribe(), snapshot
+
+    def get_stats(self) -> Dict:
+        """Submission time statistics of this game's players."""
+        return self.stats.summary()
+
+    def get_history(self, after: int = 0, limit: int = 100) -> Dict:
+        """Page of resolved rounds after the given round number."""
+        with self.lock:
+            if not self.game:
+                return {"rounds": [], "next": None}
+            rounds = self.game.history.page(after, limit)
+            more = rounds and rounds[-1]["round"] < self.game.history.last_round
+            return {"rounds": rounds, "next": rounds[-1]["round"] if more else None}
+
+    # ----------------------
+    # Set Search
+    # ----------------------
+
+    def count_sets(self) -> int:
+        """Number of sets on the current board (0 outside a running game)."""
+        with self.lock:
+            if not self.game:
+                return 0
+            with SET_SEARCH.time("count_sets"):
+                return board_index(self.game).count
+
+    def find_all_sets(self) -> List[List[int]]:
+        """All sets on the current board as lists of card IDs."""
+        with self.lock:
+            if not self.game:
+                return []
+            with SET_SEARCH.time("find_all_sets"):
+                found = find_all_sets(self.game.board)
+            return [[self._card_to_id(c) for c in cards] for cards in found]
 
     # ----------------------
     # Submissions
     # ----------------------
 
     def submit_set(self, player: str, card_ids: List[int], elapsed_time: float) -> bool:
-        if not self.game or self.state != "running":
-            return False
-        if player not in self.game.players:
-            return False
+        with self.lock:
+            if not self.game or self.state != "running":
+                SUBMISSIONS.inc("not_running")
+                return False
+            if player not in self.game.players:
+                SUBMISSIONS.inc("unknown_player")
+                return False
+            if len(set(card_ids)) != 3 or not all(0 <= cid < len(CARDS) for cid in card_ids):
+                SUBMISSIONS.inc("invalid_cards")
+                return False
+            if not (math.isfinite(elapsed_time) and elapsed_time >= 0):
+                SUBMISSIONS.inc("invalid_time")
+                return False
 
-        cards = [self._id_to_card(cid) for cid in card_ids]
-        if not is_set(cards):
-            return False
+            cards = [self._id_to_card(cid) for cid in card_ids]
+            if not submit_set(self.game, player, cards, elapsed_time):
+                on_board = all(card in self.game.board for card in cards)
+                SUBMISSIONS.inc("not_a_set" if on_board else "not_on_board")
+                return False
+            SUBMISSIONS.inc("accepted")
+            self._bump_version()
+            if self.store:
+                self.store.save_submission(
+                    self.game_id, self.game.round_number, player, card_ids, elapsed_time
+                )
+            if self.log:
+                self.log.record_submit(
+                    self, list(self.game.players).index(player), card_ids, elapsed_time
+                )
+            return True
 
-        self.game.submissions[player] = {"cards": cards, "time": elapsed_time}
-        return True
+    def submit_and_resolve(
+        self, player: str, card_ids: List[int], elapsed_time: float
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Submits a set and resolves the round if it was the last missing submission,
+        as one atomic step. Returns (accepted, winner).
+        """
+        with self.lock:
+            if not self.submit_set(player, card_ids, elapsed_time):
+                return False, None
+            return True, self.try_resolve_round()
 
     # ----------------------
     # Round Resolution
@@ -97,25 +402,66 @@ class GameManager:
 
     def try_resolve_round(self) -> Optional[str]:
         """Only resolves if all players have submitted."""
-        if not self.game or self.state != "running":
-            return None
-
-        if len(self.game.submissions) < len(self.game.players):
-            return None
-
-        winner = resolve_round(self.game)
-
-        # Keep a round history
-        if not hasattr(self.game, "history"):
-            self.game.history = []
-        self.game.history.append(
-            {
-                "round": self.game.round_number - 1,
-                "winner": winner,
-                "submissions": {
-                    p: d["time"] for p, d in self.game.submissions.items()
-                },
-            }
-        )
+        with self.lock:
+            if not self.game or self.state != "running":
+                return None
+
+            if len(self.game.submissions) < len(self.game.players):
+                return None
+
+            return self._resolve_round()
+
+    def _resolve_round(self) -> Optional[str]:
+        """Resolves the current round with whatever has been submitted so far."""
+        with self.lock:
+            if not self.game or self.state != "running" or not self.game.submissions:
+                return None
+
+            start = time.perf_counter()
+            round_number = self.game.round_number
+            times = {p: d["time"] for p, d in self.game.submissions.items()}
+            old_board = [self._card_to_id(c) for c in self.game.board]
+
+            # Record the times before touching the game, so a failure here
+            # leaves the round unresolved instead of half applied
+            for player, elapsed_time in times.items():
+                self.stats.record(player, elapsed_time)
+                if self.shared_stats:
+                    self.shared_stats.record(player, elapsed_time)
+
+            winner = resolve_round(self.game)
+            if is_finished(self.game):
+                self.state = "finished"
+
+            # Keep a round history
+            self.game.history.append(round_number, winner, times)
+            self._bump_version()
+
+            if winner is not None and self.leaderboard is not None:
+                self.leaderboard.record(winner, times[winner])
+
+            new_board = [self._card_to_id(c) for c in self.game.board]
+            self._publish(
+                "round_resolved", round=round_number, winner=winner, submissions=times
+            )
+            self._publish(
+                "board_changed",
+                removed=[cid for cid in old_board if cid not in new_board],
+                added=[cid for cid in new_board if cid not in old_board],
+            )
+            if self.state == "finished":
+                self._publish("game_finished")
+            if self.store:
+                self.store.save_round(self.game_id, round_number, winner, times.get(winner))
+                self.store.save_game(self.game_id, self)
+            if self.log:
+                self.log.record_resolve(self, round_number)
+            if self.timer is not None:
+                if self.state == "running":
+                    self.timer.schedule(self, self.game.round_number)
+                else:
+                    self.timer.cancel(self)
 
-        return winner
+            BOARD_CARDS.observe(len(self.game.board))
+            ROUND_RESOLUTION.observe(time.perf_counter() - start)
+            return winner
@@ -0,0 +1,195 @@
+import os
+import re
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+from app.event_log import EventLog, load_log
+from app.game_manager import GameManager
+from app.sharding import owns
+
+if TYPE_CHECKING:
+    from app.persistence import Store
+    from app.round_timer import RoundTimer
+
+# Shape of the ids create_game hands out (and of "default")
+_GAME_ID = re.compile(r"[A-Za-z0-9_-]+")
+
+
+class GameRegistry:
+    """
+    Holds many independent games keyed by game id.
+
+    Games are kept in least-recently-used order, so evicting idle games only
+    touches the games that are actually expired. A game also counts as active
+    while it changes (submissions, rounds resolved by the round timer,
+    matchmaking) or has subscribers, even if nobody looks it up. Eviction only
+    frees memory: persisted rows and event logs are kept, and looking up an
+    evicted game loads it again from its event log or the store. remove()
+    deletes a game for good. At most max_games games are held in memory.
+
+    The registry lock guards the mapping only; each GameManager has its own
+    lock for game state.
+    """
+
+    def __init__(
+        self,
+        max_idle_seconds: float = 3600.0,
+        max_games: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+        store: Optional["Store"] = None,
+        log_dir: str | None = None,
+        timer: Optional["RoundTimer"] = None,
+    ):
+        self.max_idle_seconds = max_idle_seconds
+        self.max_games = max_games
+        self.store = store
+        # Directory for per-game event logs, none are kept if unset
+        self.log_dir = log_dir
+        # Round deadlines shared by every game, rounds only end on full submission if unset
+        self.timer = timer
+        self._clock = clock
+        self._games: OrderedDict[str, GameManager] = OrderedDict()
+        # when each game was last moved to the end of _games
+        self._ordered_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    def __contains__(self, game_id: str) -> bool:
+        return game_id in self._games
+
+    def create_game(self) -> str:
+        """Creates a new game in lobby state and returns its id."""
+        with self._lock:
+            self._make_room()
+
+            # when sharded, only ids that hash to this process's shard
+            game_id = secrets.token_urlsafe(8)
+            while game_id in self._games or not owns(game_id):
+                game_id = secrets.token_urlsafe(8)
+
+            gm = GameManager()
+            self._attach(game_id, gm)
+            self._games[game_id] = gm
+            return game_id
+
+    def add(self, game_id: str, gm: GameManager) -> None:
+        """
+        Registers an existing game, e.g. one restored from the store.
+        Raises RuntimeError if max_games games are already held.
+        """
+        with self._lock:
+            if game_id in self._games:
+                raise ValueError("Game id already in use")
+            self._make_room()
+            self._attach(game_id, gm)
+            self._games[game_id] = gm
+
+    def _make_room(self) -> None:
+        self._evict_idle()
+        if len(self._games) >= self.max_games:
+            raise RuntimeError("Too many active games")
+
+    def _attach(self, game_id: str, gm: GameManager) -> None:
+        gm.clock = self._clock
+        gm.last_active = self._ordered_at[game_id] = self._clock()
+        if self.store:
+            gm.attach_store(game_id, self.store)
+        if self.log_dir and gm.log is None:
+            gm.attach_log(EventLog(os.path.join(self.log_dir, f"{game_id}.log")))
+        if self.timer is not None:
+            gm.attach_timer(self.timer)
+
+    def _drop(self, game_id: str) -> GameManager:
+        """Forgets a game, keeping what was persisted of it."""
+        gm = self._games.pop(game_id)
+        del self._ordered_at[game_id]
+        if gm.timer is not None:
+            gm.timer.cancel(gm)
+        return gm
+
+    def games(self) -> List[GameManager]:
+        """Snapshot of all registered games."""
+        with self._lock:
+            return list(self._games.values())
+
+    def get(self, game_id: str) -> GameManager:
+        """
+        Returns the game with the given id and marks it as active, loading it
+        again if it was evicted. Raises KeyError for unknown games and
+        RuntimeError if there is no room to load one.
+        """
+        with self._lock:
+            if game_id in self._games:
+                return self._touch(game_id)
+        # read from disk without holding up lookups of other games
+        gm = self._load(game_id)
+        if gm is None:
+            raise KeyError(game_id)
+        with self._lock:
+            if game_id in self._games:
+                # loaded by a concurrent lookup
+                return self._touch(game_id)
+            self._make_room()
+            self._attach(game_id, gm)
+            self._games[game_id] = gm
+            return gm
+
+    def _touch(self, game_id: str) -> GameManager:
+        gm = self._games[game_id]
+        self._games.move_to_end(game_id)
+        gm.last_active = self._ordered_at[game_id] = self._clock()
+        return gm
+
+    def _load(self, game_id: str) -> Optional[GameManager]:
+        """Persisted game with the given id, None if there is none."""
+        # ids end up in file names, so anything but generated ids is unknown
+        if not _GAME_ID.fullmatch(game_id) or not owns(game_id):
+            return None
+        if self.log_dir:
+            # event logs are written event by event, so they win over the
+            # batched write-behind store
+            path = os.path.join(self.log_dir, f"{game_id}.log")
+            if os.path.exists(path):
+                return load_log(path)
+        if self.store:
+            return self.store.load_game(game_id)
+        return None
+
+    def remove(self, game_id: str) -> None:
+        """Drops a game and deletes its persisted rows and event log."""
+        # an evicted game is loaded first, so its log is found and deleted too
+        self.get(game_id)
+        with self._lock:
+            gm = self._drop(game_id)
+            if self.store:
+                self.store.delete_game(game_id)
+            if gm.log:
+                gm.log.delete()
+
+    def evict_idle(self) -> List[str]:
+        """Drops idle games from memory, returns their ids."""
+        with self._lock:
+            return self._evict_idle()
+
+    def _evict_idle(self) -> List[str]:
+        now = self._clock()
+        cutoff = now - self.max_idle_seconds
+        evicted = []
+        while self._games:
+            game_id, gm = next(iter(self._games.items()))
+            if self._ordered_at[game_id] > cutoff:
+                # every later game was moved to the end even more recently
+                break
+            if gm.last_active > cutoff or len(gm.events):
+                # active without being looked up, check again in a while
+                self._games.move_to_end(game_id)
+                self._ordered_at[game_id] = now
+                continue
+            self._drop(game_id)
+            evicted.append(game_id)
+        return evicted
@@ -0,0 +1,94 @@
+from array import array
+from typing import Dict, Iterator, List
+
+
+class RoundHistory:
+    """
+    Append-only round history stored as typed array columns.
+
+    Rounds are consecutive, so only the first round number is kept and the
+    rest are implied by position. Player names are interned to small indices,
+    and each round's submissions live in flat player/time columns addressed by
+    an offsets column. Only the most recent max_rounds rounds are kept.
+    """
+
+    def __init__(self, max_rounds: int = 10_000):
+        self.max_rounds = max_rounds
+        self.first_round = 1
+        self._names: List[str] = []
+        self._name_index: Dict[str, int] = {}
+
+        self._winner = array("h")       # player index per round, -1 for none
+        self._offsets = array("I", [0])  # round i owns submissions [offsets[i], offsets[i + 1])
+        self._sub_player = array("H")
+        self._sub_time = array("d")
+
+    def __len__(self) -> int:
+        return len(self._winner)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return (self._entry(i) for i in range(len(self)))
+
+    def __getitem__(self, index: int) -> Dict:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("history index out of range")
+        return self._entry(index)
+
+    @property
+    def last_round(self) -> int:
+        """Number of the most recent stored round (first_round - 1 if empty)."""
+        return self.first_round + len(self) - 1
+
+    def _player_index(self, name: str) -> int:
+        index = self._name_index.get(name)
+        if index is None:
+            index = self._name_index[name] = len(self._names)
+            self._names.append(name)
+        return index
+
+    def append(self, round_number: int, winner: str | None, submissions: Dict[str, float]) -> None:
+        if not len(self):
+            self.first_round = round_number
+        elif round_number != self.last_round + 1:
+            raise ValueError(f"Expected round {self.last_round + 1}, got {round_number}")
+
+        self._winner.append(-1 if winner is None else self._player_index(winner))
+        for name, elapsed in submissions.items():
+            self._sub_player.append(self._player_index(name))
+            self._sub_time.append(elapsed)
+        self._offsets.append(len(self._sub_time))
+
+        # trim in chunks so the cost of shifting the columns is amortized
+        if len(self) > self.max_rounds + self.max_rounds // 4:
+            self._drop_oldest(len(self) - self.max_rounds)
+
+    def _drop_oldest(self, count: int) -> None:
+        cut = self._offsets[count]
+        del self._winner[:count]
+        del self._sub_player[:cut]
+        del self._sub_time[:cut]
+        self._offsets = array("I", (o - cut for o in self._offsets[count:]))
+        self.first_round += count
+
+    def _entry(self, i: int) -> Dict:
+        winner = self._winner[i]
+        start, end = self._offsets[i], self._offsets[i + 1]
+        return {
+            "round": self.first_round + i,
+            "winner": None if winner < 0 else self._names[winner],
+            "submissions": {
+                self._names[p]: t
+                for p, t in zip(self._sub_player[start:end], self._sub_time[start:end])
+            },
+        }
+
+    def last(self, count: int) -> List[Dict]:
+        """The most recent rounds, oldest first."""
+        return [self._entry(i) for i in range(max(0, len(self) - count), len(self))]
+
+    def page(self, after: int = 0, limit: int = 100) -> List[Dict]:
+        """Up to limit stored rounds with a round number greater than after."""
+        start = max(0, after - self.first_round + 1)
+        return [self._entry(i) for i in range(start, min(len(self), start + limit))]
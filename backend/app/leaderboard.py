@@ -0,0 +1,378 @@
+import asyncio
+import logging
+import threading
+from bisect import bisect_left, insort
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# ----------------------
+# Order Statistics
+# ----------------------
+
+class RankedList:
+    """
+    Sorted list of unique keys with rank (position of a key) and select
+    (key at a position) in O(log n).
+
+    Keys are kept in sorted buckets of load to 2 * load keys. A Fenwick tree
+    over the bucket sizes finds the bucket holding any position, and the
+    bucket maxima find the bucket holding any key. Inserting or removing only
+    shifts keys within one bucket, so the whole structure is a few flat lists
+    instead of one node object per key, which matters at millions of keys.
+    """
+
+    def __init__(self, keys: Iterable = (), load: int = 512):
+        self.load = load
+        self._build(sorted(keys))
+
+    def _build(self, keys: List) -> None:
+        self._buckets = [keys[i:i + self.load] for i in range(0, len(keys), self.load)]
+        self._maxes = [bucket[-1] for bucket in self._buckets]
+        self._len = len(keys)
+        self._rebuild_tree()
+
+    def _rebuild_tree(self) -> None:
+        # 1-based Fenwick tree, built in O(number of buckets)
+        tree = [0] + [len(bucket) for bucket in self._buckets]
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _tree_add(self, pos: int, delta: int) -> None:
+        tree = self._tree
+        size = len(tree)
+        i = pos + 1
+        while i < size:
+            tree[i] += delta
+            i += i & -i
+
+    def _before(self, pos: int) -> int:
+        """Number of keys in the buckets before bucket pos."""
+        tree = self._tree
+        total = 0
+        while pos > 0:
+            total += tree[pos]
+            pos -= pos & -pos
+        return total
+
+    def _locate(self, index: int) -> Tuple[int, int]:
+        """(bucket, offset in bucket) of the key at index."""
+        tree = self._tree
+        pos = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            child = pos + step
+            if child < len(tree) and tree[child] <= index:
+                index -= tree[child]
+                pos = child
+            step >>= 1
+        return pos, index
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator:
+        for bucket in self._buckets:
+            yield from bucket
+
+    def __contains__(self, key) -> bool:
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            return False
+        bucket = self._buckets[pos]
+        i = bisect_left(bucket, key)
+        return bucket[i] == key
+
+    def add(self, key) -> None:
+        if not self._buckets:
+            self._build([key])
+            return
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            pos -= 1
+            self._buckets[pos].append(key)
+            self._maxes[pos] = key
+        else:
+            insort(self._buckets[pos], key)
+        self._len += 1
+
+        bucket = self._buckets[pos]
+        if len(bucket) > 2 * self.load:
+            self._buckets[pos:pos + 1] = [bucket[:self.load], bucket[self.load:]]
+            self._maxes.insert(pos, bucket[self.load - 1])
+            self._rebuild_tree()
+        else:
+            self._tree_add(pos, 1)
+
+    def remove(self, key) -> None:
+        """Removes key; raises ValueError if missing."""
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            raise ValueError(f"{key!r} not in list")
+        bucket = self._buckets[pos]
+        i = bisect_left(bucket, key)
+        if bucket[i] != key:
+            raise ValueError(f"{key!r} not in list")
+        del bucket[i]
+        self._len -= 1
+
+        if not bucket:
+            del self._buckets[pos]
+            del self._maxes[pos]
+            self._rebuild_tree()
+        else:
+            self._maxes[pos] = bucket[-1]
+            self._tree_add(pos, -1)
+
+    def rank(self, key) -> int:
+        """0-based position of key; raises ValueError if missing."""
+        pos = bisect_left(self._maxes, key)
+        if pos < len(self._maxes):
+            bucket = self._buckets[pos]
+            i = bisect_left(bucket, key)
+            if bucket[i] == key:
+                return self._before(pos) + i
+        raise ValueError(f"{key!r} not in list")
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("RankedList index out of range")
+        pos, offset = self._locate(index)
+        return self._buckets[pos][offset]
+
+    def slice(self, start: int, stop: int) -> List:
+        """Keys at positions start to stop (exclusive), in O(log n + stop - start)."""
+        start, stop = max(0, start), min(stop, self._len)
+        if start >= stop:
+            return []
+        pos, offset = self._locate(start)
+        keys: List = []
+        while len(keys) < stop - start:
+            bucket = self._buckets[pos]
+            keys.extend(bucket[offset:offset + stop - start - len(keys)])
+            pos, offset = pos + 1, 0
+        return keys
+
+
+# ----------------------
+# Leaderboard
+# ----------------------
+
+class PlayerResult:
+    """Rounds won by a player and their winning times."""
+
+    __slots__ = ("wins", "best_time", "total_time")
+
+    def __init__(self, wins: int = 0, best_time: float = float("inf"), total_time: float = 0.0):
+        self.wins = wins
+        self.best_time = best_time
+        self.total_time = total_time
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.wins
+
+    def add(self, wins: int, best_time: float, total_time: float) -> None:
+        self.wins += wins
+        self.best_time = min(self.best_time, best_time)
+        self.total_time += total_time
+
+
+# Sort value of each metric; smaller ranks first.
+METRICS = {
+    "wins": lambda r: -r.wins,
+    "best_time": lambda r: r.best_time,
+    "mean_time": lambda r: r.mean_time,
+}
+
+# (player, wins, best time, total time)
+Result = Tuple[str, int, float, float]
+
+
+def aggregate_wins(wins: Iterable[Tuple[str, float]]) -> List[Result]:
+    """Per-player results from (winner, winning time) records, e.g. round history."""
+    players: Dict[str, PlayerResult] = {}
+    for player, elapsed_time in wins:
+        result = players.get(player)
+        if result is None:
+            result = players[player] = PlayerResult()
+        result.add(1, elapsed_time, elapsed_time)
+    return [(name, r.wins, r.best_time, r.total_time) for name, r in players.items()]
+
+
+class Leaderboard:
+    """
+    Players ranked across games by the rounds they won, under each of the
+    configured metrics. Players enter with their first won round; ties are
+    broken by name, so every player has a distinct rank.
+    """
+
+    def __init__(self, metrics: Sequence[str] = tuple(METRICS)):
+        unknown = set(metrics) - set(METRICS)
+        if unknown:
+            raise ValueError(f"Unknown leaderboard metrics: {', '.join(sorted(unknown))}")
+        self.metrics = tuple(metrics)
+        self.players: Dict[str, PlayerResult] = {}
+        self._ranked = {metric: RankedList() for metric in self.metrics}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.players)
+
+    def _key(self, metric: str, player: str, result: PlayerResult) -> Tuple[Any, str]:
+        return METRICS[metric](result), player
+
+    def record(self, player: str, elapsed_time: float) -> None:
+        """Records a round won by player in elapsed_time."""
+        self.add(player, 1, elapsed_time, elapsed_time)
+
+    def add(self, player: str, wins: int, best_time: float, total_time: float) -> None:
+        with self._lock:
+            self._unrank(player).add(wins, best_time, total_time)
+            self._rank(player)
+
+    def update(self, results: Iterable[Result]) -> None:
+        """
+        Replaces the totals of the given players, e.g. rows that changed in a
+        results table, in O(log n) per player.
+        """
+        with self._lock:
+            for player, wins, best_time, total_time in results:
+                result = self._unrank(player)
+                result.wins, result.best_time, result.total_time = wins, best_time, total_time
+                self._rank(player)
+
+    def _unrank(self, player: str) -> PlayerResult:
+        """Takes player out of the rankings, returns their result to change."""
+        result = self.players.get(player)
+        if result is None:
+            return self.players.setdefault(player, PlayerResult())
+        for metric, ranked in self._ranked.items():
+            ranked.remove(self._key(metric, player, result))
+        return result
+
+    def _rank(self, player: str) -> None:
+        result = self.players[player]
+        for metric, ranked in self._ranked.items():
+            ranked.add(self._key(metric, player, result))
+
+    def rebuild(self, results: Iterable[Result]) -> None:
+        """Replaces the contents with the given results, sorting each metric once."""
+        players: Dict[str, PlayerResult] = {}
+        for player, wins, best_time, total_time in results:
+            result = players.get(player)
+            if result is None:
+                result = players[player] = PlayerResult()
+            result.add(wins, best_time, total_time)
+        ranked = {
+            metric: RankedList(self._key(metric, name, r) for name, r in players.items())
+            for metric in self.metrics
+        }
+        with self._lock:
+            self.players = players
+            self._ranked = ranked
+
+    # ----------------------
+    # Queries
+    # ----------------------
+
+    def _ranked_for(self, metric: str) -> RankedList:
+        try:
+            return self._ranked[metric]
+        except KeyError:
+            raise ValueError(f"Leaderboard metric not enabled: {metric}")
+
+    def _entries(self, keys: List[Tuple[Any, str]], first_rank: int) -> List[Dict]:
+        entries = []
+        for rank, (_, player) in enumerate(keys, first_rank):
+            result = self.players[player]
+            entries.append({
+                "rank": rank,
+                "player": player,
+                "wins": result.wins,
+                "best_time": result.best_time,
+                "mean_time": result.mean_time,
+            })
+        return entries
+
+    def top(self, metric: str, count: int, offset: int = 0) -> List[Dict]:
+        """Entries ranked offset + 1 to offset + count; ranks are 1-based."""
+        with self._lock:
+            ranked = self._ranked_for(metric)
+            return self._entries(ranked.slice(offset, offset + count), offset + 1)
+
+    def rank(self, metric: str, player: str) -> int | None:
+        """1-based rank of player, None if they have not won a round."""
+        with self._lock:
+            ranked = self._ranked_for(metric)
+            result = self.players.get(player)
+            if result is None:
+                return None
+            return ranked.rank(self._key(metric, player, result)) + 1
+
+    def player(self, player: str) -> Dict | None:
+        """A player's results and rank under every metric."""
+        with self._lock:
+            result = self.players.get(player)
+            if result is None:
+                return None
+            return {
+                "player": player,
+                "wins": result.wins,
+                "best_time": result.best_time,
+                "mean_time": result.mean_time,
+                "ranks": {
+                    metric: ranked.rank(self._key(metric, player, result)) + 1
+                    for metric, ranked in self._ranked.items()
+                },
+            }
+
+    def around(self, metric: str, player: str, radius: int) -> List[Dict] | None:
+        """Entries up to radius ranks above and below player, None if unranked."""
+        with self._lock:
+            ranked = self._ranked_for(metric)
+            result = self.players.get(player)
+            if result is None:
+                return None
+            index = ranked.rank(self._key(metric, player, result))
+            start = max(0, index - radius)
+            return self._entries(ranked.slice(start, index + radius + 1), start + 1)
+
+
+async def follow_results(
+    leaderboard: Leaderboard,
+    load_since: Callable[[int], Tuple[List[Result], int]],
+    seq: int,
+    interval: float,
+) -> None:
+    """
+    Every interval seconds, applies the results changed since seq, as returned
+    by load_since(seq) together with the next seq, e.g. Store.load_results_since
+    on the results table other processes write to. Loading runs in a worker
+    thread and only the changed players are re-ranked, so the event loop is
+    never held up by the size of the leaderboard. A failed load is logged and
+    retried at the next interval.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            results, seq = await run_in_threadpool(load_since, seq)
+        except Exception:
+            logger.exception("Failed to reload the leaderboard")
+            continue
+        leaderboard.update(results)
+
+
+# Round winners across every game hosted by this process, or by every shard
+# when sharded with a shared database (see app.main).
+global_leaderboard = Leaderboard(settings.leaderboard_metrics)
@@ -1,65 +1,248 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from typing import List
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response, WebSocket
+from starlette.concurrency import run_in_threadpool
+
+from app.config import check_admin_token, settings
+from app.event_log import EventLog, load_logs
 from app.game_manager import GameManager
+from app.leaderboard import aggregate_wins, follow_results, global_leaderboard
+from app import metrics, profiling
+from app.persistence import Store
+from app.round_timer import RoundTimer
+from app.sharding import DEFAULT_GAME_ID, owns
+from app.routes import assets, games, handlers, leaderboard, matchmaking
+from app.schemas import GameState, JoinRequest, SubmitResponse
+from app.stats import global_stats
+from app.wire import accepts_wire
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """
+    Restores persisted and logged games (their statistics, and unfinished
+    games into the registry) and starts the round timer and matchmaking on
+    startup; stops them and flushes pending writes on shutdown.
+    """
+    global gm
+    log_dir = settings.event_log_dir
+    store = Store(settings.database_path) if settings.database_path else None
+    restored = store.load_games() if store else {}
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+        # event logs are written event by event, so they win over the
+        # batched write-behind store
+        restored.update(load_logs(log_dir, keep=owns))
+    # when sharded, other processes serve the rest
+    restored = {game_id: g for game_id, g in restored.items() if owns(game_id)}
+    for restored_gm in restored.values():
+        global_stats.merge(restored_gm.stats)
+    if store:
+        # the store keeps results of deleted games too
+        results, results_seq = store.load_results_since(0)
+        global_leaderboard.rebuild(results)
+    elif log_dir:
+        global_leaderboard.rebuild(aggregate_wins(
+            (entry["winner"], entry["submissions"][entry["winner"]])
+            for restored_gm in restored.values() if restored_gm.game
+            for entry in restored_gm.game.history if entry["winner"] is not None
+        ))
+
+    timer = RoundTimer(settings.round_timeout) if settings.round_timeout else None
+    if timer is not None:
+        timer.start()
+    if owns(DEFAULT_GAME_ID):
+        gm = restored.pop(DEFAULT_GAME_ID, gm)
+        if store:
+            gm.attach_store(DEFAULT_GAME_ID, store)
+        if log_dir and gm.log is None:
+            gm.attach_log(EventLog(os.path.join(log_dir, f"{DEFAULT_GAME_ID}.log")))
+        if timer is not None:
+            gm.attach_timer(timer)
+
+    games.registry.store = store
+    games.registry.log_dir = log_dir
+    games.registry.timer = timer
+    # only games still being played are held in memory, up to max_games;
+    # the rest stay on disk and are loaded again when looked up
+    for game_id, restored_gm in restored.items():
+        if restored_gm.state == "finished":
+            continue
+        try:
+            games.registry.add(game_id, restored_gm)
+        except RuntimeError:
+            break
+    matchmaking.matchmaker.start()
+
+    refresher = None
+    if store and settings.shard_count > 1 and owns(DEFAULT_GAME_ID):
+        # /leaderboard is served here; the other shards' wins reach it
+        # through the results table they all write to
+        def load_results_since(seq):
+            store.flush()  # so this shard's own recent wins are included
+            return store.load_results_since(seq)
+
+        refresher = asyncio.get_running_loop().create_task(follow_results(
+            global_leaderboard, load_results_since, results_seq, settings.leaderboard_refresh
+        ))
+    try:
+        yield
+    finally:
+        if refresher is not None:
+            refresher.cancel()
+        await matchmaking.matchmaker.stop()
+        if timer is not None:
+            await timer.stop()
+        if store:
+            store.close()
+
 
-app = FastAPI(title="Set Game API")
+app = FastAPI(title="Set Game API", lifespan=lifespan)
+app.include_router(games.router)
+app.include_router(assets.router)
+app.include_router(matchmaking.router)
+app.include_router(leaderboard.router)
+app.add_middleware(profiling.SlowRequestMiddleware)
+app.add_middleware(metrics.MetricsMiddleware)
+
+# Default game served by the un-scoped /lobby and /game routes.
 gm = GameManager()
 
 # ----------------------
-# Request Models
+# Lobby
 # ----------------------
 
-class JoinRequest(BaseModel):
-    name: str
+@app.post("/lobby/join", response_model=GameState)
+async def join_lobby(req: JoinRequest):
+    return handlers.join_lobby(gm, req.name)
 
-class SubmitRequest(BaseModel):
-    player: str
-    cards: List[int]
-    elapsed_time: float
+@app.post("/lobby/start", response_model=GameState)
+async def start_game(seed: int | None = Query(default=None, ge=0, lt=2**63)):
+    """Starts the game; an optional seed makes the deck reproducible."""
+    return handlers.start_game(gm, seed)
 
 
 # ----------------------
-# Lobby
+# Game
 # ----------------------
 
-@app.post("/lobby/join", status_code=200)
-def join_lobby(req: JoinRequest):
-    try:
-        gm.join_lobby(req.name)
-    except (ValueError, RuntimeError) as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    return gm.get_state()
+@app.get("/game/state", response_model=GameState)
+async def get_state(
+    if_none_match: str | None = Header(default=None),
+    accept: str | None = Header(default=None),
+):
+    """JSON state, or the binary wire format (see app.wire) if accepted."""
+    return handlers.get_state(gm, if_none_match, accept)
 
-@app.post("/lobby/start")
-def start_game():
-    try:
-        gm.start_game()
-    except RuntimeError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    return gm.get_state()
+@app.get("/game/history")
+async def get_history(after: int = 0, limit: int = Query(default=100, ge=1, le=1000)):
+    """Resolved rounds after the given round number, oldest first."""
+    return handlers.get_history(gm, after, limit)
+
+@app.get("/game/stats")
+async def get_game_stats():
+    return gm.get_stats()
+
+@app.get("/game/sets")
+async def get_sets(x_admin_token: str | None = Header(default=None)):
+    """Number of sets on the board; admins also get the sets themselves."""
+    return handlers.get_sets(gm, x_admin_token)
+
+@app.post("/game/submit", response_model=SubmitResponse, openapi_extra=handlers.SUBMIT_BODY)
+async def submit_set(request: Request, accept: str | None = Header(default=None)):
+    """Takes and returns JSON or the binary wire format (see app.wire)."""
+    req = await handlers.read_submission(request)
+    return handlers.submit_set(gm, req, accepts_wire(accept))
+
+@app.websocket("/game/events")
+async def events_ws(websocket: WebSocket):
+    await handlers.stream_websocket(gm, websocket)
+
+@app.get("/game/events")
+async def events_sse():
+    return handlers.stream_sse(gm)
 
 
 # ----------------------
-# Game
+# Statistics
+# ----------------------
+
+@app.get("/stats")
+async def get_stats(player: str | None = None):
+    """Submission time statistics across all games, or for one player."""
+    if player is None:
+        return global_stats.summary(include_players=False)
+    summary = global_stats.player_summary(player)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Unknown player")
+    return summary
+
+
+# ----------------------
+# Metrics
+# ----------------------
+
+def _all_games():
+    return [gm, *games.registry.games()]
+
+def _games_by_state():
+    counts = {("lobby",): 0, ("running",): 0, ("finished",): 0}
+    for g in _all_games():
+        counts[(g.state,)] += 1
+    return counts
+
+def _players_by_state():
+    counts = {("lobby",): 0, ("running",): 0, ("finished",): 0}
+    for g in _all_games():
+        counts[(g.state,)] += len(g.game.players) if g.game else len(g.lobby_players)
+    return counts
+
+def _cards_left():
+    return {(): sum(len(g.game.deck) for g in _all_games() if g.game and g.state == "running")}
+
+metrics.Gauge("set_games", "Games hosted by this process, by state.", ["state"], _games_by_state)
+metrics.Gauge("set_players", "Players in games hosted by this process, by game state.", ["state"], _players_by_state)
+metrics.Gauge("set_deck_cards_remaining", "Cards left in the decks of running games.", (), _cards_left)
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus metrics of this process."""
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
+# ----------------------
+# Admin
 # ----------------------
 
-@app.get("/game/state")
-def get_state():
-    return gm.get_state()
-
-@app.post("/game/submit")
-def submit_set(req: SubmitRequest):
-    if gm.state != "running":
-        raise HTTPException(status_code=400, detail="Game not running")
-
-    success = gm.submit_set(req.player, req.cards, req.elapsed_time)
-    if not success:
-        raise HTTPException(status_code=400, detail="Invalid submission")
-
-    winner = gm.try_resolve_round()
-    return {
-        "success": True,
-        "winner": winner,
-        "state": gm.get_state()
-    }
+def _require_admin(token: str | None) -> None:
+    if not check_admin_token(token):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+@app.post("/admin/profile")
+async def profile(
+    seconds: float = Query(default=10.0, gt=0, le=60),
+    interval_ms: float = Query(default=5.0, ge=1, le=1000),
+    x_admin_token: str | None = Header(default=None),
+):
+    """
+    Samples the stacks of all threads, including the event loop, for the given
+    time and returns them as collapsed stacks for flamegraph.pl or speedscope.
+    """
+    _require_admin(x_admin_token)
+    try:
+        counts = await run_in_threadpool(profiling.sample_stacks, seconds, interval_ms / 1000)
+    except profiling.ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return Response(
+        content=profiling.collapsed(counts),
+        media_type="text/plain",
+        headers={"Content-Disposition": 'attachment; filename="profile.folded"'},
+    )
+
+@app.get("/admin/slow-requests")
+async def get_slow_requests(x_admin_token: str | None = Header(default=None)):
+    """Recent requests slower than SET_SLOW_REQUEST_MS with their phase timings, newest first."""
+    _require_admin(x_admin_token)
+    return {"threshold_ms": settings.slow_request_ms, "requests": profiling.recent_slow_requests()}
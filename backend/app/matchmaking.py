@@ -0,0 +1,177 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from app.game_manager import MAX_NAME_LENGTH
+from app.metrics import MATCHMAKING_WAIT
+
+if TYPE_CHECKING:
+    from app.game_registry import GameRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class Matchmaker:
+    """
+    Queue of players waiting for a game, filling games in the registry.
+
+    Players are matched in arrival order: a game is created and started as
+    soon as game_size players are queued, or once the longest-waiting player
+    has waited max_wait seconds and at least min_players are queued. Matched
+    players can look up their game id for assignment_ttl seconds.
+
+    The queue is an ordered dict, so joining, leaving and membership checks
+    are O(1) however many players are waiting.
+    """
+
+    def __init__(
+        self,
+        registry: "GameRegistry",
+        game_size: int = 4,
+        max_wait: float = 30.0,
+        min_players: int = 2,
+        assignment_ttl: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not 1 <= min_players <= game_size:
+            raise ValueError("Need 1 <= min_players <= game_size")
+        self.registry = registry
+        self.game_size = game_size
+        self.max_wait = max_wait
+        self.min_players = min_players
+        self.assignment_ttl = assignment_ttl
+        self._clock = clock
+        # name -> time queued, oldest first
+        self._queue: OrderedDict[str, float] = OrderedDict()
+        # name -> (game id, time matched), oldest first
+        self._matched: OrderedDict[str, Tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._queue
+
+    # ----------------------
+    # Queue
+    # ----------------------
+
+    def join(self, name: str) -> Optional[str]:
+        """
+        Queues a player.
+        :param name: Player name, unique among queued players
+        :return: Id of the game this join filled, None while the player waits
+        """
+        if len(name) > MAX_NAME_LENGTH:
+            # rejected here, not when a full game is already being formed
+            raise ValueError(f"Player name longer than {MAX_NAME_LENGTH} characters")
+        with self._lock:
+            if name in self._queue:
+                raise ValueError("Player already queued")
+            # a previous match is forgotten once the player queues again
+            self._matched.pop(name, None)
+            self._queue[name] = self._clock()
+            if len(self._queue) < self.game_size:
+                return None
+            return self._form(self.game_size)
+
+    def leave(self, name: str) -> None:
+        """Removes a waiting player; raises KeyError if not queued."""
+        with self._lock:
+            del self._queue[name]
+
+    def status(self, name: str) -> Dict:
+        """Queue or match status of a player; raises KeyError if unknown."""
+        with self._lock:
+            queued_at = self._queue.get(name)
+            if queued_at is not None:
+                return {"status": "queued", "waited": self._clock() - queued_at}
+            game_id, _ = self._matched[name]
+            return {"status": "matched", "game_id": game_id}
+
+    def summary(self) -> Dict:
+        with self._lock:
+            return {
+                "queued": len(self._queue),
+                "game_size": self.game_size,
+                "min_players": self.min_players,
+                "max_wait": self.max_wait,
+            }
+
+    # ----------------------
+    # Matching
+    # ----------------------
+
+    def _form(self, size: int) -> Optional[str]:
+        """Starts a game with the size longest-waiting players; call with the lock held."""
+        try:
+            game_id = self.registry.create_game()
+        except RuntimeError:
+            # registry full, players stay queued until a tick finds room
+            return None
+        gm = self.registry.get(game_id)
+        now = self._clock()
+        names = []
+        for _ in range(size):
+            name, queued_at = self._queue.popitem(last=False)
+            MATCHMAKING_WAIT.observe(now - queued_at)
+            names.append(name)
+        with gm.lock:
+            for name in names:
+                gm.join_lobby(name)
+            gm.start_game()
+        for name in names:
+            self._matched[name] = (game_id, now)
+        return game_id
+
+    def tick(self) -> List[str]:
+        """
+        Starts games for players who waited max_wait and forgets expired
+        matches. Returns the ids of the games started.
+        """
+        with self._lock:
+            now = self._clock()
+            cutoff = now - self.assignment_ttl
+            while self._matched:
+                _, (_, matched_at) = next(iter(self._matched.items()))
+                if matched_at > cutoff:
+                    break
+                self._matched.popitem(last=False)
+
+            started = []
+            while len(self._queue) >= self.min_players:
+                oldest = next(iter(self._queue.values()))
+                if now - oldest < self.max_wait:
+                    break
+                game_id = self._form(min(len(self._queue), self.game_size))
+                if game_id is None:
+                    break
+                started.append(game_id)
+            return started
+
+    async def run(self, interval: float = 0.5) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.tick()
+            except Exception:
+                logger.exception("Matchmaking tick failed")
+
+    def start(self) -> None:
+        """Starts matching waiting players on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
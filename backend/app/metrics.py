@@ -0,0 +1,231 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Sequence, Tuple
+
+# Latency buckets in seconds, from 50 us to 2.5 s.
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[str, ...]
+
+
+class Metric:
+    """
+    Base of the metric types, rendered in the Prometheus text format.
+
+    Recording never takes a lock: every thread updates its own cell (a dict
+    keyed by label values) and a scrape sums the cells of all threads.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._cells: List[Dict] = []
+        self._lock = threading.Lock()  # guards _cells, taken once per thread
+        REGISTRY.append(self)
+
+    def _cell(self) -> Dict:
+        try:
+            return self._local.cell
+        except AttributeError:
+            cell = self._local.cell = {}
+            with self._lock:
+                self._cells.append(cell)
+            return cell
+
+    def _snapshot(self) -> List[Tuple[Labels, object]]:
+        with self._lock:
+            cells = list(self._cells)
+        # list(dict.items()) copies atomically under the GIL
+        return [item for cell in cells for item in list(cell.items())]
+
+    def _label_text(self, values: Labels, extra: str = "") -> str:
+        pairs = [f'{n}="{_escape(v)}"' for n, v in zip(self.labelnames, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", *self.samples()]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        cell = self._cell()
+        cell[labels] = cell.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return sum(v for key, v in self._snapshot() if key == labels)
+
+    def samples(self) -> List[str]:
+        totals: Dict[Labels, float] = {}
+        for labels, value in self._snapshot():
+            totals[labels] = totals.get(labels, 0) + value
+        return [f"{self.name}{self._label_text(k)} {_num(v)}" for k, v in sorted(totals.items())]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels: str) -> None:
+        cell = self._cell()
+        counts = cell.get(labels)
+        if counts is None:
+            # one count per bucket, one for +Inf, then the sum
+            counts = cell[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def time(self, *labels: str) -> "_Timer":
+        """Context manager observing the duration of its block."""
+        return _Timer(self, labels)
+
+    def count(self, *labels: str) -> int:
+        return sum(sum(c[:-1]) for key, c in self._snapshot() if key == labels)
+
+    def samples(self) -> List[str]:
+        totals: Dict[Labels, List] = {}
+        for labels, counts in self._snapshot():
+            total = totals.setdefault(labels, [0] * len(counts))
+            for i, c in enumerate(list(counts)):
+                total[i] += c
+        lines = []
+        for labels, counts in sorted(totals.items()):
+            cumulative = 0
+            for bound, c in zip((*self.buckets, "+Inf"), counts):
+                cumulative += c
+                le = f'le="{bound if bound == "+Inf" else _num(bound)}"'
+                lines.append(f"{self.name}_bucket{self._label_text(labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{self._label_text(labels)} {_num(counts[-1])}")
+            lines.append(f"{self.name}_count{self._label_text(labels)} {cumulative}")
+        return lines
+
+
+class Gauge(Metric):
+    """Value computed at scrape time by a callback returning {label values: value}."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 collect: Callable[[], Dict[Labels, float]] = dict):
+        super().__init__(name, help, labelnames)
+        self.collect = collect
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{self._label_text(k)} {_num(v)}" for k, v in sorted(self.collect().items())]
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram: Histogram, labels: Labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, *self.labels)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _num(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+REGISTRY: List[Metric] = []
+
+
+def render() -> bytes:
+    """All registered metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return ("\n".join(lines) + "\n").encode()
+
+
+# ----------------------
+# Game Metrics
+# ----------------------
+
+SUBMISSIONS = Counter(
+    "set_submissions_total",
+    "Set submissions by result: accepted or the reason for rejection.",
+    ["result"],
+)
+ROUND_RESOLUTION = Histogram(
+    "set_round_resolution_seconds", "Time to resolve a round, including persistence and events."
+)
+SET_SEARCH = Histogram(
+    "set_board_search_seconds", "Set searches on a game's board, by operation.", ["op"]
+)
+BOARD_CARDS = Histogram(
+    "set_board_cards", "Cards on the board after each round resolution.", buckets=(12, 15, 18, 21)
+)
+MATCHMAKING_WAIT = Histogram(
+    "set_matchmaking_wait_seconds",
+    "Time players spent in the matchmaking queue before being placed in a game.",
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120),
+)
+HTTP_LATENCY = Histogram(
+    "set_http_request_duration_seconds",
+    "Time until the response headers are sent, by route.",
+    ["method", "route", "status"],
+)
+
+
+# ----------------------
+# HTTP Middleware
+# ----------------------
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request by its route template.
+    Streaming responses are timed until their headers are sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter()
+
+        async def send_timed(message):
+            if message["type"] == "http.response.start":
+                route = scope.get("route")
+                HTTP_LATENCY.observe(
+                    time.perf_counter() - start,
+                    scope["method"],
+                    route.path if route is not None else "unmatched",
+                    str(message["status"]),
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_timed)
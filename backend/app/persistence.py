@@ -0,0 +1,340 @@
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from sqlalchemy import (
+    Column, Float, Integer, LargeBinary, MetaData, String, Table, Text,
+    create_engine, delete, event, func, select,
+)
+from sqlalchemy.dialects.sqlite import insert
+
+from app.game_logic import Game, Player, deck_from_order
+
+if TYPE_CHECKING:
+    from app.game_manager import GameManager
+
+logger = logging.getLogger(__name__)
+
+metadata = MetaData()
+
+# Card collections are stored as byte strings of card IDs (one byte per card).
+# games.seed and games.deck_order record how the deck was shuffled, for replays.
+games_table = Table(
+    "games", metadata,
+    Column("id", String, primary_key=True),
+    Column("state", String, nullable=False),
+    Column("round", Integer, nullable=False),
+    Column("lobby", Text, nullable=False),  # JSON list of names
+    Column("seed", Integer),
+    Column("deck_order", LargeBinary, nullable=False),
+    Column("deck", LargeBinary, nullable=False),
+    Column("board", LargeBinary, nullable=False),
+)
+
+players_table = Table(
+    "players", metadata,
+    Column("game_id", String, primary_key=True),
+    Column("position", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+)
+
+submissions_table = Table(
+    "submissions", metadata,
+    Column("game_id", String, primary_key=True),
+    Column("round", Integer, primary_key=True),
+    Column("player", String, primary_key=True),
+    Column("cards", LargeBinary, nullable=False),
+    Column("time", Float, nullable=False),
+)
+
+rounds_table = Table(
+    "rounds", metadata,
+    Column("game_id", String, primary_key=True),
+    Column("round", Integer, primary_key=True),
+    Column("winner", String),
+    Column("time", Float),
+)
+
+_CHILD_TABLES = (players_table, submissions_table, rounds_table)
+
+# Won rounds per player across all games, for the leaderboard. Unlike the
+# tables above, rows outlive the games they came from. seq increases with
+# every change to a row, across all processes sharing the database, so
+# readers can pick up just the rows changed since they last looked.
+results_table = Table(
+    "results", metadata,
+    Column("player", String, primary_key=True),
+    Column("wins", Integer, nullable=False),
+    Column("best_time", Float, nullable=False),
+    Column("total_time", Float, nullable=False),
+    Column("seq", Integer, nullable=False, index=True),
+)
+
+
+class Store:
+    """
+    SQLite persistence with write-behind batching.
+
+    Writes are queued by the game managers and applied by a background thread
+    in one transaction per flush interval. Repeated snapshots of the same game
+    within a batch collapse into a single row update.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 0.05):
+        self.flush_interval = flush_interval
+        self.engine = create_engine(f"sqlite:///{path}")
+        event.listen(self.engine, "connect", _configure_connection)
+        metadata.create_all(self.engine)
+
+        self._pending: List = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self._writer = threading.Thread(target=self._run, name="store-writer", daemon=True)
+        self._writer.start()
+
+    # ----------------------
+    # Queueing
+    # ----------------------
+
+    def _enqueue(self, op: tuple) -> None:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Store is closed")
+            self._pending.append(op)
+            self._cond.notify()
+
+    def save_game(self, game_id: str, gm: "GameManager") -> None:
+        """Queues a snapshot of the game row; call with the game lock held."""
+        game = gm.game
+        self._enqueue(("game", game_id, {
+            "id": game_id,
+            "state": gm.state,
+            "round": game.round_number if game else 0,
+            "lobby": json.dumps(gm.lobby_players),
+            "seed": gm.seed,
+            "deck_order": gm.deck_order,
+            "deck": bytes(gm._card_to_id(c) for c in game.deck) if game else b"",
+            "board": bytes(gm._card_to_id(c) for c in game.board) if game else b"",
+        }))
+
+    def save_players(self, game_id: str, names: List[str]) -> None:
+        for position, name in enumerate(names):
+            self._enqueue(("insert", players_table, {
+                "game_id": game_id, "position": position, "name": name,
+            }))
+
+    def save_submission(
+        self, game_id: str, round_number: int, player: str, card_ids: List[int], elapsed_time: float
+    ) -> None:
+        self._enqueue(("insert", submissions_table, {
+            "game_id": game_id,
+            "round": round_number,
+            "player": player,
+            "cards": bytes(card_ids),
+            "time": elapsed_time,
+        }))
+
+    def save_round(self, game_id: str, round_number: int, winner: str | None, elapsed_time: float | None) -> None:
+        self._enqueue(("insert", rounds_table, {
+            "game_id": game_id, "round": round_number, "winner": winner, "time": elapsed_time,
+        }))
+        if winner is not None:
+            self._enqueue(("win", winner, elapsed_time))
+
+    def delete_game(self, game_id: str) -> None:
+        self._enqueue(("delete", game_id, None))
+
+    def flush(self, timeout: float | None = 30.0) -> None:
+        """
+        Blocks until everything queued so far has been written, or dropped
+        after a failed write (which is logged).
+        Raises TimeoutError if the writer does not get there within timeout.
+        """
+        done = threading.Event()
+        self._enqueue(("marker", None, done))
+        if not done.wait(timeout):
+            raise TimeoutError("Store writer did not flush in time")
+
+    def close(self, timeout: float | None = 30.0) -> None:
+        try:
+            self.flush(timeout)
+        except TimeoutError:
+            logger.error("Closing the store with unwritten changes")
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._writer.join()
+        self.engine.dispose()
+
+    # ----------------------
+    # Writer
+    # ----------------------
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed and not self._pending:
+                    return
+            # let more writes pile up into this batch
+            time.sleep(self.flush_interval)
+            with self._cond:
+                batch, self._pending = self._pending, []
+            try:
+                self._write_batch(batch)
+            except Exception:
+                # keep the writer alive; later batches may well succeed
+                logger.exception("Dropped a batch of %d store writes", len(batch))
+            finally:
+                for kind, _, done in batch:
+                    if kind == "marker":
+                        done.set()
+
+    def _write_batch(self, batch: List[tuple]) -> None:
+        games: Dict[str, Dict] = {}
+        deletes = set()
+        inserts: Dict[Table, List[Dict]] = defaultdict(list)
+        results: Dict[str, Dict] = {}
+
+        for kind, key, value in batch:
+            if kind == "game":
+                games[key] = value
+            elif kind == "insert":
+                inserts[key].append(value)
+            elif kind == "delete":
+                deletes.add(key)
+                games.pop(key, None)
+                for table in _CHILD_TABLES:
+                    inserts[table] = [r for r in inserts[table] if r["game_id"] != key]
+            elif kind == "win":
+                row = results.get(key)
+                if row is None:
+                    results[key] = {"player": key, "wins": 1, "best_time": value, "total_time": value}
+                else:
+                    row["wins"] += 1
+                    row["best_time"] = min(row["best_time"], value)
+                    row["total_time"] += value
+
+        with self.engine.begin() as conn:
+            if deletes:
+                conn.execute(delete(games_table).where(games_table.c.id.in_(deletes)))
+                for table in _CHILD_TABLES:
+                    conn.execute(delete(table).where(table.c.game_id.in_(deletes)))
+            if games:
+                stmt = insert(games_table)
+                conn.execute(
+                    stmt.on_conflict_do_update(
+                        index_elements=[games_table.c.id],
+                        set_={c.name: stmt.excluded[c.name] for c in games_table.c if c.name != "id"},
+                    ),
+                    list(games.values()),
+                )
+            for table, rows in inserts.items():
+                if rows:
+                    conn.execute(insert(table).prefix_with("OR REPLACE"), rows)
+            if results:
+                existing = results_table.c
+                # evaluated under the write lock, so concurrent writers never
+                # hand out the same seq
+                next_seq = select(func.coalesce(func.max(existing.seq), 0) + 1).scalar_subquery()
+                stmt = insert(results_table).values(seq=next_seq)
+                conn.execute(
+                    stmt.on_conflict_do_update(
+                        index_elements=[existing.player],
+                        set_={
+                            "wins": existing.wins + stmt.excluded.wins,
+                            "best_time": func.min(existing.best_time, stmt.excluded.best_time),
+                            "total_time": existing.total_time + stmt.excluded.total_time,
+                            "seq": stmt.excluded.seq,
+                        },
+                    ),
+                    list(results.values()),
+                )
+
+    # ----------------------
+    # Restore
+    # ----------------------
+
+    def load_games(self, game_ids: List[str] | None = None) -> Dict[str, "GameManager"]:
+        """Rebuilds every stored game, or those of game_ids, keyed by game id."""
+        from app.game_manager import GameManager
+
+        def rows(table, column, *order):
+            query = select(table).order_by(*order)
+            if game_ids is not None:
+                query = query.where(column.in_(game_ids))
+            return conn.execute(query)
+
+        with self.engine.connect() as conn:
+            game_rows = rows(games_table, games_table.c.id).all()
+            players = defaultdict(list)
+            for row in rows(players_table, players_table.c.game_id, players_table.c.position):
+                players[row.game_id].append(row.name)
+            rounds = defaultdict(list)
+            for row in rows(rounds_table, rounds_table.c.game_id, rounds_table.c.round):
+                rounds[row.game_id].append(row)
+            submissions = defaultdict(lambda: defaultdict(list))
+            for row in rows(submissions_table, submissions_table.c.game_id):
+                submissions[row.game_id][row.round].append(row)
+
+        managers = {}
+        for row in game_rows:
+            gm = GameManager()
+            gm.state = row.state
+            gm.lobby_players = json.loads(row.lobby)
+            gm.seed = row.seed
+            gm.deck_order = row.deck_order
+            if row.deck_order:
+                game = Game(
+                    deck=deck_from_order(row.deck),
+                    board=deck_from_order(row.board),
+                    players={name: Player(name=name) for name in players[row.id]},
+                    round_number=row.round,
+                )
+                by_round = submissions[row.id]
+                resolved = []
+                for r in rounds[row.id]:
+                    times = {s.player: s.time for s in by_round.get(r.round, [])}
+                    if r.winner is not None:
+                        game.players[r.winner].times.append(r.time)
+                    game.history.append(r.round, r.winner, times)
+                    resolved.extend(times.items())
+                gm.stats.rebuild(resolved)
+                for s in by_round.get(row.round, []):
+                    game.submissions[s.player] = {
+                        "cards": deck_from_order(s.cards), "time": s.time,
+                    }
+                gm.game = game
+            managers[row.id] = gm
+        return managers
+
+    def load_game(self, game_id: str) -> Optional["GameManager"]:
+        """Rebuilds one stored game, None if it is not stored."""
+        return self.load_games([game_id]).get(game_id)
+
+    def load_results(self) -> List[Tuple[str, int, float, float]]:
+        """Every player's (name, wins, best time, total time), for Leaderboard.rebuild."""
+        return self.load_results_since(0)[0]
+
+    def load_results_since(self, seq: int) -> Tuple[List[Tuple[str, int, float, float]], int]:
+        """
+        Results of the players whose row changed after seq, for
+        Leaderboard.update, and the seq to pass next time.
+        """
+        c = results_table.c
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                select(c.player, c.wins, c.best_time, c.total_time, c.seq).where(c.seq > seq)
+            ).all()
+        return [tuple(row[:4]) for row in rows], max((row.seq for row in rows), default=seq)
+
+
+def _configure_connection(dbapi_connection, _record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
@@ -0,0 +1,175 @@
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Deque, Dict, List, Optional
+
+from app.config import settings
+
+logger = logging.getLogger("app.slow_requests")
+
+
+# ----------------------
+# Sampling Profiler
+# ----------------------
+
+class ProfilerBusy(RuntimeError):
+    pass
+
+
+_profiling = threading.Lock()
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def sample_stacks(seconds: float, interval: float = 0.005) -> Dict[str, int]:
+    """
+    Samples the stacks of all other threads every interval for the given time.
+    Returns collapsed stacks ("thread;outer;...;inner") with their sample counts.
+    Raises ProfilerBusy if another profile is already running.
+    """
+    if not _profiling.acquire(blocking=False):
+        raise ProfilerBusy("A profile is already running")
+    try:
+        own = threading.get_ident()
+        counts: Counter = Counter()
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_name(frame))
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                counts[";".join(reversed(stack))] += 1
+            time.sleep(interval)
+        return dict(counts)
+    finally:
+        _profiling.release()
+
+
+def collapsed(counts: Dict[str, int]) -> str:
+    """Collapsed stack file for flamegraph.pl, speedscope and similar tools."""
+    return "".join(f"{stack} {n}\n" for stack, n in sorted(counts.items(), key=lambda i: -i[1]))
+
+
+# ----------------------
+# Request Tracing
+# ----------------------
+
+class Trace:
+    """Durations of the named phases of one request, in seconds."""
+
+    __slots__ = ("phases",)
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+
+
+_trace: ContextVar[Optional[Trace]] = ContextVar("trace", default=None)
+
+# Most recent requests slower than settings.slow_request_ms.
+slow_requests: Deque[Dict] = deque(maxlen=100)
+
+
+class _Phase:
+    __slots__ = ("trace", "name", "start")
+
+    def __init__(self, trace: Trace, name: str):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        phases = self.trace.phases
+        phases[self.name] = phases.get(self.name, 0.0) + time.perf_counter() - self.start
+
+
+_untraced = nullcontext()
+
+
+def phase(name: str):
+    """Context manager timing a phase of the current request; a no-op outside a request."""
+    trace = _trace.get()
+    return _untraced if trace is None else _Phase(trace, name)
+
+
+class locked:
+    """Holds lock for the block, timing the wait as the lock_wait phase."""
+
+    __slots__ = ("lock",)
+
+    def __init__(self, lock):
+        self.lock = lock
+
+    def __enter__(self):
+        with phase("lock_wait"):
+            self.lock.acquire()
+
+    def __exit__(self, *exc):
+        self.lock.release()
+
+
+def recent_slow_requests() -> List[Dict]:
+    """Slow requests, newest first."""
+    return list(reversed(slow_requests))
+
+
+class SlowRequestMiddleware:
+    """
+    ASGI middleware tracing the phases of each HTTP request and logging those
+    that take longer than settings.slow_request_ms until their response
+    headers are sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or settings.slow_request_ms is None:
+            return await self.app(scope, receive, send)
+
+        trace = Trace()
+        token = _trace.set(trace)
+        start = time.perf_counter()
+
+        async def send_traced(message):
+            if message["type"] == "http.response.start":
+                total_ms = (time.perf_counter() - start) * 1000
+                if total_ms >= settings.slow_request_ms:
+                    _record_slow(scope, message["status"], total_ms, trace)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_traced)
+        finally:
+            _trace.reset(token)
+
+
+def _record_slow(scope, status: int, total_ms: float, trace: Trace) -> None:
+    entry = {
+        "at": time.time(),
+        "method": scope["method"],
+        "path": scope["path"],
+        "status": status,
+        "total_ms": total_ms,
+        "phases_ms": {name: s * 1000 for name, s in trace.phases.items()},
+    }
+    slow_requests.append(entry)
+    logger.warning(
+        "slow request %s %s %d %.1f ms %s",
+        entry["method"], entry["path"], status, total_ms,
+        " ".join(f"{name}={ms:.2f}ms" for name, ms in entry["phases_ms"].items()),
+    )
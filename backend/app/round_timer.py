@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import math
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from app.game_manager import GameManager
+
+logger = logging.getLogger(__name__)
+
+
+class RoundTimer:
+    """
+    Hashed timer wheel holding one round deadline per running game.
+
+    Deadlines are rounded up to whole ticks and hashed into a ring of slots;
+    deadlines further out than one turn of the wheel carry a lap count. A
+    single asyncio task advances the wheel once per tick and only looks at the
+    games in the current slot, so scheduling, cancelling and expiring are all
+    O(1) per game regardless of how many games are running.
+
+    When a round's deadline passes, it is resolved with whatever has been
+    submitted; a round nobody has submitted to yet gets a fresh deadline.
+    """
+
+    def __init__(
+        self,
+        timeout: float,
+        tick: float = 0.1,
+        slots: int = 512,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.timeout = timeout
+        self.tick = tick
+        self._clock = clock
+        # slot -> {game: (round number, laps left)}
+        self._slots: List[Dict["GameManager", Tuple[int, int]]] = [{} for _ in range(slots)]
+        self._slot_of: Dict["GameManager", int] = {}
+        self._cursor = 0
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def __contains__(self, gm: "GameManager") -> bool:
+        return gm in self._slot_of
+
+    # ----------------------
+    # Scheduling
+    # ----------------------
+
+    def schedule(self, gm: "GameManager", round_number: int) -> None:
+        """Sets the deadline of gm's round to timeout from now, replacing any other."""
+        ticks = max(1, math.ceil(self.timeout / self.tick))
+        with self._lock:
+            self._remove(gm)
+            slot = (self._cursor + ticks) % len(self._slots)
+            self._slots[slot][gm] = (round_number, (ticks - 1) // len(self._slots))
+            self._slot_of[gm] = slot
+
+    def cancel(self, gm: "GameManager") -> None:
+        with self._lock:
+            self._remove(gm)
+
+    def _remove(self, gm: "GameManager") -> None:
+        slot = self._slot_of.pop(gm, None)
+        if slot is not None:
+            del self._slots[slot][gm]
+
+    # ----------------------
+    # Expiry
+    # ----------------------
+
+    def advance(self) -> List[Tuple["GameManager", int]]:
+        """Moves the wheel one tick, returns the (game, round) deadlines that passed."""
+        with self._lock:
+            self._cursor = (self._cursor + 1) % len(self._slots)
+            slot = self._slots[self._cursor]
+            if not slot:
+                return []
+            due, waiting = [], {}
+            for gm, (round_number, laps) in slot.items():
+                if laps:
+                    waiting[gm] = (round_number, laps - 1)
+                else:
+                    due.append((gm, round_number))
+                    del self._slot_of[gm]
+            self._slots[self._cursor] = waiting
+            return due
+
+    def expire(self, gm: "GameManager", round_number: int) -> Optional[str]:
+        """Resolves gm's round if it is still the one the deadline was set for."""
+        with gm.lock:
+            if gm.state != "running" or gm.game.round_number != round_number:
+                return None
+            if not gm.game.submissions:
+                self.schedule(gm, round_number)
+                return None
+            return gm._resolve_round()
+
+    def tick_once(self) -> int:
+        """Advances one tick and resolves its expired rounds, returns how many expired."""
+        due = self.advance()
+        for gm, round_number in due:
+            try:
+                self.expire(gm, round_number)
+            except Exception:
+                # one broken game must not stop the wheel for every other game;
+                # its round gets another deadline instead of hanging forever
+                logger.exception("Failed to expire round %d of game %s", round_number, gm.game_id)
+                self.schedule(gm, round_number)
+        return len(due)
+
+    # ----------------------
+    # Task
+    # ----------------------
+
+    async def run(self) -> None:
+        """Advances the wheel in real time; catches up on ticks missed under load."""
+        next_tick = self._clock() + self.tick
+        while True:
+            await asyncio.sleep(max(0.0, next_tick - self._clock()))
+            while next_tick <= self._clock():
+                self.tick_once()
+                next_tick += self.tick
+
+    def start(self) -> None:
+        """Starts advancing the wheel on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
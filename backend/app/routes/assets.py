@@ -0,0 +1,73 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from starlette.concurrency import run_in_threadpool
+
+from app.assets import Asset, AssetBundle
+from app.config import settings
+
+router = APIRouter(prefix="/cards", tags=["assets"])
+
+# Hashed asset names change with their content, so they never need revalidation.
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+_bundle: AssetBundle | None = None
+
+
+async def get_bundle() -> AssetBundle:
+    """Loads and precompresses the card images once, on first use."""
+    global _bundle
+    if _bundle is None:
+        try:
+            _bundle = await run_in_threadpool(AssetBundle, settings.cards_dir)
+        except OSError:
+            raise HTTPException(status_code=404, detail="Card assets not available")
+    return _bundle
+
+
+def _accepted_encodings(accept_encoding: str | None) -> set:
+    accepted = set()
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip().lower())
+    return accepted
+
+
+def _serve(asset: Asset, accept_encoding: str | None, cache_control: str,
+           if_none_match: str | None) -> Response:
+    headers = {"Cache-Control": cache_control, "ETag": asset.etag}
+    if asset.encoded:
+        headers["Vary"] = "Accept-Encoding"
+    if if_none_match and asset.etag in if_none_match:
+        return Response(status_code=304, headers=headers)
+
+    accepted = _accepted_encodings(accept_encoding)
+    for encoding in ("br", "gzip"):
+        if encoding in asset.encoded and encoding in accepted:
+            headers["Content-Encoding"] = encoding
+            return Response(content=asset.encoded[encoding], media_type=asset.media_type, headers=headers)
+    return Response(content=asset.body, media_type=asset.media_type, headers=headers)
+
+
+@router.get("/manifest.json")
+async def get_manifest(
+    bundle: AssetBundle = Depends(get_bundle),
+    accept_encoding: str | None = Header(default=None),
+    if_none_match: str | None = Header(default=None),
+):
+    """Sprite sheet and per-card image URLs, keyed by card ID."""
+    return _serve(bundle.manifest_asset, accept_encoding, "no-cache", if_none_match)
+
+
+@router.get("/{name}")
+async def get_asset(
+    name: str,
+    bundle: AssetBundle = Depends(get_bundle),
+    accept_encoding: str | None = Header(default=None),
+    if_none_match: str | None = Header(default=None),
+):
+    asset = bundle.get(name)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    return _serve(asset, accept_encoding, IMMUTABLE, if_none_match)
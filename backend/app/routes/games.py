@@ -0,0 +1,120 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, WebSocket
+
+from app.game_manager import GameManager
+from app.game_registry import GameRegistry
+from app.routes import handlers
+from app.wire import accepts_wire
+from app.schemas import GameState, JoinRequest, SubmitResponse
+
+router = APIRouter(prefix="/games", tags=["games"])
+registry = GameRegistry()
+
+
+async def get_game(game_id: str) -> GameManager:
+    try:
+        return registry.get(game_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Game not found")
+    except RuntimeError as e:
+        # evicted and no room to load it again
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+# ----------------------
+# Lifecycle
+# ----------------------
+
+@router.post("", status_code=201)
+async def create_game():
+    try:
+        game_id = registry.create_game()
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return {"game_id": game_id}
+
+@router.delete("/{game_id}", status_code=204)
+async def delete_game(game_id: str):
+    try:
+        registry.remove(game_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Game not found")
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+# ----------------------
+# Lobby
+# ----------------------
+
+@router.post("/{game_id}/join", response_model=GameState)
+async def join_lobby(req: JoinRequest, gm: GameManager = Depends(get_game)):
+    return handlers.join_lobby(gm, req.name)
+
+@router.post("/{game_id}/start", response_model=GameState)
+async def start_game(
+    seed: int | None = Query(default=None, ge=0, lt=2**63),
+    gm: GameManager = Depends(get_game),
+):
+    return handlers.start_game(gm, seed)
+
+
+# ----------------------
+# Game
+# ----------------------
+
+@router.get("/{game_id}/state", response_model=GameState)
+async def get_state(
+    gm: GameManager = Depends(get_game),
+    if_none_match: str | None = Header(default=None),
+    accept: str | None = Header(default=None),
+):
+    return handlers.get_state(gm, if_none_match, accept)
+
+@router.get("/{game_id}/history")
+async def get_history(
+    after: int = 0,
+    limit: int = Query(default=100, ge=1, le=1000),
+    gm: GameManager = Depends(get_game),
+):
+    return handlers.get_history(gm, after, limit)
+
+@router.get("/{game_id}/stats")
+async def get_stats(gm: GameManager = Depends(get_game)):
+    return gm.get_stats()
+
+@router.get("/{game_id}/sets")
+async def get_sets(
+    gm: GameManager = Depends(get_game),
+    x_admin_token: str | None = Header(default=None),
+):
+    return handlers.get_sets(gm, x_admin_token)
+
+@router.post("/{game_id}/submit", response_model=SubmitResponse, openapi_extra=handlers.SUBMIT_BODY)
+async def submit_set(
+    request: Request,
+    gm: GameManager = Depends(get_game),
+    accept: str | None = Header(default=None),
+):
+    req = await handlers.read_submission(request)
+    return handlers.submit_set(gm, req, accepts_wire(accept))
+
+
+# ----------------------
+# Events
+# ----------------------
+
+@router.websocket("/{game_id}/events")
+async def events_ws(websocket: WebSocket, game_id: str):
+    try:
+        gm = registry.get(game_id)
+    except KeyError:
+        await websocket.close(code=4404)
+        return
+    except RuntimeError:
+        await websocket.close(code=1013)
+        return
+    await handlers.stream_websocket(gm, websocket)
+
+@router.get("/{game_id}/events")
+async def events_sse(gm: GameManager = Depends(get_game)):
+    return handlers.stream_sse(gm)
@@ -0,0 +1,196 @@
+import asyncio
+from typing import AsyncIterator, Dict
+
+from fastapi import HTTPException, Request, Response, WebSocket
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+
+from app.config import check_admin_token
+from app.game_manager import GameManager
+from app.metrics import SUBMISSIONS
+from app.profiling import locked, phase
+from app.schemas import SubmitRequest
+from app.serialization import dumps, json_response
+from app.wire import (
+    WIRE_TYPE, accepts_wire, decode_submission, encode_submit_response, is_wire,
+)
+
+# Request handling shared by the default-game routes in app.main and the
+# game-scoped routes in app.routes.games. Each handler holds the game's lock
+# for the whole request so the returned state matches what the request did.
+#
+# The routes are async and call these handlers directly on the event loop:
+# game work is short in-memory CPU work, and persistence is handed off to the
+# store and event log writer threads, so nothing here blocks. Handlers never
+# await while holding a game lock.
+
+# Idle SSE connections get a comment line this often to keep proxies open.
+SSE_PING_SECONDS = 15.0
+
+
+def join_lobby(gm: GameManager, name: str) -> Response:
+    with gm.lock:
+        try:
+            gm.join_lobby(name)
+        except (ValueError, RuntimeError) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return json_response(gm.get_state_bytes()[0])
+
+
+def start_game(gm: GameManager, seed: int | None = None) -> Response:
+    with gm.lock:
+        try:
+            gm.start_game(seed)
+        except RuntimeError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return json_response(gm.get_state_bytes()[0])
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+def get_state(gm: GameManager, if_none_match: str | None = None, accept: str | None = None) -> Response:
+    wire = accepts_wire(accept)
+    with phase("serialization"):
+        body, etag = gm.get_state_wire() if wire else gm.get_state_bytes()
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    if wire:
+        return Response(content=body, media_type=WIRE_TYPE, headers=headers)
+    return json_response(body, headers=headers)
+
+
+def get_history(gm: GameManager, after: int, limit: int) -> Dict:
+    return gm.get_history(after, limit)
+
+
+def get_sets(gm: GameManager, admin_token: str | None) -> Dict:
+    with gm.lock:
+        if gm.state != "running":
+            raise HTTPException(status_code=400, detail="Game not running")
+
+        if check_admin_token(admin_token):
+            sets = gm.find_all_sets()
+            return {"count": len(sets), "sets": sets}
+        return {"count": gm.count_sets()}
+
+
+# OpenAPI request body of the submit routes, which also accept the wire format.
+SUBMIT_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {"schema": SubmitRequest.model_json_schema()},
+            WIRE_TYPE: {"schema": {"type": "string", "format": "binary"}},
+        },
+    },
+}
+
+
+async def read_submission(request: Request) -> SubmitRequest:
+    """Parses a JSON or binary wire format submission body."""
+    body = await request.body()
+    with phase("validation"):
+        return _parse_submission(request, body)
+
+
+def _parse_submission(request: Request, body: bytes) -> SubmitRequest:
+    if is_wire(request.headers.get("content-type")):
+        try:
+            player, cards, elapsed_time = decode_submission(body)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Malformed submission")
+        return SubmitRequest.model_construct(player=player, cards=cards, elapsed_time=elapsed_time)
+    try:
+        return SubmitRequest.model_validate_json(body)
+    except ValidationError as e:
+        errors = [{**err, "loc": ("body", *err["loc"])} for err in e.errors(include_url=False)]
+        raise RequestValidationError(errors, body=body)
+
+
+# Submit responses are spliced from these fragments and the cached state body.
+_SUBMITTED = b'{"success":true,"winner":null,"state":'
+_WON = b'{"success":true,"winner":'
+
+
+def submit_set(gm: GameManager, req: SubmitRequest, wire: bool = False) -> Response:
+    # submit and resolve are timed separately for the slow request log; the
+    # lock held across both keeps them one atomic step (see submit_and_resolve)
+    with locked(gm.lock):
+        if gm.state != "running":
+            SUBMISSIONS.inc("not_running")
+            raise HTTPException(status_code=400, detail="Game not running")
+
+        with phase("submit_set"):
+            success = gm.submit_set(req.player, req.cards, req.elapsed_time)
+        if not success:
+            raise HTTPException(status_code=400, detail="Invalid submission")
+        with phase("try_resolve_round"):
+            winner = gm.try_resolve_round()
+
+        with phase("serialization"):
+            if wire:
+                body, _ = gm.get_state_wire()
+                return Response(content=encode_submit_response(winner, body), media_type=WIRE_TYPE)
+            body, _ = gm.get_state_bytes()
+            if winner is None:
+                return json_response(b"".join((_SUBMITTED, body, b"}")))
+            return json_response(b"".join((_WON, dumps(winner), b',"state":', body, b"}")))
+
+
+# ----------------------
+# Event Streams
+# ----------------------
+
+async def stream_websocket(gm: GameManager, websocket: WebSocket) -> None:
+    """Sends a state snapshot followed by every delta until the client leaves."""
+    await websocket.accept()
+    sub, snapshot = gm.subscribe()
+
+    async def pump():
+        await websocket.send_text(snapshot.text)
+        while True:
+            event = await sub.get()
+            await websocket.send_text(event.text)
+
+    async def wait_for_disconnect():
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    tasks = [asyncio.create_task(pump()), asyncio.create_task(wait_for_disconnect())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        gm.events.unsubscribe(sub)
+        for task in tasks:
+            task.cancel()
+
+
+def stream_sse(gm: GameManager) -> StreamingResponse:
+    """Server-sent events fallback for clients without WebSocket support."""
+
+    async def events() -> AsyncIterator[bytes]:
+        sub, snapshot = gm.subscribe()
+        try:
+            yield snapshot.sse
+            while True:
+                try:
+                    event = await asyncio.wait_for(sub.get(), SSE_PING_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"
+                    continue
+                yield event.sse
+        finally:
+            gm.events.unsubscribe(sub)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
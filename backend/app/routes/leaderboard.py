@@ -0,0 +1,46 @@
+from fastapi import APIRouter, HTTPException, Query
+
+from app import leaderboard as board
+
+router = APIRouter(prefix="/leaderboard", tags=["leaderboard"])
+
+
+def _check_metric(metric: str) -> None:
+    if metric not in board.global_leaderboard.metrics:
+        raise HTTPException(status_code=400, detail=f"Unknown leaderboard metric: {metric}")
+
+
+@router.get("")
+async def get_top(
+    metric: str = "wins",
+    limit: int = Query(default=10, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0),
+):
+    """Players ranked offset + 1 to offset + limit by a metric."""
+    _check_metric(metric)
+    return {
+        "metric": metric,
+        "players": len(board.global_leaderboard),
+        "entries": board.global_leaderboard.top(metric, limit, offset),
+    }
+
+@router.get("/{player}")
+async def get_player(player: str):
+    """A player's won rounds and rank under every metric."""
+    entry = board.global_leaderboard.player(player)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Player not ranked")
+    return entry
+
+@router.get("/{player}/around")
+async def get_around(
+    player: str,
+    metric: str = "wins",
+    radius: int = Query(default=5, ge=0, le=500),
+):
+    """The players ranked just above and below a player."""
+    _check_metric(metric)
+    entries = board.global_leaderboard.around(metric, player, radius)
+    if entries is None:
+        raise HTTPException(status_code=404, detail="Player not ranked")
+    return {"metric": metric, "entries": entries}
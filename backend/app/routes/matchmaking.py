@@ -0,0 +1,45 @@
+from fastapi import APIRouter, HTTPException
+
+from app.config import settings
+from app.matchmaking import Matchmaker
+from app.routes import games
+from app.schemas import JoinRequest
+
+router = APIRouter(prefix="/matchmaking", tags=["matchmaking"])
+matchmaker = Matchmaker(
+    games.registry,
+    game_size=settings.match_size,
+    max_wait=settings.match_max_wait,
+    min_players=settings.match_min_players,
+)
+
+
+@router.get("")
+async def get_queue():
+    return matchmaker.summary()
+
+@router.post("/join", status_code=202)
+async def join_queue(req: JoinRequest):
+    """Queues a player; the response names the game if this join filled one."""
+    try:
+        game_id = matchmaker.join(req.name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if game_id is None:
+        return {"status": "queued", "waited": 0.0}
+    return {"status": "matched", "game_id": game_id}
+
+@router.get("/{name}")
+async def get_status(name: str):
+    """Poll until matched, then play under /games/{game_id}."""
+    try:
+        return matchmaker.status(name)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Player not queued")
+
+@router.delete("/{name}", status_code=204)
+async def leave_queue(name: str):
+    try:
+        matchmaker.leave(name)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Player not queued")
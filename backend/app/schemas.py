@@ -0,0 +1,46 @@
+from typing import Dict, List
+
+from pydantic import BaseModel, Field
+
+from app.game_manager import MAX_NAME_LENGTH
+
+# ----------------------
+# Request Models
+# ----------------------
+
+class JoinRequest(BaseModel):
+    name: str = Field(max_length=MAX_NAME_LENGTH)
+
+class SubmitRequest(BaseModel):
+    player: str
+    cards: List[int]
+    elapsed_time: float = Field(ge=0, allow_inf_nan=False)
+
+
+# ----------------------
+# Response Models
+# ----------------------
+# Routes return pre-encoded JSON in these shapes, so the models document the
+# API without FastAPI validating and re-encoding every response.
+
+class PlayerState(BaseModel):
+    times: List[float]
+
+class RoundResult(BaseModel):
+    round: int
+    winner: str | None
+    submissions: Dict[str, float]
+
+class GameState(BaseModel):
+    state: str  # lobby | running | finished
+    # names while in the lobby, per-player state once started
+    players: List[str] | Dict[str, PlayerState]
+    round: int | None = None
+    board: List[int] | None = None
+    history: List[RoundResult] | None = None
+    rounds_played: int | None = None
+
+class SubmitResponse(BaseModel):
+    success: bool
+    winner: str | None
+    state: GameState
@@ -0,0 +1,24 @@
+import json
+
+from fastapi import Response
+
+# orjson is an optional speedup (pip install .[fast]); output is equivalent
+# JSON either way.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+
+def dumps(obj) -> bytes:
+    """Compact UTF-8 JSON encoding of obj."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return _encoder.encode(obj).encode()
+
+
+def json_response(body: bytes, status_code: int = 200, headers: dict | None = None) -> Response:
+    """Response for an already encoded JSON body, skipping FastAPI's encoder."""
+    return Response(content=body, status_code=status_code, media_type="application/json", headers=headers)
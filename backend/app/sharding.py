@@ -0,0 +1,268 @@
+"""
+Sharded multi-process deployment.
+
+Every game lives in exactly one worker process, chosen by a stable hash of
+its game id. A lightweight router process accepts all client connections and
+forwards each request over a Unix socket to the worker owning the game:
+
+    python -m app.sharding --shards 4 --port 8000
+
+Use this instead of uvicorn --workers, which would give every worker its own
+independent copy of every game. Workers are regular app.main instances that
+only create, restore and serve games of their own shard (SET_SHARD_INDEX and
+SET_SHARD_COUNT). Requests that do not name a game are spread round-robin,
+except for the default game's /lobby and /game routes, the cross-game
+/stats and /leaderboard, and the /matchmaking queue, which go to the default
+game's shard. Statistics are therefore per-shard in this mode, and
+matchmade games all live on that shard. The leaderboard covers every shard
+when the workers share a database (SET_DATABASE_PATH): the default game's
+shard applies the rows changed in the shared results table every
+leaderboard_refresh seconds. Without a database it only ranks that shard's games.
+
+Each worker keeps its own metrics. /metrics?shard=N is served by shard N
+(and plain /metrics by the default game's shard), so scrape the router once
+per shard, e.g. as one Prometheus target per shard with params {shard: [N]}.
+The /admin profiling routes take the same ?shard=N selector.
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from typing import List
+from urllib.parse import parse_qs
+
+import httpx
+
+from app.config import settings
+
+DEFAULT_GAME_ID = "default"
+
+# Hop-by-hop headers are connection specific and never forwarded.
+_HOP_HEADERS = {b"connection", b"keep-alive", b"transfer-encoding", b"upgrade", b"te", b"trailer"}
+
+# Per-process routes, served by the shard named in ?shard=N
+_SHARD_SELECTED = ("metrics", "admin")
+
+
+def shard_for(game_id: str, shard_count: int) -> int:
+    """Shard owning game_id; stable across processes, unlike hash()."""
+    return zlib.crc32(game_id.encode()) % shard_count
+
+
+def owns(game_id: str) -> bool:
+    """True if this process serves game_id (always, when not sharded)."""
+    return settings.shard_count <= 1 or shard_for(game_id, settings.shard_count) == settings.shard_index
+
+
+# ----------------------
+# Router
+# ----------------------
+
+class ShardRouter:
+    """ASGI app forwarding HTTP and WebSocket traffic to the owning shard."""
+
+    def __init__(self, transports: List[httpx.AsyncBaseTransport], sockets: List[str] | None = None):
+        self.clients = [
+            httpx.AsyncClient(transport=t, base_url="http://shard", timeout=None) for t in transports
+        ]
+        # WebSockets are forwarded over the shards' Unix sockets, if known
+        self.sockets = sockets
+        self._round_robin = itertools.count()
+
+    @classmethod
+    def for_sockets(cls, sockets: List[str]) -> "ShardRouter":
+        return cls([httpx.AsyncHTTPTransport(uds=path) for path in sockets], sockets)
+
+    def shard_of(self, path: str, query: bytes = b"") -> int:
+        """Shard serving a request; raises ValueError for an unknown ?shard=."""
+        parts = path.split("/", 3)
+        if len(parts) > 2 and parts[1] == "games" and parts[2]:
+            return shard_for(parts[2], len(self.clients))
+        if parts[1] in ("lobby", "game", "stats", "leaderboard", "matchmaking"):
+            return shard_for(DEFAULT_GAME_ID, len(self.clients))
+        if parts[1] in _SHARD_SELECTED:
+            selected = parse_qs(query.decode()).get("shard")
+            if not selected:
+                return shard_for(DEFAULT_GAME_ID, len(self.clients))
+            shard = int(selected[0])
+            if not 0 <= shard < len(self.clients):
+                raise ValueError(f"No shard {shard}")
+            return shard
+        return next(self._round_robin) % len(self.clients)
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http":
+            await self._forward_http(scope, receive, send)
+        elif scope["type"] == "websocket":
+            await self._forward_websocket(scope, receive, send)
+        elif scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                for client in self.clients:
+                    await client.aclose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _forward_http(self, scope, receive, send) -> None:
+        body = bytearray()
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+
+        try:
+            shard = self.shard_of(scope["path"], scope["query_string"])
+        except ValueError:
+            await send({"type": "http.response.start", "status": 400, "headers": []})
+            await send({"type": "http.response.body", "body": b"Unknown shard"})
+            return
+        client = self.clients[shard]
+        request = client.build_request(
+            scope["method"],
+            httpx.URL(path=scope["raw_path"].decode(), query=scope["query_string"]),
+            headers=[(k, v) for k, v in scope["headers"] if k.lower() not in _HOP_HEADERS],
+            content=bytes(body),
+        )
+        try:
+            response = await client.send(request, stream=True)
+        except httpx.TransportError:
+            await send({"type": "http.response.start", "status": 502, "headers": []})
+            await send({"type": "http.response.body", "body": b"Shard unavailable"})
+            return
+
+        async def pump():
+            await send({
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": [
+                    (k, v) for k, v in response.headers.raw if k.lower() not in _HOP_HEADERS
+                ],
+            })
+            async for chunk in response.aiter_raw():
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+
+        async def wait_for_disconnect():
+            while (await receive())["type"] != "http.disconnect":
+                pass
+
+        # streamed responses (SSE) end when either side goes away
+        tasks = [asyncio.create_task(pump()), asyncio.create_task(wait_for_disconnect())]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await response.aclose()
+
+    async def _forward_websocket(self, scope, receive, send) -> None:
+        await receive()  # websocket.connect
+        try:
+            from websockets.asyncio.client import unix_connect
+            from websockets.exceptions import ConnectionClosed, InvalidHandshake
+        except ImportError:
+            # without websockets installed, clients fall back to the SSE stream
+            await send({"type": "websocket.close", "code": 1013})
+            return
+        if self.sockets is None:
+            await send({"type": "websocket.close", "code": 1013})
+            return
+
+        path = self.sockets[self.shard_of(scope["path"])]
+        query = scope["query_string"].decode()
+        uri = "ws://shard" + scope["raw_path"].decode() + (f"?{query}" if query else "")
+        try:
+            upstream = await unix_connect(path, uri)
+        except (OSError, InvalidHandshake):
+            await send({"type": "websocket.close", "code": 1011})
+            return
+        await send({"type": "websocket.accept"})
+
+        async def client_to_shard():
+            while True:
+                message = await receive()
+                if message["type"] == "websocket.disconnect":
+                    return
+                await upstream.send(message.get("text") or message.get("bytes") or b"")
+
+        async def shard_to_client():
+            try:
+                async for data in upstream:
+                    key = "text" if isinstance(data, str) else "bytes"
+                    await send({"type": "websocket.send", key: data})
+            except ConnectionClosed:
+                pass
+            await send({"type": "websocket.close", "code": upstream.close_code or 1000})
+
+        tasks = [asyncio.create_task(client_to_shard()), asyncio.create_task(shard_to_client())]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await upstream.close()
+
+
+# ----------------------
+# Launcher
+# ----------------------
+
+def _wait_for_sockets(sockets: List[str], timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not all(os.path.exists(path) for path in sockets):
+        if time.monotonic() > deadline:
+            raise RuntimeError("Shards did not start in time")
+        time.sleep(0.05)
+
+
+def main() -> int:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shards", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--socket-dir", help="directory for the shards' Unix sockets")
+    args = parser.parse_args()
+
+    socket_dir = args.socket_dir or tempfile.mkdtemp(prefix="set-shards-")
+    sockets = [os.path.join(socket_dir, f"shard-{i}.sock") for i in range(args.shards)]
+    workers = []
+    for index, path in enumerate(sockets):
+        if os.path.exists(path):
+            os.remove(path)
+        env = {**os.environ, "SET_SHARD_INDEX": str(index), "SET_SHARD_COUNT": str(args.shards)}
+        workers.append(subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--uds", path], env=env,
+        ))
+    # uvicorn re-raises SIGTERM after shutting down; exit through the finally
+    # block so the workers are stopped too
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        _wait_for_sockets(sockets)
+        uvicorn.run(ShardRouter.for_sockets(sockets), host=args.host, port=args.port)
+    finally:
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
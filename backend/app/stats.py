@@ -0,0 +1,170 @@
+import math
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+# Times at or below this are counted in the sketch's zero bucket.
+_MIN_POSITIVE = 1e-9
+
+
+class QuantileSketch:
+    """
+    Log-bucketed quantile sketch with bounded relative error.
+
+    Values fall into buckets whose bounds grow by a constant factor, so any
+    quantile is reported within relative_accuracy of the true value while the
+    number of buckets only grows with the log of the value range.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float, count: int = 1) -> None:
+        if value <= _MIN_POSITIVE:
+            self.zero_count += count
+        else:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.count += count
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def quantile(self, q: float) -> float | None:
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+
+class TimeStats:
+    """Streaming count/min/max/mean/variance (Welford) plus a quantile sketch."""
+
+    def __init__(self):
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.sketch = QuantileSketch()
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.sketch.add(value)
+
+    def merge(self, other: "TimeStats") -> None:
+        """Combines two summaries (Chan et al. parallel variance)."""
+        if not other.count:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+
+    def extend(self, values: Iterable[float]) -> None:
+        """Adds many values at once with a two-pass batch summary."""
+        values = list(values)
+        if not values:
+            return
+        batch = TimeStats()
+        batch.count = len(values)
+        batch.mean = math.fsum(values) / batch.count
+        batch._m2 = math.fsum((v - batch.mean) ** 2 for v in values)
+        batch.min = min(values)
+        batch.max = max(values)
+        for v in values:
+            batch.sketch.add(v)
+        self.merge(batch)
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / self.count if self.count else 0.0
+
+    def summary(self) -> Dict:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.mean,
+            "stddev": math.sqrt(self.variance),
+            "p50": self.sketch.quantile(0.5),
+            "p90": self.sketch.quantile(0.9),
+            "p99": self.sketch.quantile(0.99),
+        }
+
+
+class StatsAggregator:
+    """Submission time statistics overall and per player, safe to share across games."""
+
+    def __init__(self):
+        self.overall = TimeStats()
+        self.players: Dict[str, TimeStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, player: str, elapsed_time: float) -> None:
+        with self._lock:
+            self.overall.add(elapsed_time)
+            stats = self.players.get(player)
+            if stats is None:
+                stats = self.players[player] = TimeStats()
+            stats.add(elapsed_time)
+
+    def rebuild(self, records: Iterable[Tuple[str, float]]) -> None:
+        """Bulk-loads (player, time) records, e.g. from persisted history."""
+        by_player: Dict[str, List[float]] = {}
+        for player, elapsed_time in records:
+            by_player.setdefault(player, []).append(elapsed_time)
+        with self._lock:
+            for player, times in by_player.items():
+                batch = TimeStats()
+                batch.extend(times)
+                self.overall.merge(batch)
+                self.players.setdefault(player, TimeStats()).merge(batch)
+
+    def merge(self, other: "StatsAggregator") -> None:
+        with self._lock:
+            self.overall.merge(other.overall)
+            for player, stats in other.players.items():
+                self.players.setdefault(player, TimeStats()).merge(stats)
+
+    def player_summary(self, player: str) -> Dict | None:
+        with self._lock:
+            stats = self.players.get(player)
+            return stats.summary() if stats else None
+
+    def summary(self, include_players: bool = True) -> Dict:
+        with self._lock:
+            result = {"overall": self.overall.summary(), "player_count": len(self.players)}
+            if include_players:
+                result["players"] = {name: s.summary() for name, s in self.players.items()}
+            return result
+
+
+# Statistics across every game hosted by this process.
+global_stats = StatsAggregator()
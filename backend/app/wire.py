@@ -0,0 +1,187 @@
+"""
+Compact binary encoding of game state and submissions.
+
+Clients opt in with the WIRE_TYPE media type: in Accept for /state and
+/submit responses, in Content-Type for /submit request bodies. Integers are
+unsigned LEB128 varints, strings are a varint byte length plus UTF-8, and
+times are whole milliseconds.
+
+State:
+    u8 state (0 lobby, 1 running, 2 finished)
+    lobby:            varint count, names
+    running/finished: varint round, varint rounds played,
+                      u8 board size, one card id byte per board card (in order),
+                      varint player count, per player: name, varint count, times
+
+Submission request:
+    3 card id bytes, varint elapsed time, player name as the rest of the body
+
+Submission response:
+    u8 0, or u8 1 followed by the winner's name; then the state
+"""
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+if TYPE_CHECKING:
+    from app.game_manager import GameManager
+
+WIRE_TYPE = "application/vnd.set-game"
+
+_STATES = {"lobby": 0, "running": 1, "finished": 2}
+_STATE_NAMES = list(_STATES)
+
+
+def accepts_wire(accept: str | None) -> bool:
+    """True if the Accept header asks for the binary encoding."""
+    return bool(accept) and WIRE_TYPE in accept
+
+
+def is_wire(content_type: str | None) -> bool:
+    return bool(content_type) and content_type.split(";", 1)[0].strip() == WIRE_TYPE
+
+
+# ----------------------
+# Primitives
+# ----------------------
+
+def write_varint(out: bytearray, value: int) -> None:
+    if value < 0:
+        raise ValueError("varints are unsigned")
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    """Returns (value, offset after the varint)."""
+    value = shift = 0
+    while True:
+        if offset >= len(data) or shift > 63:
+            raise ValueError("Truncated varint")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def write_str(out: bytearray, text: str) -> None:
+    encoded = text.encode()
+    write_varint(out, len(encoded))
+    out += encoded
+
+
+def _millis(elapsed_time: float) -> int:
+    return max(0, round(elapsed_time))
+
+
+# ----------------------
+# State
+# ----------------------
+
+def encode_state(gm: "GameManager") -> bytes:
+    """Binary counterpart of GameManager.get_state; call with the game lock held."""
+    out = bytearray((_STATES[gm.state],))
+    if not gm.game:
+        write_varint(out, len(gm.lobby_players))
+        for name in gm.lobby_players:
+            write_str(out, name)
+        return bytes(out)
+
+    game = gm.game
+    write_varint(out, game.round_number)
+    write_varint(out, len(game.history))
+    out.append(len(game.board))
+    out += bytes(card.code for card in game.board)
+    write_varint(out, len(game.players))
+    for name, player in game.players.items():
+        write_str(out, name)
+        write_varint(out, len(player.times))
+        for elapsed_time in player.times:
+            write_varint(out, _millis(elapsed_time))
+    return bytes(out)
+
+
+def read_str(data: bytes, offset: int) -> Tuple[str, int]:
+    length, offset = read_varint(data, offset)
+    if offset + length > len(data):
+        raise ValueError("Truncated string")
+    return data[offset:offset + length].decode(), offset + length
+
+
+def decode_state(data: bytes, offset: int = 0) -> Dict:
+    """
+    Decodes a state into the shape of GameState, without the round history.
+    Returns the state dict; raises ValueError if malformed.
+    """
+    if offset >= len(data):
+        raise ValueError("Empty state")
+    state = _STATE_NAMES[data[offset]]
+    offset += 1
+    count, offset = read_varint(data, offset)
+    if state == "lobby":
+        players = []
+        for _ in range(count):
+            name, offset = read_str(data, offset)
+            players.append(name)
+        return {"state": state, "players": players}
+
+    round_number = count
+    rounds_played, offset = read_varint(data, offset)
+    size = data[offset]
+    board = list(data[offset + 1:offset + 1 + size])
+    offset += 1 + size
+    player_count, offset = read_varint(data, offset)
+    players = {}
+    for _ in range(player_count):
+        name, offset = read_str(data, offset)
+        time_count, offset = read_varint(data, offset)
+        times = []
+        for _ in range(time_count):
+            elapsed_time, offset = read_varint(data, offset)
+            times.append(float(elapsed_time))
+        players[name] = {"times": times}
+    return {
+        "state": state,
+        "round": round_number,
+        "board": board,
+        "players": players,
+        "rounds_played": rounds_played,
+    }
+
+
+def decode_submit_response(data: bytes) -> Tuple[str | None, Dict]:
+    """Returns (winner, state)."""
+    if not data:
+        raise ValueError("Empty response")
+    if data[0] == 0:
+        return None, decode_state(data, 1)
+    winner, offset = read_str(data, 1)
+    return winner, decode_state(data, offset)
+
+
+def encode_submit_response(winner: str | None, state: bytes) -> bytes:
+    if winner is None:
+        return b"\x00" + state
+    out = bytearray(b"\x01")
+    write_str(out, winner)
+    return bytes(out) + state
+
+
+# ----------------------
+# Submissions
+# ----------------------
+
+def encode_submission(player: str, card_ids: List[int], elapsed_time: float) -> bytes:
+    out = bytearray(card_ids)
+    write_varint(out, _millis(elapsed_time))
+    return bytes(out) + player.encode()
+
+
+def decode_submission(data: bytes) -> Tuple[str, List[int], float]:
+    """Returns (player, card ids, elapsed time); raises ValueError if malformed."""
+    if len(data) < 4:
+        raise ValueError("Submission too short")
+    elapsed_time, offset = read_varint(data, 3)
+    return data[offset:].decode(), list(data[:3]), float(elapsed_time)
@@ -0,0 +1,59 @@
+"""
+Compares scalar is_set/find_any_set with the NumPy batch validator.
+
+    python -m benchmarks.bench_batch [--triples N] [--boards N]
+"""
+import argparse
+import json
+import random
+import time
+
+import numpy as np
+
+from app.batch import find_any_set_batch, is_set_batch
+from app.game_logic import CARDS, THIRD_CARD, create_deck, find_any_set, is_set
+
+
+def _timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def bench_is_set(n: int, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    triples = rng.integers(0, 81, size=(n, 3))
+    triples[::2, 2] = [THIRD_CARD[a][b] for a, b in triples[::2, :2]]
+    card_triples = [[CARDS[c] for c in t] for t in triples.tolist()]
+
+    scalar = _timed(lambda: [is_set(t) for t in card_triples])
+    batch = _timed(is_set_batch, triples)
+    assert is_set_batch(triples).tolist() == [is_set(t) for t in card_triples]
+    return {"n": n, "scalar_s": scalar, "batch_s": batch, "speedup": scalar / batch}
+
+
+def bench_find_any_set(n: int, size: int = 12, seed: int = 0) -> dict:
+    random.seed(seed)
+    boards = [create_deck()[:size] for _ in range(n)]
+    codes = np.array([[c.code for c in b] for b in boards])
+
+    scalar = _timed(lambda: [find_any_set(b) for b in boards])
+    batch = _timed(find_any_set_batch, codes)
+    return {"n": n, "board_size": size, "scalar_s": scalar, "batch_s": batch, "speedup": scalar / batch}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--triples", type=int, default=1_000_000)
+    parser.add_argument("--boards", type=int, default=20_000)
+    args = parser.parse_args()
+
+    results = {
+        "is_set": bench_is_set(args.triples),
+        "find_any_set": [bench_find_any_set(args.boards, size) for size in (12, 15, 18, 21)],
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
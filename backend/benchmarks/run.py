@@ -0,0 +1,498 @@
+"""
+Benchmark suite for the game engine and API hot paths.
+
+    python -m benchmarks.run                       # run everything, JSON to stdout
+    python -m benchmarks.run -k find_any_set       # only matching benchmarks
+    python -m benchmarks.run -o results.json       # write results to a file
+    python -m benchmarks.run --compare base.json   # flag regressions against a baseline
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+from app.game_logic import (
+    CARDS, THIRD_CARD, Game, Player, create_deck, deal_board, find_all_sets, find_any_set,
+    is_set, resolve_round, submit_set,
+)
+from app.game_manager import GameManager
+
+# name -> setup function returning the callable to time
+BENCHMARKS: Dict[str, Callable[[], Callable[[], object]]] = {}
+
+
+def benchmark(name: str):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+# ----------------------
+# Board Fixtures
+# ----------------------
+
+def set_free_board(size: int, seed: int = 0) -> List:
+    """A board of the given size without any set (possible up to 20 cards)."""
+    rng = random.Random(seed)
+    while True:
+        order = list(range(81))
+        rng.shuffle(order)
+        chosen, blocked = [], set()
+        for code in order:
+            if code in blocked:
+                continue
+            blocked.update(THIRD_CARD[a][code] for a in chosen)
+            chosen.append(code)
+            if len(chosen) == size:
+                return [CARDS[c] for c in chosen]
+
+
+def late_set_board(size: int, seed: int = 0) -> List:
+    """A board whose sets all sit at the end, the worst case for find_any_set."""
+    board = set_free_board(size - 3, seed)
+    rest = [c for c in CARDS if c not in board]
+    board += random.Random(seed).sample(rest, 3)
+    in_set = {c for found in find_all_sets(board) for c in found}
+    return sorted(board, key=lambda c: c in in_set)
+
+
+def random_board(size: int, seed: int = 0) -> List:
+    return create_deck(seed)[:size]
+
+
+# ----------------------
+# Engine
+# ----------------------
+
+@benchmark("create_deck")
+def _create_deck():
+    return create_deck
+
+
+@benchmark("deal_board")
+def _deal_board():
+    return lambda: deal_board(create_deck(), 12)
+
+
+@benchmark("is_set")
+def _is_set():
+    rng = random.Random(0)
+    triples = [rng.sample(CARDS, 3) for _ in range(1000)]
+    return lambda: [is_set(t) for t in triples]
+
+
+def _register_find_any_set(size: int) -> None:
+    @benchmark(f"find_any_set[random-{size}]")
+    def _random():
+        board = random_board(size)
+        return lambda: find_any_set(board)
+
+    if size <= 20:
+        @benchmark(f"find_any_set[set-free-{size}]")
+        def _set_free():
+            board = set_free_board(size)
+            return lambda: find_any_set(board)
+    else:
+        @benchmark(f"find_any_set[late-set-{size}]")
+        def _late():
+            board = late_set_board(size)
+            return lambda: find_any_set(board)
+
+
+for _size in (12, 15, 18, 21):
+    _register_find_any_set(_size)
+
+
+@benchmark("resolve_round")
+def _resolve_round():
+    def run():
+        deck = create_deck(seed=0)
+        game = Game(deck=deck, board=deal_board(deck), players={"a": Player("a")})
+        while (found := find_any_set(game.board)) is not None:
+            submit_set(game, "a", found, 1.0)
+            resolve_round(game)
+    return run
+
+
+# ----------------------
+# GameManager
+# ----------------------
+
+def running_manager(players: int = 8) -> GameManager:
+    gm = GameManager()
+    for i in range(players):
+        gm.join_lobby(f"player{i}")
+    gm.start_game(seed=0)
+    return gm
+
+
+@benchmark("GameManager.get_state")
+def _get_state():
+    return running_manager().get_state
+
+
+@benchmark("GameManager.get_state_bytes[cached]")
+def _get_state_bytes():
+    return running_manager().get_state_bytes
+
+
+@benchmark("GameManager.submit_and_resolve")
+def _submit_and_resolve():
+    gm = running_manager()
+    players = list(gm.game.players)
+
+    def run():
+        nonlocal gm
+        if gm.state != "running":
+            # a finished game would make every later run a no-op
+            gm = running_manager()
+        sets = gm.find_all_sets()
+        for player in players:
+            gm.submit_and_resolve(player, sets[0], 1.0)
+    return run
+
+
+# ----------------------
+# Round Timer
+# ----------------------
+
+@benchmark("RoundTimer.schedule+cancel[50000 games]")
+def _timer_schedule():
+    from app.round_timer import RoundTimer
+
+    timer = RoundTimer(timeout=30.0)
+    games = [object() for _ in range(50_000)]
+
+    def run():
+        for gm in games:
+            timer.schedule(gm, 1)
+        for gm in games:
+            timer.cancel(gm)
+    return run
+
+
+@benchmark("RoundTimer.advance[50000 games]")
+def _timer_advance():
+    from app.round_timer import RoundTimer
+
+    timer = RoundTimer(timeout=30.0)
+    for gm in [object() for _ in range(50_000)]:
+        timer.schedule(gm, 1)
+    # cost depends on the current slot only, not on the deadlines held elsewhere
+    return timer.advance
+
+
+# ----------------------
+# Matchmaking
+# ----------------------
+
+@benchmark("Matchmaker.join+leave[10000 players]")
+def _matchmaker_queue():
+    from app.game_registry import GameRegistry
+    from app.matchmaking import Matchmaker
+
+    # never fills a game: queue operations only
+    matchmaker = Matchmaker(GameRegistry(), game_size=10**9)
+    names = [f"player{i}" for i in range(10_000)]
+
+    def run():
+        for name in names:
+            matchmaker.join(name)
+        for name in names:
+            matchmaker.leave(name)
+    return run
+
+
+@benchmark("Matchmaker.join[10000 players, 4 per game]")
+def _matchmaker_fill():
+    from app.game_registry import GameRegistry
+    from app.matchmaking import Matchmaker
+
+    names = [f"player{i}" for i in range(10_000)]
+
+    def run():
+        # includes creating and starting 2500 games
+        matchmaker = Matchmaker(GameRegistry(max_games=len(names)), game_size=4)
+        for name in names:
+            matchmaker.join(name)
+    return run
+
+
+# ----------------------
+# Leaderboard
+# ----------------------
+
+_leaderboard_cache = {}
+
+
+def million_player_leaderboard():
+    """Shared by the leaderboard benchmarks; takes a few seconds to build."""
+    from app.leaderboard import Leaderboard
+
+    if "board" not in _leaderboard_cache:
+        rng = random.Random(0)
+        board = Leaderboard()
+        board.rebuild(
+            (f"player{i}", rng.randrange(1, 200), rng.uniform(0.5, 5), rng.uniform(50, 5000))
+            for i in range(1_000_000)
+        )
+        _leaderboard_cache["board"] = board
+    return _leaderboard_cache["board"]
+
+
+@benchmark("Leaderboard.record[1M players]")
+def _leaderboard_record():
+    board = million_player_leaderboard()
+    rng = random.Random(1)
+    players = [f"player{rng.randrange(1_000_000)}" for _ in range(1000)]
+    it = iter(players * 10_000)
+    return lambda: board.record(next(it), rng.uniform(0.5, 60))
+
+
+@benchmark("Leaderboard.rank[1M players]")
+def _leaderboard_rank():
+    board = million_player_leaderboard()
+    return lambda: board.rank("mean_time", "player123456")
+
+
+@benchmark("Leaderboard.around[1M players, radius 10]")
+def _leaderboard_around():
+    board = million_player_leaderboard()
+    return lambda: board.around("wins", "player123456", 10)
+
+
+@benchmark("Leaderboard.top[1M players, offset 500000, 50]")
+def _leaderboard_top():
+    board = million_player_leaderboard()
+    return lambda: board.top("best_time", 50, offset=500_000)
+
+
+@benchmark("Leaderboard.rebuild[100000 players]")
+def _leaderboard_rebuild():
+    from app.leaderboard import Leaderboard
+
+    rng = random.Random(2)
+    results = [
+        (f"player{i}", rng.randrange(1, 200), rng.uniform(0.5, 5), rng.uniform(50, 5000))
+        for i in range(100_000)
+    ]
+    return lambda: Leaderboard().rebuild(results)
+
+
+# ----------------------
+# Metrics
+# ----------------------
+
+@benchmark("metrics Counter.inc")
+def _counter_inc():
+    from app.metrics import SUBMISSIONS
+    return lambda: SUBMISSIONS.inc("accepted")
+
+
+@benchmark("metrics Histogram.observe")
+def _histogram_observe():
+    from app.metrics import ROUND_RESOLUTION
+    return lambda: ROUND_RESOLUTION.observe(0.0003)
+
+
+# ----------------------
+# API
+# ----------------------
+
+@benchmark("api /game/submit round[16 players]")
+def _api_submit():
+    from fastapi.testclient import TestClient
+
+    import app.main as main
+
+    client = TestClient(main.app)
+    players = [f"p{i}" for i in range(16)]
+
+    def new_game():
+        main.gm = GameManager()
+        for name in players:
+            client.post("/lobby/join", json={"name": name})
+        client.post("/lobby/start", params={"seed": 0})
+
+    new_game()
+
+    def run():
+        sets = main.gm.find_all_sets()
+        if not sets:
+            new_game()
+            sets = main.gm.find_all_sets()
+        for name in players:
+            client.post(
+                "/game/submit",
+                json={"player": name, "cards": sets[0], "elapsed_time": 1.0},
+            )
+    return run
+
+
+@benchmark("handlers.submit_set round[16 players]")
+def _handler_submit():
+    from app.routes import handlers
+    from app.schemas import SubmitRequest
+
+    players = [f"player{i}" for i in range(16)]
+    gm = running_manager(16)
+
+    def run():
+        nonlocal gm
+        sets = gm.find_all_sets()
+        if not sets:
+            gm = running_manager(16)
+            sets = gm.find_all_sets()
+        for name in players:
+            handlers.submit_set(gm, SubmitRequest(player=name, cards=sets[0], elapsed_time=1.0))
+    return run
+
+
+@benchmark("api /game/state")
+def _api_state():
+    from fastapi.testclient import TestClient
+
+    import app.main as main
+
+    client = TestClient(main.app)
+    main.gm = running_manager(16)
+    return lambda: client.get("/game/state")
+
+
+# ----------------------
+# Batch (optional NumPy)
+# ----------------------
+
+try:
+    import numpy as np
+
+    from app.batch import find_any_set_batch, is_set_batch
+except ImportError:
+    pass
+else:
+    @benchmark("is_set_batch[1000]")
+    def _is_set_batch():
+        triples = np.random.default_rng(0).integers(0, 81, size=(1000, 3))
+        return lambda: is_set_batch(triples)
+
+    @benchmark("find_any_set_batch[1000x12]")
+    def _find_any_set_batch():
+        boards = np.array([[c.code for c in random_board(12, s)] for s in range(1000)])
+        return lambda: find_any_set_batch(boards)
+
+
+# ----------------------
+# Runner
+# ----------------------
+
+def measure(fn: Callable[[], object], min_time: float, repeat: int) -> Dict:
+    """Times fn in `repeat` samples of at least min_time seconds each."""
+    fn()  # warm-up
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 2 if elapsed == 0 else max(2, int(min_time / elapsed * 1.2))
+
+    samples = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - start) / loops)
+
+    best = min(samples)
+    return {
+        "loops": loops,
+        "repeat": repeat,
+        "mean_s": statistics.fmean(samples),
+        "min_s": best,
+        "stdev_s": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "ops_per_s": 1 / best if best else None,
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(selected: List[str], min_time: float, repeat: int) -> Dict:
+    results = {}
+    for name in selected:
+        results[name] = measure(BENCHMARKS[name](), min_time, repeat)
+        print(f"{name:45s} {results[name]['min_s'] * 1e6:12.2f} us", file=sys.stderr)
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Names of benchmarks that got slower than baseline by more than threshold."""
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base and result["min_s"] > base["min_s"] * (1 + threshold):
+            regressions.append(name)
+            print(
+                f"REGRESSION {name}: {base['min_s'] * 1e6:.2f} us -> {result['min_s'] * 1e6:.2f} us",
+                file=sys.stderr,
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="pattern", help="only run benchmarks whose name contains this")
+    parser.add_argument("-o", "--output", help="write JSON results to this file")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per sample")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown (0.10 = 10%%)")
+    parser.add_argument("--list", action="store_true", help="list benchmark names and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return 0
+
+    selected = [n for n in BENCHMARKS if not args.pattern or args.pattern in n]
+    results = run(selected, args.min_time, args.repeat)
+
+    encoded = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(encoded + "\n")
+    else:
+        print(encoded)
+
+    if args.compare:
+        with open(args.compare) as f:
+            if compare(results, json.load(f), args.threshold):
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""
+Self-play simulator and load generator.
+
+In-process mode plays complete games directly against GameManager:
+
+    python -m benchmarks.simulate --games 1000 --players 4
+
+HTTP mode drives the game-scoped API with concurrent games and players,
+either against a running server or in-process through the ASGI app:
+
+    python -m benchmarks.simulate --http http://localhost:8000
+    python -m benchmarks.simulate --asgi --games 200 --players 8 --concurrency 50
+
+HTTP players solve the board locally from its card IDs, like a real client.
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+import httpx
+
+from app.game_logic import CARDS, find_all_sets
+from app.game_manager import GameManager
+
+
+def _percentiles(samples: List[float]) -> Dict:
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+    return {
+        "p50_ms": pick(0.5),
+        "p90_ms": pick(0.9),
+        "p99_ms": pick(0.99),
+        "max_ms": ordered[-1] * 1000,
+        "mean_ms": statistics.fmean(ordered) * 1000,
+    }
+
+
+def _think_time(rng: random.Random) -> float:
+    """Synthetic solve time in seconds, roughly lognormal around 8 s."""
+    return round(rng.lognormvariate(2.0, 0.5), 3)
+
+
+def _report(mode: str, games: int, rounds: int, elapsed: float, latencies: List[float], errors: int) -> Dict:
+    return {
+        "mode": mode,
+        "games": games,
+        "rounds": rounds,
+        "elapsed_s": elapsed,
+        "games_per_s": games / elapsed if elapsed else None,
+        "rounds_per_s": rounds / elapsed if elapsed else None,
+        "requests": len(latencies),
+        "errors": errors,
+        "latency": _percentiles(latencies),
+    }
+
+
+# ----------------------
+# In-process
+# ----------------------
+
+def play_game(players: int, rng: random.Random, latencies: List[float]) -> int:
+    """Plays one game until it is finished, returns rounds played."""
+    gm = GameManager()
+    names = [f"player{i}" for i in range(players)]
+    for name in names:
+        gm.join_lobby(name)
+    gm.start_game(seed=rng.getrandbits(32))
+
+    rounds = 0
+    while gm.state == "running":
+        sets = gm.find_all_sets()
+        for name in names:
+            start = time.perf_counter()
+            gm.submit_and_resolve(name, rng.choice(sets), _think_time(rng))
+            latencies.append(time.perf_counter() - start)
+        rounds += 1
+    return rounds
+
+
+def simulate_in_process(games: int, players: int, seed: int) -> Dict:
+    rng = random.Random(seed)
+    latencies: List[float] = []
+    rounds = 0
+    start = time.perf_counter()
+    for _ in range(games):
+        rounds += play_game(players, rng, latencies)
+    return _report("in-process", games, rounds, time.perf_counter() - start, latencies, 0)
+
+
+# ----------------------
+# HTTP
+# ----------------------
+
+class HttpLoad:
+    def __init__(self, client: httpx.AsyncClient, players: int, seed: int):
+        self.client = client
+        self.players = players
+        self.rng = random.Random(seed)
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.rounds = 0
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        start = time.perf_counter()
+        res = await self.client.request(method, url, **kwargs)
+        self.latencies.append(time.perf_counter() - start)
+        if res.status_code >= 400:
+            self.errors += 1
+        return res
+
+    async def play_game(self) -> None:
+        game_id = (await self.request("POST", "/games")).json()["game_id"]
+        base = f"/games/{game_id}"
+        names = [f"player{i}" for i in range(self.players)]
+        await asyncio.gather(*(
+            self.request("POST", f"{base}/join", json={"name": name}) for name in names
+        ))
+        start = await self.request("POST", f"{base}/start", params={"seed": self.rng.getrandbits(32)})
+        state = start.json()
+
+        while state["state"] == "running":
+            sets = find_all_sets([CARDS[cid] for cid in state["board"]])
+            await asyncio.gather(*(
+                self.request("POST", f"{base}/submit", json={
+                    "player": name,
+                    "cards": [card.code for card in self.rng.choice(sets)],
+                    "elapsed_time": _think_time(self.rng),
+                })
+                for name in names
+            ))
+            self.rounds += 1
+            state = (await self.request("GET", f"{base}/state")).json()
+        await self.request("DELETE", base)
+
+
+async def simulate_http(client: httpx.AsyncClient, games: int, players: int,
+                        concurrency: int, seed: int, mode: str) -> Dict:
+    load = HttpLoad(client, players, seed)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one_game():
+        async with semaphore:
+            await load.play_game()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_game() for _ in range(games)))
+    elapsed = time.perf_counter() - start
+    return _report(mode, games, load.rounds, elapsed, load.latencies, load.errors)
+
+
+async def run_http(url: str, args) -> Dict:
+    limits = httpx.Limits(max_connections=args.concurrency * args.players)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        return await simulate_http(
+            client, args.games, args.players, args.concurrency, args.seed, "http"
+        )
+
+
+async def run_asgi(args) -> Dict:
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://simulate") as client:
+        return await simulate_http(
+            client, args.games, args.players, args.concurrency, args.seed, "asgi"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=20, help="games in flight (HTTP modes)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--http", metavar="URL", help="drive a running server")
+    parser.add_argument("--asgi", action="store_true", help="drive the app in-process over ASGI")
+    parser.add_argument("-o", "--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    if args.http:
+        report = asyncio.run(run_http(args.http, args))
+    elif args.asgi:
+        report = asyncio.run(run_asgi(args))
+    else:
+        report = simulate_in_process(args.games, args.players, args.seed)
+
+    encoded = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(encoded + "\n")
+    else:
+        print(encoded)
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,18 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from fastapi.testclient import TestClient
 
 from app.main import app
 import app.main as main
 from app.game_manager import GameManager
+from app.config import settings
+from app.game_logic import create_deck, deal_board
+from app.game_registry import GameRegistry
+import app.routes.games as games
+from app.schemas import SubmitResponse
+from app.wire import WIRE_TYPE, decode_state, decode_submit_response, encode_submission
 
 client = TestClient(app)
 
@@ -18,6 +27,7 @@ def reset_manager(monkeypatch):
     new_gm = GameManager()
     # Important: use the object form, not dotted string with separate name.
     monkeypatch.setattr(main, "gm", new_gm)
+    monkeypatch.setattr(games, "registry", GameRegistry())
     yield
     # no teardown needed; next test rebinds
 
@@ -39,6 +49,11 @@ def test_join_lobby_duplicate():
     assert res.status_code == 400
     assert "already" in res.json()["detail"].lower()
 
+def test_join_lobby_long_name():
+    res = client.post("/lobby/join", json={"name": "x" * 65536})
+    assert res.status_code == 422
+    assert client.get("/game/state").json()["players"] == []
+
 def test_cannot_join_after_start():
     client.post("/lobby/join", json={"name": "Alice"})
     client.post("/lobby/join", json={"name": "Bob"})
@@ -53,7 +68,7 @@ def test_start_game_without_players():
 def test_start_game_with_players():
     client.post("/lobby/join", json={"name": "Alice"})
     client.post("/lobby/join", json={"name": "Bob"})
-    res = client.post("/lobby/start")
+    res = client.post("/lobby/start", params={"seed": 0})  # first 12 cards hold a set
     assert res.status_code == 200
     data = res.json()
     assert data["state"] == "running"
@@ -61,6 +76,15 @@ def test_start_game_with_players():
     assert len(data["board"]) == 12
     assert set(data["players"].keys()) == {"Alice", "Bob"}
 
+def test_start_game_seeded():
+    client.post("/lobby/join", json={"name": "Alice"})
+    board = client.post("/lobby/start", params={"seed": 42}).json()["board"]
+    assert board == [c.code for c in deal_board(create_deck(42), 12)]
+
+def test_start_game_invalid_seed():
+    client.post("/lobby/join", json={"name": "Alice"})
+    assert client.post("/lobby/start", params={"seed": -1}).status_code == 422
+
 
 # ----------------------
 # Game State
@@ -88,6 +112,62 @@ def test_get_state_running():
     assert "players" in data  # running returns dict of players -> stats
 
 
+def test_get_sets_not_running():
+    res = client.get("/game/sets")
+    assert res.status_code == 400
+
+def test_get_sets_count_only(monkeypatch):
+    monkeypatch.setattr(settings, "admin_token", "secret")
+    client.post("/lobby/join", json={"name": "Alice"})
+    client.post("/lobby/start")
+
+    res = client.get("/game/sets", headers={"X-Admin-Token": "wrong"})
+    assert res.status_code == 200
+    data = res.json()
+    assert data == {"count": main.gm.count_sets()}
+
+def test_get_sets_admin(monkeypatch):
+    monkeypatch.setattr(settings, "admin_token", "secret")
+    client.post("/lobby/join", json={"name": "Alice"})
+    client.post("/lobby/start")
+
+    res = client.get("/game/sets", headers={"X-Admin-Token": "secret"})
+    assert res.status_code == 200
+    data = res.json()
+    assert data["count"] == len(data["sets"])
+    assert data["sets"] == main.gm.find_all_sets()
+
+def test_get_state_etag_not_modified():
+    client.post("/lobby/join", json={"name": "Alice"})
+    res = client.get("/game/state")
+    etag = res.headers["etag"]
+
+    cached = client.get("/game/state", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    client.post("/lobby/join", json={"name": "Bob"})
+    fresh = client.get("/game/state", headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers["etag"] != etag
+    assert fresh.json()["players"] == ["Alice", "Bob"]
+
+def test_get_state_etag_survives_submissions():
+    client.post("/lobby/join", json={"name": "Alice"})
+    client.post("/lobby/join", json={"name": "Bob"})
+    client.post("/lobby/start", params={"seed": 1})
+    etag = client.get("/game/state").headers["etag"]
+
+    cards = main.gm.find_all_sets()[0]
+    client.post("/game/submit", json={"player": "Alice", "cards": cards, "elapsed_time": 1.0})
+    # the state only changes when the round resolves
+    assert client.get("/game/state", headers={"If-None-Match": etag}).status_code == 304
+
+    client.post("/game/submit", json={"player": "Bob", "cards": cards, "elapsed_time": 2.0})
+    assert client.get("/game/state", headers={"If-None-Match": etag}).status_code == 200
+
+
 # ----------------------
 # Submissions + Round Resolution
 # ----------------------
@@ -135,6 +215,18 @@ def test_submit_invalid_set():
     else:
         assert res.status_code == 400
 
+def test_submit_rejects_negative_time():
+    client.post("/lobby/join", json={"name": "Alice"})
+    client.post("/lobby/join", json={"name": "Bob"})
+    client.post("/lobby/start")
+
+    board_ids = client.get("/game/state").json()["board"]
+    res = client.post(
+        "/game/submit",
+        json={"player": "Alice", "cards": board_ids[:3], "elapsed_time": -1.0},
+    )
+    assert res.status_code == 422
+
 def test_submit_valid_and_resolve():
     from app.game_logic import find_any_set
 
@@ -174,3 +266,198 @@ def test_submit_valid_and_resolve():
     assert data2["winner"] in {"Alice", "Bob"}
     assert data2["state"]["round"] == 2
     assert "history" in data2["state"]
+
+def test_concurrent_submissions():
+    players = [f"p{i}" for i in range(4)]
+    for name in players:
+        client.post("/lobby/join", json={"name": name})
+    client.post("/lobby/start")
+
+    def submit(i):
+        rng = random.Random(i)
+        sets = main.gm.find_all_sets()
+        if not sets:
+            return None
+        res = client.post(
+            "/game/submit",
+            json={"player": rng.choice(players), "cards": rng.choice(sets), "elapsed_time": rng.random()},
+        )
+        return res.json()["winner"] if res.status_code == 200 else None
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        winners = [w for w in pool.map(submit, range(2000)) if w]
+
+    game = main.gm.game
+    assert len(winners) == len(game.history)
+    assert game.round_number == len(game.history) + 1
+    assert len(set(game.board)) == len(game.board)
+    assert not set(game.board) & set(game.deck)
+    assert len(game.board) + len(game.deck) + 3 * len(game.history) == 81
+
+def test_history_paging():
+    client.post("/lobby/join", json={"name": "Alice"})
+    client.post("/lobby/start")
+    for _ in range(4):
+        sets = main.gm.find_all_sets()
+        if not sets:
+            break
+        client.post("/game/submit", json={"player": "Alice", "cards": sets[0], "elapsed_time": 1.0})
+    played = main.gm.game.round_number - 1
+
+    page = client.get("/game/history", params={"after": 0, "limit": 2}).json()
+    assert [r["round"] for r in page["rounds"]] == list(range(1, min(played, 2) + 1))
+    assert page["next"] == (2 if played > 2 else None)
+
+    state = client.get("/game/state").json()
+    assert state["rounds_played"] == played
+    assert len(state["history"]) == played
+
+def test_stats_endpoints(monkeypatch):
+    from app.stats import StatsAggregator
+
+    fresh = StatsAggregator()
+    monkeypatch.setattr(main, "global_stats", fresh)
+    fresh.record("Alice", 2.0)
+
+    assert client.get("/stats").json()["overall"]["count"] == 1
+    assert client.get("/stats", params={"player": "Alice"}).json()["mean"] == 2.0
+    assert client.get("/stats", params={"player": "Ghost"}).status_code == 404
+    assert client.get("/game/stats").json()["overall"] == {"count": 0}
+
+def test_history_invalid_limit():
+    assert client.get("/game/history", params={"limit": 0}).status_code == 422
+
+
+# ----------------------
+# Event Stream
+# ----------------------
+
+def test_events_websocket():
+    with client.websocket_connect("/game/events") as ws:
+        snapshot = ws.receive_json()
+        assert snapshot["type"] == "snapshot"
+        assert snapshot["state"] == {"state": "lobby", "players": []}
+
+        client.post("/lobby/join", json={"name": "Alice"})
+        event = ws.receive_json()
+        assert event == {"type": "player_joined", "version": main.gm.version, "player": "Alice"}
+
+        client.post("/lobby/start")
+        event = ws.receive_json()
+        assert event["type"] == "game_started"
+        assert event["board"] == main.gm.get_state()["board"]
+    assert len(main.gm.events) == 0
+
+def test_events_websocket_unknown_game():
+    from starlette.websockets import WebSocketDisconnect
+
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect("/games/missing/events") as ws:
+            ws.receive_json()
+
+
+# ----------------------
+# Game-scoped Routes
+# ----------------------
+
+def create_running_game(*names):
+    game_id = client.post("/games").json()["game_id"]
+    for name in names:
+        client.post(f"/games/{game_id}/join", json={"name": name})
+    client.post(f"/games/{game_id}/start")
+    return game_id
+
+def test_create_game():
+    res = client.post("/games")
+    assert res.status_code == 201
+    game_id = res.json()["game_id"]
+    assert game_id in games.registry
+
+    state = client.get(f"/games/{game_id}/state").json()
+    assert state == {"state": "lobby", "players": []}
+
+def test_unknown_game():
+    assert client.get("/games/missing/state").status_code == 404
+    assert client.post("/games/missing/join", json={"name": "Alice"}).status_code == 404
+    assert client.delete("/games/missing").status_code == 404
+
+def test_delete_game():
+    game_id = client.post("/games").json()["game_id"]
+    assert client.delete(f"/games/{game_id}").status_code == 204
+    assert client.get(f"/games/{game_id}/state").status_code == 404
+
+def test_games_are_isolated():
+    first = create_running_game("Alice", "Bob")
+    second = client.post("/games").json()["game_id"]
+    client.post(f"/games/{second}/join", json={"name": "Alice"})
+
+    assert client.get(f"/games/{first}/state").json()["state"] == "running"
+    assert client.get(f"/games/{second}/state").json() == {"state": "lobby", "players": ["Alice"]}
+    # default game is untouched
+    assert client.get("/game/state").json() == {"state": "lobby", "players": []}
+
+def test_game_scoped_submit_and_resolve():
+    game_id = create_running_game("Alice", "Bob")
+    gm = games.registry.get(game_id)
+    sets = gm.find_all_sets()
+    if not sets:
+        pytest.skip("Generated board has no set")
+    set_ids = sets[0]
+
+    r1 = client.post(f"/games/{game_id}/submit", json={"player": "Alice", "cards": set_ids, "elapsed_time": 1.0})
+    assert r1.status_code == 200
+    assert r1.json()["winner"] is None
+
+    r2 = client.post(f"/games/{game_id}/submit", json={"player": "Bob", "cards": set_ids, "elapsed_time": 2.0})
+    assert r2.status_code == 200
+    assert r2.json()["winner"] == "Alice"
+    assert r2.json()["state"]["round"] == 2
+    assert r2.headers["content-type"] == "application/json"
+    assert SubmitResponse.model_validate_json(r2.content).state.round == 2
+    assert r2.json()["state"] == client.get(f"/games/{game_id}/state").json()
+
+
+# ----------------------
+# Binary Wire Format
+# ----------------------
+
+def test_state_in_wire_format():
+    game_id = create_running_game("Alice", "Bob")
+    res = client.get(f"/games/{game_id}/state", headers={"Accept": WIRE_TYPE})
+    assert res.status_code == 200
+    assert res.headers["content-type"] == WIRE_TYPE
+    assert "Accept" in res.headers["vary"]
+    state = client.get(f"/games/{game_id}/state").json()
+    assert decode_state(res.content) == {k: v for k, v in state.items() if k != "history"}
+
+    # each representation has its own ETag
+    etag = res.headers["etag"]
+    again = client.get(f"/games/{game_id}/state", headers={"Accept": WIRE_TYPE, "If-None-Match": etag})
+    assert again.status_code == 304
+    assert client.get(f"/games/{game_id}/state", headers={"If-None-Match": etag}).status_code == 200
+
+def test_submit_in_wire_format():
+    game_id = create_running_game("Alice", "Bob")
+    sets = games.registry.get(game_id).find_all_sets()
+    headers = {"Content-Type": WIRE_TYPE, "Accept": WIRE_TYPE}
+
+    r1 = client.post(f"/games/{game_id}/submit", content=encode_submission("Alice", sets[0], 1500), headers=headers)
+    assert r1.status_code == 200
+    assert decode_submit_response(r1.content)[0] is None
+
+    # binary request, JSON response
+    r2 = client.post(
+        f"/games/{game_id}/submit",
+        content=encode_submission("Bob", sets[0], 2500),
+        headers={"Content-Type": WIRE_TYPE},
+    )
+    assert r2.json()["winner"] == "Alice"
+    assert r2.json()["state"]["players"]["Alice"]["times"] == [1500.0]
+
+def test_malformed_submissions_rejected():
+    game_id = create_running_game("Alice")
+    url = f"/games/{game_id}/submit"
+    assert client.post(url, content=b"\x01", headers={"Content-Type": WIRE_TYPE}).status_code == 400
+    res = client.post(url, json={"player": "Alice", "cards": "nope"})
+    assert res.status_code == 422
+    assert res.json()["detail"][0]["loc"][:2] == ["body", "cards"]
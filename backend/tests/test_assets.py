@@ -0,0 +1,72 @@
+import gzip
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.assets import AssetBundle, build_sprite, card_filename
+from app.config import settings
+from app.game_logic import CARDS
+from app.main import app
+
+client = TestClient(app)
+
+pytestmark = pytest.mark.skipif(
+    not os.path.isdir(settings.cards_dir), reason="card images not checked out"
+)
+
+
+# --------------------
+# Bundle
+# --------------------
+
+def test_manifest_covers_every_card_id():
+    bundle = AssetBundle(settings.cards_dir)
+    cards = bundle.manifest["cards"]
+    assert sorted(cards) == list(range(81))
+    red_diamond = cards[CARDS[0].code]["svg"]
+    assert red_diamond.startswith("/cards/" + card_filename(CARDS[0], "svg")[:-4] + ".")
+
+def test_hashed_names_follow_content():
+    bundle = AssetBundle(settings.cards_dir)
+    again = AssetBundle(settings.cards_dir)
+    assert bundle.manifest == again.manifest
+    assert len({a.name for a in bundle.assets.values()}) == 163
+
+def test_sprite_has_one_symbol_per_card():
+    svg = b'<?xml version="1.0"?><svg width="100px" height="150px"><circle r="1" /></svg>'
+    sprite = build_sprite([svg, svg]).decode()
+    assert '<symbol id="card-0" viewBox="0 0 100 150"><circle r="1" /></symbol>' in sprite
+    assert 'id="card-1"' in sprite
+    with pytest.raises(ValueError):
+        build_sprite([b"not svg"])
+
+
+# --------------------
+# Routes
+# --------------------
+
+def test_serve_sprite_precompressed():
+    manifest = client.get("/cards/manifest.json").json()
+    assert client.get("/cards/manifest.json").headers["cache-control"] == "no-cache"
+
+    res = client.get(manifest["sprite"], headers={"Accept-Encoding": "gzip"})
+    assert res.status_code == 200
+    assert res.headers["content-type"] == "image/svg+xml"
+    assert res.headers["content-encoding"] == "gzip"
+    assert "immutable" in res.headers["cache-control"]
+    assert res.text.count("<symbol") == 81
+
+    raw = client.get(manifest["sprite"], headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in raw.headers
+    assert gzip.decompress(gzip.compress(raw.content)) == res.content
+
+def test_serve_png_and_revalidate():
+    url = client.get("/cards/manifest.json").json()["cards"]["80"]["png"]
+    res = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert res.headers["content-type"] == "image/png"
+    assert "content-encoding" not in res.headers
+    assert client.get(url, headers={"If-None-Match": res.headers["etag"]}).status_code == 304
+
+def test_unknown_asset():
+    assert client.get("/cards/green_diamond_1_open.svg").status_code == 404
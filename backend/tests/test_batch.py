@@ -0,0 +1,87 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.batch import PAD, find_any_set_batch, is_set_batch, pack_boards  # noqa: E402
+from app.game_logic import CARDS, THIRD_CARD, create_deck, find_any_set, is_set  # noqa: E402
+
+
+# --------------------
+# is_set_batch
+# --------------------
+
+def test_is_set_batch_matches_scalar():
+    rng = np.random.default_rng(0)
+    triples = rng.integers(0, 81, size=(20_000, 3))
+    # complete every other triple so about half of them are sets
+    for t in triples[::2]:
+        t[2] = THIRD_CARD[t[0]][t[1]]
+    expected = [is_set([CARDS[c] for c in t]) for t in triples]
+    assert is_set_batch(triples).tolist() == expected
+
+def test_is_set_batch_all_sets():
+    from app.game_logic import find_all_sets
+
+    triples = [[c.code for c in s] for s in find_all_sets(list(CARDS))]
+    assert is_set_batch(triples).all()
+
+def test_is_set_batch_validates_input():
+    with pytest.raises(ValueError):
+        is_set_batch([[0, 1]])
+    with pytest.raises(ValueError):
+        is_set_batch([[0, 1, 81]])
+    with pytest.raises(TypeError):
+        is_set_batch([[0.0, 1.0, 2.0]])
+    assert is_set_batch(np.empty((0, 3), dtype=int)).shape == (0,)
+
+
+# --------------------
+# find_any_set_batch
+# --------------------
+
+def test_find_any_set_batch_matches_scalar():
+    rng = random.Random(0)
+    boards = [create_deck()[:rng.choice([3, 6, 9, 12, 15, 18, 21])] for _ in range(500)]
+    result = find_any_set_batch([[c.code for c in b] for b in boards])
+
+    for board, row in zip(boards, result.tolist()):
+        expected = find_any_set(board)
+        if expected is None:
+            assert row == [-1, -1, -1]
+        else:
+            assert row == [c.code for c in expected]
+
+def test_find_any_set_batch_set_free_board():
+    board = [
+        ("red", "diamond", 2, "striped"), ("green", "diamond", 3, "solid"),
+        ("green", "squiggle", 1, "open"), ("purple", "oval", 3, "striped"),
+        ("red", "squiggle", 3, "striped"), ("red", "diamond", 3, "open"),
+        ("purple", "squiggle", 2, "striped"), ("green", "squiggle", 3, "striped"),
+        ("green", "diamond", 2, "solid"), ("purple", "squiggle", 1, "open"),
+        ("purple", "squiggle", 1, "solid"), ("red", "diamond", 1, "striped"),
+    ]
+    from app.game_logic import Card
+
+    codes = [Card(*attrs).code for attrs in board]
+    assert find_any_set_batch([codes]).tolist() == [[-1, -1, -1]]
+
+def test_find_any_set_batch_validates_input():
+    # -80 would otherwise wrap around to card 2 and complete the set
+    with pytest.raises(ValueError):
+        find_any_set_batch(np.array([[0, 1, -80]]))
+    with pytest.raises(ValueError):
+        find_any_set_batch(np.array([[0, 1, 82]]))
+    with pytest.raises(ValueError):
+        find_any_set_batch([[0, 1, -1]])
+    with pytest.raises(ValueError):
+        find_any_set_batch(np.array([0, 1, 2]))
+    with pytest.raises(TypeError):
+        find_any_set_batch(np.array([[0.0, 1.0, 2.0]]))
+    assert find_any_set_batch(np.array([[0, 1, 2, PAD]])).tolist() == [[0, 1, 2]]
+
+def test_pack_boards_pads():
+    packed = pack_boards([[1, 2, 3], [4]])
+    assert packed.tolist() == [[1, 2, 3], [4, PAD, PAD]]
+    assert find_any_set_batch([]).shape == (0, 3)
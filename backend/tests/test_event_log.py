@@ -0,0 +1,142 @@
+import pytest
+
+from app.event_log import (
+    EventLog, JOIN, RESOLVE, START, SUBMIT, decode_events, encode_event, flush, load_logs, recover,
+    replay, verify,
+)
+from app.game_manager import GameManager
+from app.game_registry import GameRegistry
+
+
+def logged_game(log, players=("alice", "bob"), rounds=None, seed=0):
+    gm = GameManager()
+    gm.attach_log(log)
+    for name in players:
+        gm.join_lobby(name)
+    gm.start_game(seed=seed)
+    played = 0
+    while gm.state == "running" and (rounds is None or played < rounds):
+        sets = gm.find_all_sets()
+        for i, player in enumerate(players):
+            gm.submit_and_resolve(player, sets[i % len(sets)], float(i + 1))
+        played += 1
+    return gm
+
+
+# --------------------
+# Encoding
+# --------------------
+
+def test_events_are_recorded_in_order():
+    log = EventLog()
+    gm = logged_game(log, rounds=1)
+    events = [event for _, event in decode_events(log.buffer)]
+
+    assert events[:3] == [(JOIN, "alice"), (JOIN, "bob"), (START, 0)]
+    assert [kind for kind, _ in events[3:]] == [SUBMIT, SUBMIT, RESOLVE]
+    assert events[3][1][0] == 0 and events[4][1][0] == 1
+    assert events[-1] == (RESOLVE, 1)
+    assert log.count == len(events)
+    assert gm.game.round_number == 2
+
+def test_truncated_record_is_ignored():
+    log = EventLog()
+    logged_game(log, rounds=1)
+    events = list(decode_events(log.buffer))
+    assert list(decode_events(log.buffer[:-1])) == events[:-1]
+
+
+# --------------------
+# Replay / Recovery
+# --------------------
+
+def test_replay_reproduces_game():
+    log = EventLog()
+    gm = logged_game(log)
+    assert gm.state == "finished"
+    again = replay(log)
+    assert again.to_snapshot() == gm.to_snapshot()
+    assert again.get_stats() == gm.get_stats()
+
+def test_replay_until_round():
+    log = EventLog()
+    logged_game(log, rounds=5)
+    gm = replay(log, until_round=3)
+    assert gm.game.round_number == 3
+    assert len(gm.game.history) == 2
+    assert not gm.game.submissions
+
+def test_recover_from_snapshot_and_tail():
+    log = EventLog(snapshot_every=8)
+    gm = logged_game(log, rounds=6)
+    offset, _ = log.snapshot
+    assert 0 < offset < len(log.buffer)
+
+    recovered = recover(log)
+    assert recovered.to_snapshot() == gm.to_snapshot()
+    assert recovered.get_state() == gm.get_state()
+    assert verify(log)["deterministic"]
+
+def test_divergent_log_is_rejected():
+    log = EventLog()
+    logged_game(log, rounds=2)
+    # drop the first resolution, so the next round's submissions are duplicates
+    ends = [offset for offset, _ in decode_events(log.buffer)]
+    tampered = EventLog()
+    tampered.buffer = log.buffer[:ends[4]] + log.buffer[ends[5]:]
+    with pytest.raises(RuntimeError):
+        replay(tampered)
+
+
+# --------------------
+# Files
+# --------------------
+
+def test_load_logs_from_directory(tmp_path):
+    registry = GameRegistry(log_dir=str(tmp_path))
+    game_id = registry.create_game()
+    gm = registry.get(game_id)
+    gm.log.snapshot_every = 5
+    gm.join_lobby("alice")
+    gm.start_game(seed=0)
+    for _ in range(3):
+        gm.submit_and_resolve("alice", gm.find_all_sets()[0], 2.0)
+    flush()
+    assert (tmp_path / f"{game_id}.log.snap").exists()
+
+    restored = load_logs(str(tmp_path))
+    assert set(restored) == {game_id}
+    again = restored[game_id]
+    assert again.to_snapshot() == gm.to_snapshot()
+
+    # the recovered game keeps appending to the same log
+    again.submit_and_resolve("alice", again.find_all_sets()[0], 3.0)
+    assert recover(EventLog.open(str(tmp_path / f"{game_id}.log"))).to_snapshot() == again.to_snapshot()
+
+    registry.remove(game_id)
+    flush()
+    assert not list(tmp_path.iterdir())
+
+def test_torn_write_then_append_recovers(tmp_path):
+    path = str(tmp_path / "g.log")
+    gm = GameManager()
+    gm.attach_log(EventLog(path))
+    gm.join_lobby("alice")
+    gm.join_lobby("bob")
+    gm.start_game(seed=0)
+    flush()
+    with open(path, "ab") as f:
+        f.write(encode_event(JOIN, b"carol")[:4])  # crash mid-write
+
+    gm = load_logs(str(tmp_path))["g"]
+    assert gm.submit_set("alice", gm.find_all_sets()[0], 1.0)
+    flush()
+    again = load_logs(str(tmp_path))["g"]
+    assert again.to_snapshot() == gm.to_snapshot()
+
+def test_unrecoverable_log_is_skipped(tmp_path, caplog):
+    logged_game(EventLog(str(tmp_path / "good.log")), rounds=1)
+    (tmp_path / "bad.log").write_bytes(encode_event(START, (0).to_bytes(8, "little")) * 2)
+    flush()
+    assert set(load_logs(str(tmp_path))) == {"good"}
+    assert "Could not recover game bad" in caplog.text
@@ -0,0 +1,102 @@
+import asyncio
+import json
+import threading
+
+from app.events import RESYNC, EventHub
+from app.game_manager import GameManager
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+# --------------------
+# Event Hub
+# --------------------
+
+def test_publish_without_subscribers():
+    hub = EventHub()
+    hub.publish({"type": "noop"})  # nothing to do, must not fail
+    assert len(hub) == 0
+
+def test_publish_encodes_once_for_all_subscribers():
+    async def scenario():
+        hub = EventHub()
+        a, b = hub.subscribe(), hub.subscribe()
+        hub.publish({"type": "ping", "n": 1})
+        ea, eb = await a.get(), await b.get()
+        assert ea is eb
+        assert json.loads(ea.text) == {"type": "ping", "n": 1}
+        assert ea.sse == b'data: {"type":"ping","n":1}\n\n'
+
+    run(scenario())
+
+def test_publish_from_other_thread():
+    async def scenario():
+        hub = EventHub()
+        sub = hub.subscribe()
+        t = threading.Thread(target=hub.publish, args=({"type": "ping"},))
+        t.start()
+        event = await asyncio.wait_for(sub.get(), 1)
+        t.join()
+        assert json.loads(event.text) == {"type": "ping"}
+
+    run(scenario())
+
+def test_slow_subscriber_gets_resync():
+    async def scenario():
+        hub = EventHub(max_queue=4)
+        sub = hub.subscribe()
+        for i in range(10):
+            hub.publish({"type": "ping", "n": i})
+        await asyncio.sleep(0)
+        assert sub.queue.qsize() <= 4
+        events = [sub.queue.get_nowait() for _ in range(sub.queue.qsize())]
+        assert RESYNC in events
+
+    run(scenario())
+
+def test_unsubscribe():
+    async def scenario():
+        hub = EventHub()
+        sub = hub.subscribe()
+        hub.unsubscribe(sub)
+        assert len(hub) == 0
+
+    run(scenario())
+
+
+# --------------------
+# Game Events
+# --------------------
+
+def test_game_publishes_deltas():
+    async def scenario():
+        gm = GameManager()
+        sub, snapshot = gm.subscribe()
+        assert json.loads(snapshot.text)["state"] == {"state": "lobby", "players": []}
+
+        gm.join_lobby("alice")
+        gm.join_lobby("bob")
+        gm.start_game()
+        start_board = gm.get_state()["board"]
+        sets = gm.find_all_sets()
+        if sets:
+            gm.submit_and_resolve("alice", sets[0], 1.0)
+            gm.submit_and_resolve("bob", sets[0], 2.0)
+        await asyncio.sleep(0)
+
+        events = [json.loads(sub.queue.get_nowait().text) for _ in range(sub.queue.qsize())]
+        types = [e["type"] for e in events]
+        assert types[:3] == ["player_joined", "player_joined", "game_started"]
+        assert events[2]["board"] == start_board
+        if sets:
+            assert types[3:] == ["round_resolved", "board_changed"]
+            assert events[3]["winner"] == "alice"
+            assert sorted(events[4]["removed"]) == sorted(sets[0])
+            board = set(gm.get_state()["board"])
+            assert set(events[4]["added"]) <= board
+        versions = [e["version"] for e in events]
+        assert versions == sorted(versions)
+
+    run(scenario())
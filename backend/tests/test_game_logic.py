@@ -1,6 +1,8 @@
 import pytest
 
-from app.game_logic import Game, Player, submit_set, resolve_round, create_deck, Card, deal_board,is_set, find_any_set
+from itertools import combinations
+
+from app.game_logic import Game, Player, submit_set, resolve_round, create_deck, Card, deal_board,is_set, find_any_set, CARDS, THIRD_CARD, find_all_sets, count_sets, BoardIndex, board_index, is_finished
 
 
 # --------------------
@@ -28,18 +30,59 @@ def test_generate_deck_feature_coverage():
     assert numbers == {1, 2, 3}
     assert shadings == {"solid", "striped", "open"}
 
+# --------------------
+# Card Encoding
+# --------------------
+
+def test_card_code_roundtrip():
+    assert len(CARDS) == 81
+    for code, card in enumerate(CARDS):
+        assert card.code == code
+        assert Card.from_code(code) == card
+        assert Card(card.color, card.shape, card.number, card.shading).code == code
+
+def test_card_unknown_attribute():
+    with pytest.raises(ValueError):
+        Card("blue", "oval", 1, "solid")
+
+def test_third_card_completes_set():
+    for a, b in combinations(range(81), 2):
+        c = THIRD_CARD[a][b]
+        assert c not in (a, b)
+        assert THIRD_CARD[b][a] == c
+        assert THIRD_CARD[a][c] == b
+
+def test_seeded_deck_is_reproducible():
+    assert create_deck(seed=7) == create_deck(seed=7)
+    assert create_deck(seed=7) != create_deck(seed=8)
+
+def test_deck_from_order():
+    from app.game_logic import deck_from_order
+
+    deck = create_deck(seed=3)
+    order = bytes(card.code for card in deck)
+    assert len(order) == 81
+    assert deck_from_order(order) == deck
+    assert all(a is b for a, b in zip(deck_from_order(order), deck))
+
 # --------------------
 # Deal Board
 # --------------------
 
 def test_deal_board_default():
-    deck = create_deck()
+    deck = create_deck(seed=0)  # first 12 cards hold a set
     board = deal_board(deck, 12)
     assert len(board) == 12
     assert len(deck) == 81 - 12
     for card in board:
         assert card not in deck
 
+def test_deal_board_extends_set_free_board():
+    deck = create_deck(seed=1)  # first 12 cards hold no set
+    board = deal_board(deck, 12)
+    assert len(board) == 15
+    assert count_sets(board) > 0
+
 # --------------------
 # Set Validation
 # --------------------
@@ -101,6 +144,86 @@ def test_find_any_set_none():
         Card("red", "diamond", 1, "striped"),
     ]
     assert find_any_set(board) is None
+
+def test_find_any_set_matches_first_combination():
+    for _ in range(20):
+        board = create_deck()[:15]
+        expected = next((list(c) for c in combinations(board, 3) if is_set(list(c))), None)
+        assert find_any_set(board) == expected
+# --------------------
+# Find All Sets
+# --------------------
+
+def test_find_all_sets_matches_brute_force():
+    for size in (12, 15, 18, 21):
+        board = create_deck()[:size]
+        expected = {frozenset(c) for c in combinations(board, 3) if is_set(list(c))}
+        found = find_all_sets(board)
+        assert {frozenset(c) for c in found} == expected
+        assert len(found) == len(expected)
+        assert count_sets(board) == len(expected)
+
+def test_find_all_sets_full_deck():
+    # every pair of the 81 cards determines exactly one set: 81 * 80 / 6
+    assert count_sets(list(CARDS)) == 1080
+    assert len(find_all_sets(list(CARDS))) == 1080
+
+def test_count_sets_empty_board():
+    assert count_sets([]) == 0
+    assert find_all_sets([]) == []
+
+# --------------------
+# Board Index
+# --------------------
+
+def test_board_index_tracks_count():
+    import random
+
+    rng = random.Random(0)
+    board = []
+    index = BoardIndex()
+    for _ in range(500):
+        if board and (len(board) > 20 or rng.random() < 0.4):
+            card = board.pop(rng.randrange(len(board)))
+            index.remove(card)
+        else:
+            card = rng.choice([c for c in CARDS if c not in board])
+            board.append(card)
+            index.add(card)
+        assert index.count == count_sets(board)
+
+def test_deal_board_always_has_set():
+    for _ in range(50):
+        deck = create_deck()
+        board = deal_board(deck, 12)
+        assert count_sets(board) > 0
+        assert len(board) in (12, 15, 18, 21)
+        assert len(board) + len(deck) == 81
+
+def test_board_index_resyncs_after_external_change():
+    game = make_simple_game()
+    assert board_index(game).count == count_sets(game.board)
+    game.board = game.board[:6]
+    assert board_index(game).count == count_sets(game.board)
+    game.board.pop()
+    assert board_index(game).count == count_sets(game.board)
+    game.board[0] = next(c for c in CARDS if c not in game.board)
+    game.index = None
+    assert board_index(game).count == count_sets(game.board)
+
+def test_board_index_in_sync_is_not_rebuilt(monkeypatch):
+    import app.game_logic as logic
+
+    game = make_simple_game()
+    index = board_index(game)
+    monkeypatch.setattr(logic, "BoardIndex", None)  # any rebuild would fail
+    assert board_index(game) is index
+    is_finished(game)
+    # resolving a round keeps the index in sync with the new board
+    assert submit_set(game, "alice", find_any_set(game.board), 1.0)
+    resolve_round(game)
+    assert board_index(game).count == count_sets(game.board)
+
 # --------------------
 # Game Flow
 # --------------------
@@ -164,3 +287,50 @@ def test_deck_depletion():
     assert winner == "alice"
     assert len(game.board) == 1 + 0  # old board cleared, + 1 card left in deck
     assert game.deck == []
+
+
+def test_resolve_round_refills_to_board_size_with_a_set():
+    game = make_simple_game()
+    while not is_finished(game):
+        found = find_any_set(game.board)
+        assert found is not None
+        submit_set(game, "alice", found, 1.0)
+        resolve_round(game)
+        if game.deck:
+            assert len(game.board) >= 12
+            assert count_sets(game.board) > 0
+    assert game.deck == []
+    assert count_sets(game.board) == 0
+    assert len(game.board) + 3 * (game.round_number - 1) == 81
+
+def test_resolve_round_deals_until_set():
+    set_free = [
+        Card("red", "diamond", 2, "striped"),
+        Card("green", "diamond", 3, "solid"),
+        Card("green", "squiggle", 1, "open"),
+        Card("purple", "oval", 3, "striped"),
+        Card("red", "squiggle", 3, "striped"),
+        Card("red", "diamond", 3, "open"),
+        Card("purple", "squiggle", 2, "striped"),
+        Card("green", "squiggle", 3, "striped"),
+        Card("green", "diamond", 2, "solid"),
+        Card("purple", "squiggle", 1, "open"),
+        Card("purple", "squiggle", 1, "solid"),
+        Card("red", "diamond", 1, "striped"),
+    ]
+    winning = [Card("red", "oval", 1, "solid"), Card("red", "oval", 2, "solid"), Card("red", "oval", 3, "solid")]
+    rest = [c for c in CARDS if c not in set_free and c not in winning]
+    # next cards in the deck keep the board set-free for a while
+    filler = []
+    for card in rest:
+        if count_sets(set_free[3:] + filler + [card]) == 0:
+            filler.append(card)
+        if len(filler) == 6:
+            break
+    deck = set_free[:3] + filler + [c for c in rest if c not in filler]
+    game = Game(deck=deck, board=set_free[3:] + winning, players={"alice": Player("alice")})
+
+    submit_set(game, "alice", winning, 1.0)
+    resolve_round(game)
+    assert count_sets(game.board) > 0
+    assert len(game.board) >= 15
@@ -1,3 +1,7 @@
+import json
+import random
+import threading
+
 import pytest
 from app.game_manager import GameManager
 from app.game_logic import find_any_set
@@ -25,7 +29,7 @@ def test_lobby_join_and_start():
     assert "alice" in state["players"]
     assert "bob" in state["players"]
 
-    gm.start_game()
+    gm.start_game(seed=0)
     state = gm.get_state()
     assert state["state"] == "running"
     assert set(state["players"].keys()) == {"alice", "bob"}
@@ -63,6 +67,204 @@ def test_submit_set_invalid():
         assert "player0" not in gm.game.submissions
 
 
+# ----------------------
+# State Snapshots
+# ----------------------
+
+def test_version_bumps_on_mutation():
+    gm = GameManager()
+    v0 = gm.version
+    gm.join_lobby("alice")
+    assert gm.version > v0
+    v1 = gm.version
+    gm.start_game()
+    assert gm.version > v1
+
+
+def test_state_bytes_cached_per_content():
+    gm = setup_game()
+    body, etag = gm.get_state_bytes()
+    again, same_etag = gm.get_state_bytes()
+    assert again is body
+    assert same_etag == etag
+    assert json.loads(body) == gm.get_state()
+
+    sets = gm.find_all_sets()
+    if not sets:
+        pytest.skip("Generated board has no set")
+    gm.submit_and_resolve("player0", sets[0], 1.0)
+    gm.submit_and_resolve("player1", sets[0], 2.0)
+    body2, etag2 = gm.get_state_bytes()
+    assert etag2 != etag
+    assert json.loads(body2)["round"] == 2
+
+
+def test_state_bytes_survive_submissions():
+    gm = setup_game()
+    sets = gm.find_all_sets()
+    if not sets:
+        pytest.skip("Generated board has no set")
+    body, etag = gm.get_state_bytes()
+    gm.submit_set("player0", sets[0], 1.0)
+    again, new_etag = gm.get_state_bytes()
+    # submissions are not part of the state, so the encoding and ETag are reused
+    assert again is body
+    assert new_etag == etag
+
+
+def test_state_history_is_bounded():
+    gm = setup_game()
+    for r in range(1, 51):
+        gm.game.history.append(r, "player0", {"player0": 1.0})
+
+    state = gm.get_state()
+    assert state["rounds_played"] == 50
+    assert [r["round"] for r in state["history"]] == list(range(41, 51))
+
+    page = gm.get_history(after=45, limit=3)
+    assert [r["round"] for r in page["rounds"]] == [46, 47, 48]
+    assert page["next"] == 48
+    assert gm.get_history(after=48)["next"] is None
+
+
+def test_etag_unique_per_manager():
+    assert GameManager().etag != GameManager().etag
+
+
+# ----------------------
+# Set Search
+# ----------------------
+
+def test_find_all_sets_returns_board_ids():
+    gm = setup_game()
+    board_ids = set(gm.get_state()["board"])
+
+    sets = gm.find_all_sets()
+    assert gm.count_sets() == len(sets)
+    for set_ids in sets:
+        assert set(set_ids) <= board_ids
+        assert gm.submit_set("player0", set_ids, elapsed_time=1.0)
+
+
+def test_count_sets_in_lobby():
+    gm = GameManager()
+    assert gm.count_sets() == 0
+    assert gm.find_all_sets() == []
+
+
+def test_submit_rejects_cards_off_board():
+    gm = setup_game()
+    board = set(gm.get_state()["board"])
+    off_board = [cid for cid in range(81) if cid not in board]
+    assert not gm.submit_set("player0", off_board[:3], elapsed_time=1.0)
+
+
+def test_submit_rejects_duplicate_and_unknown_ids():
+    gm = setup_game()
+    cid = gm.get_state()["board"][0]
+    assert not gm.submit_set("player0", [cid, cid, cid], elapsed_time=1.0)
+    assert not gm.submit_set("player0", [cid, 81, 82], elapsed_time=1.0)
+    assert "player0" not in gm.game.submissions
+
+
+
+@pytest.mark.parametrize("elapsed_time", [-1.0, float("inf"), float("nan")])
+def test_submit_rejects_bad_times(elapsed_time):
+    gm = setup_game()
+    sets = gm.find_all_sets()
+    assert not gm.submit_set("player0", sets[0], elapsed_time)
+    assert "player0" not in gm.game.submissions
+
+
+def test_submit_and_resolve():
+    gm = setup_game()
+    sets = gm.find_all_sets()
+    if not sets:
+        pytest.skip("Generated board has no set")
+
+    assert gm.submit_and_resolve("player0", sets[0], 1.0) == (True, None)
+    assert gm.submit_and_resolve("player1", sets[0], 2.0) == (True, "player0")
+    assert gm.game.round_number == 2
+    assert gm.game.history[-1]["submissions"] == {"player0": 1.0, "player1": 2.0}
+
+
+def test_game_finishes_when_no_set_left():
+    gm = setup_game()
+    while gm.state == "running":
+        sets = gm.find_all_sets()
+        assert sets  # a running game always has a set on the board
+        gm.submit_and_resolve("player0", sets[0], 1.0)
+        gm.submit_and_resolve("player1", sets[0], 2.0)
+
+    assert gm.state == "finished"
+    assert gm.game.deck == []
+    assert gm.count_sets() == 0
+    assert gm.get_state()["state"] == "finished"
+    assert not gm.submit_set("player0", gm.get_state()["board"][:3], 1.0)
+
+
+def test_seeded_games_are_reproducible():
+    a, b = GameManager(), GameManager()
+    for gm in (a, b):
+        gm.join_lobby("alice")
+        gm.start_game(seed=1234)
+    assert a.seed == b.seed == 1234
+    assert a.deck_order == b.deck_order
+    assert len(a.deck_order) == 81 and sorted(a.deck_order) == list(range(81))
+    assert a.get_state()["board"] == b.get_state()["board"]
+
+
+def test_unseeded_game_records_seed():
+    gm = GameManager()
+    gm.join_lobby("alice")
+    gm.start_game()
+    replay = GameManager()
+    replay.join_lobby("alice")
+    replay.start_game(seed=gm.seed)
+    assert replay.deck_order == gm.deck_order
+
+
+def test_card_ids_are_card_codes():
+    gm = setup_game()
+    assert gm.card_lookup is GameManager().card_lookup
+    for cid in gm.get_state()["board"]:
+        assert gm.card_lookup[cid].code == cid
+
+
+def assert_card_invariants(gm):
+    """Every card is on the board, in the deck or was won in exactly one round."""
+    game = gm.game
+    assert len(set(game.board)) == len(game.board)
+    assert not set(game.board) & set(game.deck)
+    assert len(game.board) + len(game.deck) + 3 * len(game.history) == 81
+    assert game.round_number == len(game.history) + 1
+
+
+def test_concurrent_submissions_keep_invariants():
+    gm = setup_game(num_players=4)
+    players = [f"player{i}" for i in range(4)]
+    winners = []
+
+    def worker(seed):
+        rng = random.Random(seed)
+        for _ in range(250):
+            sets = gm.find_all_sets()
+            if not sets:
+                return
+            ok, winner = gm.submit_and_resolve(rng.choice(players), rng.choice(sets), rng.random())
+            if winner:
+                winners.append(winner)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(winners) == len(gm.game.history)
+    assert_card_invariants(gm)
+
+
 # ----------------------
 # Round Resolution
 # ----------------------
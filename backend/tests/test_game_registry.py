@@ -0,0 +1,175 @@
+import asyncio
+
+import pytest
+
+from app.event_log import flush as flush_logs
+from app.game_manager import GameManager
+from app.game_registry import GameRegistry
+from app.persistence import Store
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+# ----------------------
+# Create / Lookup
+# ----------------------
+
+def test_create_and_get_game():
+    registry = GameRegistry()
+    game_id = registry.create_game()
+    assert game_id in registry
+    assert len(registry) == 1
+
+    gm = registry.get(game_id)
+    assert gm.state == "lobby"
+    assert registry.get(game_id) is gm
+
+def test_games_are_independent():
+    registry = GameRegistry()
+    a = registry.get(registry.create_game())
+    b = registry.get(registry.create_game())
+    a.join_lobby("alice")
+    assert a is not b
+    assert a.lock is not b.lock
+    assert b.lobby_players == []
+
+def test_get_unknown_game():
+    registry = GameRegistry()
+    with pytest.raises(KeyError):
+        registry.get("missing")
+
+def test_remove_game():
+    registry = GameRegistry()
+    game_id = registry.create_game()
+    registry.remove(game_id)
+    assert game_id not in registry
+
+def test_max_games():
+    registry = GameRegistry(max_games=2)
+    registry.create_game()
+    registry.create_game()
+    with pytest.raises(RuntimeError):
+        registry.create_game()
+    with pytest.raises(RuntimeError):
+        registry.add("restored", GameManager())
+
+
+# ----------------------
+# Idle Eviction
+# ----------------------
+
+def test_evict_idle_games():
+    clock = FakeClock()
+    registry = GameRegistry(max_idle_seconds=10, clock=clock)
+    old = registry.create_game()
+    clock.now = 5
+    active = registry.create_game()
+    clock.now = 12
+    registry.get(active)  # touching keeps it alive
+
+    assert registry.evict_idle() == [old]
+    assert old not in registry
+    assert active in registry
+
+def test_create_evicts_to_make_room():
+    clock = FakeClock()
+    registry = GameRegistry(max_idle_seconds=10, max_games=1, clock=clock)
+    old = registry.create_game()
+    clock.now = 20
+    new = registry.create_game()
+    assert old not in registry
+    assert new in registry
+
+def test_changing_games_are_not_idle():
+    clock = FakeClock()
+    registry = GameRegistry(max_idle_seconds=10, clock=clock)
+    game_id = registry.create_game()
+    gm = registry.get(game_id)
+    clock.now = 8
+    gm.join_lobby("alice")  # e.g. via the matchmaker or the round timer
+
+    clock.now = 15
+    assert registry.evict_idle() == []
+    # rechecked one idle period after it was found active
+    clock.now = 26
+    assert registry.evict_idle() == [game_id]
+
+def test_watched_games_are_not_idle():
+    clock = FakeClock()
+    registry = GameRegistry(max_idle_seconds=10, clock=clock)
+    game_id = registry.create_game()
+    gm = registry.get(game_id)
+
+    async def watch():
+        sub, _ = gm.subscribe()
+        clock.now = 100
+        assert registry.evict_idle() == []
+        gm.events.unsubscribe(sub)
+
+    asyncio.run(watch())
+    clock.now = 200
+    assert registry.evict_idle() == [game_id]
+
+@pytest.mark.parametrize("logged", [True, False])
+def test_evicted_game_is_loaded_again(tmp_path, logged):
+    store = Store(str(tmp_path / "games.db"))
+    clock = FakeClock()
+    registry = GameRegistry(
+        max_idle_seconds=10, clock=clock, store=store, log_dir=str(tmp_path) if logged else None
+    )
+    game_id = registry.create_game()
+    gm = registry.get(game_id)
+    gm.join_lobby("alice")
+    gm.start_game(seed=0)
+    gm.submit_set("alice", gm.find_all_sets()[0], 1.5)
+    snapshot = gm.to_snapshot()
+    clock.now = 20
+    assert registry.evict_idle() == [game_id]
+    store.flush()
+
+    again = registry.get(game_id)
+    assert again is not gm
+    assert again.to_snapshot() == snapshot
+    assert registry.get(game_id) is again
+    store.close()
+
+def test_loading_respects_max_games(tmp_path):
+    store = Store(str(tmp_path / "games.db"))
+    clock = FakeClock()
+    registry = GameRegistry(max_idle_seconds=10, max_games=1, clock=clock, store=store)
+    evicted = registry.create_game()
+    clock.now = 20
+    registry.create_game()
+    store.flush()
+
+    with pytest.raises(RuntimeError):
+        registry.get(evicted)
+    with pytest.raises(KeyError):
+        registry.get("../missing")
+    store.close()
+
+def test_remove_evicted_game(tmp_path):
+    store = Store(str(tmp_path / "games.db"))
+    clock = FakeClock()
+    registry = GameRegistry(max_idle_seconds=10, clock=clock, store=store, log_dir=str(tmp_path))
+    game_id = registry.create_game()
+    registry.get(game_id).join_lobby("alice")
+    clock.now = 20
+    assert registry.evict_idle() == [game_id]
+    store.flush()
+    assert store.load_game(game_id).lobby_players == ["alice"]
+
+    registry.remove(game_id)
+    store.flush()
+    flush_logs()
+    assert store.load_game(game_id) is None
+    assert not (tmp_path / f"{game_id}.log").exists()
+    with pytest.raises(KeyError):
+        registry.get(game_id)
+    store.close()
@@ -0,0 +1,62 @@
+import pytest
+
+from app.history import RoundHistory
+
+
+def fill(history, rounds, start=1):
+    for r in range(start, start + rounds):
+        history.append(r, f"p{r % 3}", {f"p{r % 3}": r * 1.0, "other": r + 0.5})
+
+
+# --------------------
+# Append / Read
+# --------------------
+
+def test_append_and_read():
+    history = RoundHistory()
+    history.append(1, "alice", {"alice": 1.5, "bob": 2.0})
+    history.append(2, None, {})
+
+    assert len(history) == 2
+    assert history[0] == {"round": 1, "winner": "alice", "submissions": {"alice": 1.5, "bob": 2.0}}
+    assert history[-1] == {"round": 2, "winner": None, "submissions": {}}
+    assert list(history) == [history[0], history[1]]
+
+def test_rounds_must_be_consecutive():
+    history = RoundHistory()
+    history.append(3, "alice", {"alice": 1.0})
+    with pytest.raises(ValueError):
+        history.append(5, "alice", {"alice": 1.0})
+
+def test_index_out_of_range():
+    with pytest.raises(IndexError):
+        RoundHistory()[0]
+
+
+# --------------------
+# Paging
+# --------------------
+
+def test_last_and_page():
+    history = RoundHistory()
+    fill(history, 30)
+
+    assert [r["round"] for r in history.last(3)] == [28, 29, 30]
+    assert [r["round"] for r in history.page(after=0, limit=5)] == [1, 2, 3, 4, 5]
+    assert [r["round"] for r in history.page(after=27, limit=5)] == [28, 29, 30]
+    assert history.page(after=30) == []
+
+
+# --------------------
+# Bounded Memory
+# --------------------
+
+def test_oldest_rounds_dropped():
+    history = RoundHistory(max_rounds=100)
+    fill(history, 1000)
+
+    assert len(history) <= 125
+    assert history.last_round == 1000
+    assert history[-1] == {"round": 1000, "winner": "p1", "submissions": {"p1": 1000.0, "other": 1000.5}}
+    assert history[0]["round"] == history.first_round
+    assert history.page(after=0, limit=1)[0]["round"] == history.first_round
@@ -0,0 +1,261 @@
+import asyncio
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.leaderboard as board
+from app.game_manager import GameManager
+from app.leaderboard import Leaderboard, RankedList, aggregate_wins
+from app.main import app
+from app.persistence import Store
+
+client = TestClient(app)
+
+
+# --------------------
+# RankedList
+# --------------------
+
+def test_ranked_list_matches_sorted_list():
+    rng = random.Random(0)
+    ranked, expected = RankedList(load=4), []
+    for _ in range(2000):
+        key = rng.randrange(500)
+        if key in expected:
+            ranked.remove(key)
+            expected.remove(key)
+        else:
+            ranked.add(key)
+            expected.append(key)
+            expected.sort()
+
+        assert len(ranked) == len(expected)
+        if expected:
+            i = rng.randrange(len(expected))
+            assert ranked[i] == expected[i]
+            assert ranked.rank(expected[i]) == i
+            assert ranked.slice(i, i + 7) == expected[i:i + 7]
+    assert list(ranked) == expected
+
+
+def test_ranked_list_bulk_build():
+    keys = list(range(1000))
+    random.Random(1).shuffle(keys)
+    ranked = RankedList(keys, load=16)
+    assert list(ranked) == sorted(keys)
+    assert ranked[-1] == 999
+    assert ranked.rank(500) == 500
+    assert 1000 not in ranked
+
+
+def test_ranked_list_missing_keys():
+    ranked = RankedList([1, 3], load=2)
+    with pytest.raises(ValueError):
+        ranked.remove(2)
+    with pytest.raises(ValueError):
+        ranked.rank(4)
+    with pytest.raises(IndexError):
+        ranked[2]
+    assert ranked.slice(1, 10) == [3]
+    assert RankedList().slice(0, 5) == []
+
+
+# --------------------
+# Leaderboard
+# --------------------
+
+def test_metrics_order():
+    lb = Leaderboard()
+    for player, elapsed_time in [("alice", 5.0), ("alice", 1.0), ("bob", 2.0), ("carol", 9.0)]:
+        lb.record(player, elapsed_time)
+
+    assert [e["player"] for e in lb.top("wins", 10)] == ["alice", "bob", "carol"]
+    assert [e["player"] for e in lb.top("best_time", 10)] == ["alice", "bob", "carol"]
+    assert [e["player"] for e in lb.top("mean_time", 10)] == ["bob", "alice", "carol"]
+    assert lb.top("wins", 1)[0] == {
+        "rank": 1, "player": "alice", "wins": 2, "best_time": 1.0, "mean_time": 3.0,
+    }
+
+
+def test_rank_and_around():
+    lb = Leaderboard(["wins"])
+    for i in range(20):
+        for _ in range(i):
+            lb.record(f"p{i:02}", 1.0)
+
+    assert lb.rank("wins", "p19") == 1
+    assert lb.rank("wins", "p01") == 19
+    assert lb.rank("wins", "nobody") is None
+    assert [e["rank"] for e in lb.around("wins", "p10", 2)] == [8, 9, 10, 11, 12]
+    assert [e["player"] for e in lb.around("wins", "p19", 1)] == ["p19", "p18"]
+    assert [e["player"] for e in lb.top("wins", 5, offset=17)] == ["p02", "p01"]
+    assert lb.player("p19")["ranks"] == {"wins": 1}
+
+
+def test_metric_configuration():
+    with pytest.raises(ValueError):
+        Leaderboard(["speed"])
+    lb = Leaderboard(["wins"])
+    lb.record("alice", 1.0)
+    with pytest.raises(ValueError):
+        lb.top("best_time", 10)
+
+
+def test_rebuild_matches_incremental():
+    rng = random.Random(2)
+    wins = [(f"p{rng.randrange(50)}", rng.uniform(1, 30)) for _ in range(500)]
+    incremental = Leaderboard()
+    for player, elapsed_time in wins:
+        incremental.record(player, elapsed_time)
+    rebuilt = Leaderboard()
+    rebuilt.rebuild(aggregate_wins(wins))
+
+    for metric in ("wins", "best_time", "mean_time"):
+        assert rebuilt.top(metric, 100) == pytest.approx(incremental.top(metric, 100))
+
+
+# --------------------
+# Integration
+# --------------------
+
+def play_round(gm, winner, loser):
+    cards = gm.find_all_sets()[0]
+    gm.submit_and_resolve(winner, cards, 1.5)
+    gm.submit_and_resolve(loser, cards, 2.5)
+
+
+def test_resolved_rounds_feed_leaderboard():
+    gm = GameManager()
+    gm.leaderboard = Leaderboard()
+    gm.join_lobby("alice")
+    gm.join_lobby("bob")
+    gm.start_game(seed=3)
+    play_round(gm, "alice", "bob")
+
+    assert gm.leaderboard.player("alice")["wins"] == 1
+    assert gm.leaderboard.player("bob") is None
+
+
+def test_store_keeps_results_of_deleted_games(tmp_path):
+    store = Store(str(tmp_path / "games.db"))
+    gm = GameManager()
+    gm.leaderboard = None
+    gm.attach_store("g1", store)
+    gm.join_lobby("alice")
+    gm.join_lobby("bob")
+    gm.start_game(seed=3)
+    play_round(gm, "alice", "bob")
+    play_round(gm, "alice", "bob")
+    store.delete_game("g1")
+    store.flush()
+
+    assert store.load_results() == [("alice", 2, 1.5, 3.0)]
+    store.close()
+
+
+
+def test_store_reports_changed_results(tmp_path):
+    store = Store(str(tmp_path / "games.db"))
+    store.save_round("g1", 1, "alice", 1.5)
+    store.save_round("g1", 2, "bob", 2.0)
+    store.flush()
+    results, seq = store.load_results_since(0)
+    assert sorted(results) == [("alice", 1, 1.5, 1.5), ("bob", 1, 2.0, 2.0)]
+
+    store.save_round("g1", 3, "alice", 1.0)
+    store.flush()
+    assert store.load_results_since(seq)[0] == [("alice", 2, 1.0, 2.5)]
+    assert store.load_results_since(store.load_results_since(seq)[1]) == ([], seq + 1)
+    store.close()
+
+
+def test_update_matches_rebuild():
+    rng = random.Random(4)
+    wins = [(f"p{rng.randrange(50)}", rng.uniform(1, 30)) for _ in range(500)]
+    updated = Leaderboard()
+    for i in range(0, len(wins), 50):
+        # totals so far of the players who won in this chunk
+        totals = {r[0]: r for r in aggregate_wins(wins[:i + 50])}
+        updated.update(totals[player] for player in {p for p, _ in wins[i:i + 50]})
+    rebuilt = Leaderboard()
+    rebuilt.rebuild(aggregate_wins(wins))
+
+    for metric in ("wins", "best_time", "mean_time"):
+        assert updated.top(metric, 100) == pytest.approx(rebuilt.top(metric, 100))
+
+
+def test_follow_picks_up_other_processes_wins(tmp_path):
+    # two stores on one database stand in for two shards
+    path = str(tmp_path / "games.db")
+    mine, other = Store(path), Store(path)
+    other.save_round("g1", 1, "alice", 1.5)
+    other.flush()
+    lb = Leaderboard()
+    results, seq = mine.load_results_since(0)
+    lb.rebuild(results)
+    other.save_round("g2", 1, "alice", 1.0)
+    other.save_round("g2", 2, "bob", 2.0)
+    other.flush()
+
+    async def scenario():
+        task = asyncio.get_running_loop().create_task(
+            board.follow_results(lb, mine.load_results_since, seq, 0.01)
+        )
+        for _ in range(100):
+            if len(lb) == 2:
+                break
+            await asyncio.sleep(0.01)
+        task.cancel()
+
+    asyncio.run(scenario())
+    assert lb.player("alice")["wins"] == 2
+    assert lb.player("bob")["wins"] == 1
+    mine.close()
+    other.close()
+
+
+def test_failed_follow_keeps_contents(caplog):
+    lb = Leaderboard()
+    lb.record("alice", 1.0)
+
+    def load_since(seq):
+        raise RuntimeError("database is locked")
+
+    async def scenario():
+        task = asyncio.get_running_loop().create_task(board.follow_results(lb, load_since, 0, 0.001))
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+    asyncio.run(scenario())
+    assert "Failed to reload the leaderboard" in caplog.text
+    assert lb.player("alice")["wins"] == 1
+
+# --------------------
+# API
+# --------------------
+
+@pytest.fixture
+def api_board(monkeypatch):
+    lb = Leaderboard()
+    monkeypatch.setattr(board, "global_leaderboard", lb)
+    for i in range(10):
+        for _ in range(i + 1):
+            lb.record(f"p{i}", float(10 - i))
+    return lb
+
+
+def test_api_top(api_board):
+    data = client.get("/leaderboard", params={"metric": "best_time", "limit": 3}).json()
+    assert data["players"] == 10
+    assert [e["player"] for e in data["entries"]] == ["p9", "p8", "p7"]
+    assert client.get("/leaderboard", params={"metric": "speed"}).status_code == 400
+
+
+def test_api_player_and_around(api_board):
+    data = client.get("/leaderboard/p5").json()
+    assert data["ranks"] == {"wins": 5, "best_time": 5, "mean_time": 5}
+    assert client.get("/leaderboard/nobody").status_code == 404
+
+    data = client.get("/leaderboard/p5/around", params={"radius": 1}).json()
+    assert [e["player"] for e in data["entries"]] == ["p6", "p5", "p4"]
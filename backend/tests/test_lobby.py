@@ -1,5 +1,6 @@
 import pytest
-from app.game_manager import GameManager
+from app.event_log import EventLog
+from app.game_manager import MAX_NAME_LENGTH, GameManager
 
 # --------------------
 # Lobby Joining
@@ -17,6 +18,14 @@ def test_join_lobby_duplicate_name_fails():
     with pytest.raises(ValueError):
         gm.join_lobby("Alice")
 
+def test_join_lobby_long_name_fails():
+    gm = GameManager()
+    gm.attach_log(EventLog())
+    with pytest.raises(ValueError):
+        gm.join_lobby("x" * (MAX_NAME_LENGTH + 1))
+    assert gm.lobby_players == []
+    assert gm.log.count == 0
+
 def test_join_lobby_after_start_fails():
     gm = GameManager()
     gm.join_lobby("Alice")
@@ -32,7 +41,7 @@ def test_start_game_moves_players_and_deals_board():
     gm = GameManager()
     gm.join_lobby("Alice")
     gm.join_lobby("Bob")
-    gm.start_game()
+    gm.start_game(seed=0)
 
     assert gm.state == "running"
     assert "Alice" in gm.game.players
@@ -0,0 +1,196 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.routes.matchmaking as routes
+from app.game_registry import GameRegistry
+from app.main import app
+from app.matchmaking import Matchmaker
+
+client = TestClient(app)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def registry():
+    return GameRegistry()
+
+
+@pytest.fixture
+def matchmaker(registry, clock):
+    return Matchmaker(registry, game_size=3, max_wait=10.0, min_players=2, assignment_ttl=60.0, clock=clock)
+
+
+# --------------------
+# Queue
+# --------------------
+
+def test_full_group_starts_game(matchmaker, registry):
+    assert matchmaker.join("alice") is None
+    assert matchmaker.join("bob") is None
+    game_id = matchmaker.join("carol")
+
+    assert game_id in registry
+    gm = registry.get(game_id)
+    assert gm.state == "running"
+    assert list(gm.game.players) == ["alice", "bob", "carol"]
+    assert len(matchmaker) == 0
+    for name in ("alice", "bob", "carol"):
+        assert matchmaker.status(name) == {"status": "matched", "game_id": game_id}
+
+
+def test_players_are_matched_in_arrival_order(matchmaker, registry):
+    names = [f"p{i}" for i in range(7)]
+    game_ids = [g for g in (matchmaker.join(n) for n in names) if g]
+
+    assert [list(registry.get(g).game.players) for g in game_ids] == [names[:3], names[3:6]]
+    assert "p6" in matchmaker
+    assert matchmaker.status("p6")["status"] == "queued"
+
+
+def test_duplicate_join_rejected(matchmaker):
+    matchmaker.join("alice")
+    with pytest.raises(ValueError):
+        matchmaker.join("alice")
+
+
+def test_long_name_rejected(matchmaker):
+    with pytest.raises(ValueError):
+        matchmaker.join("x" * 65536)
+    assert len(matchmaker) == 0
+
+
+def test_leave(matchmaker):
+    matchmaker.join("alice")
+    matchmaker.leave("alice")
+    assert "alice" not in matchmaker
+    with pytest.raises(KeyError):
+        matchmaker.leave("alice")
+    with pytest.raises(KeyError):
+        matchmaker.status("alice")
+
+
+def test_rejoin_after_match_queues_again(matchmaker):
+    for name in ("alice", "bob", "carol"):
+        matchmaker.join(name)
+    matchmaker.join("alice")
+    assert matchmaker.status("alice")["status"] == "queued"
+
+
+def test_invalid_sizes(registry):
+    with pytest.raises(ValueError):
+        Matchmaker(registry, game_size=2, min_players=3)
+
+
+# --------------------
+# Max Wait
+# --------------------
+
+def test_tick_starts_partial_game_after_max_wait(matchmaker, registry, clock):
+    matchmaker.join("alice")
+    clock.now = 5.0
+    matchmaker.join("bob")
+    assert matchmaker.tick() == []
+
+    clock.now = 10.0
+    [game_id] = matchmaker.tick()
+    assert list(registry.get(game_id).game.players) == ["alice", "bob"]
+    assert len(matchmaker) == 0
+
+
+def test_tick_waits_for_min_players(matchmaker, clock):
+    matchmaker.join("alice")
+    clock.now = 100.0
+    assert matchmaker.tick() == []
+    assert matchmaker.status("alice") == {"status": "queued", "waited": 100.0}
+
+
+def test_matches_expire(matchmaker, clock):
+    for name in ("alice", "bob", "carol"):
+        matchmaker.join(name)
+    clock.now = 61.0
+    matchmaker.tick()
+    with pytest.raises(KeyError):
+        matchmaker.status("alice")
+
+
+def test_full_registry_keeps_players_queued(clock):
+    registry = GameRegistry(max_games=0)
+    matchmaker = Matchmaker(registry, game_size=2, clock=clock)
+    matchmaker.join("alice")
+    assert matchmaker.join("bob") is None
+    assert len(matchmaker) == 2
+
+    registry.max_games = 1
+    clock.now = 60.0
+    assert len(matchmaker.tick()) == 1
+    assert len(matchmaker) == 0
+
+
+def test_run_survives_failing_tick(matchmaker, monkeypatch, caplog):
+    calls = []
+
+    def tick():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        return []
+    monkeypatch.setattr(matchmaker, "tick", tick)
+
+    async def scenario():
+        task = asyncio.get_running_loop().create_task(matchmaker.run(interval=0.001))
+        while len(calls) < 2:
+            await asyncio.sleep(0.001)
+        task.cancel()
+
+    asyncio.run(scenario())
+    assert "Matchmaking tick failed" in caplog.text
+
+
+# --------------------
+# API
+# --------------------
+
+@pytest.fixture
+def api_matchmaker(monkeypatch, registry, clock):
+    mm = Matchmaker(registry, game_size=2, max_wait=10.0, clock=clock)
+    monkeypatch.setattr(routes, "matchmaker", mm)
+    return mm
+
+
+def test_api_join_and_poll(api_matchmaker, registry):
+    res = client.post("/matchmaking/join", json={"name": "alice"})
+    assert res.status_code == 202
+    assert res.json()["status"] == "queued"
+    assert client.get("/matchmaking").json()["queued"] == 1
+
+    res = client.post("/matchmaking/join", json={"name": "bob"})
+    game_id = res.json()["game_id"]
+    assert res.json() == {"status": "matched", "game_id": game_id}
+    assert client.get("/matchmaking/alice").json() == {"status": "matched", "game_id": game_id}
+    assert registry.get(game_id).state == "running"
+
+
+def test_api_duplicate_join(api_matchmaker):
+    client.post("/matchmaking/join", json={"name": "alice"})
+    assert client.post("/matchmaking/join", json={"name": "alice"}).status_code == 400
+
+
+def test_api_leave(api_matchmaker):
+    client.post("/matchmaking/join", json={"name": "alice"})
+    assert client.delete("/matchmaking/alice").status_code == 204
+    assert client.delete("/matchmaking/alice").status_code == 404
+    assert client.get("/matchmaking/alice").status_code == 404
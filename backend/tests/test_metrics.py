@@ -0,0 +1,94 @@
+import threading
+
+from fastapi.testclient import TestClient
+
+from app import metrics
+from app.game_manager import GameManager
+from app.main import app
+from app.metrics import Counter, Gauge, Histogram, SUBMISSIONS
+
+client = TestClient(app)
+
+
+def unregistered(metric):
+    metrics.REGISTRY.remove(metric)
+    return metric
+
+
+# --------------------
+# Metric Types
+# --------------------
+
+def test_counter_sums_threads():
+    counter = unregistered(Counter("test_total", "help", ["kind"]))
+
+    def work():
+        for _ in range(1000):
+            counter.inc("a")
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    counter.inc("b", amount=2)
+
+    assert counter.value("a") == 4000
+    assert counter.render() == [
+        "# HELP test_total help",
+        "# TYPE test_total counter",
+        'test_total{kind="a"} 4000',
+        'test_total{kind="b"} 2',
+    ]
+
+def test_histogram_buckets_are_cumulative():
+    histogram = unregistered(Histogram("test_seconds", "help", buckets=(0.1, 1.0)))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+    assert histogram.samples() == [
+        'test_seconds_bucket{le="0.1"} 2',
+        'test_seconds_bucket{le="1.0"} 3',
+        'test_seconds_bucket{le="+Inf"} 4',
+        "test_seconds_sum 3.65",
+        "test_seconds_count 4",
+    ]
+    assert histogram.count() == 4
+
+def test_gauge_and_label_escaping():
+    gauge = unregistered(Gauge("test_gauge", "help", ["name"], lambda: {('a"b\\',): 3}))
+    assert gauge.samples() == ['test_gauge{name="a\\"b\\\\"} 3']
+
+
+# --------------------
+# Game Metrics
+# --------------------
+
+def test_submissions_counted_by_reason():
+    gm = GameManager()
+    gm.join_lobby("alice")
+    gm.start_game(seed=0)
+    before = {r: SUBMISSIONS.value(r) for r in ("accepted", "unknown_player", "invalid_cards", "not_a_set", "not_on_board")}
+
+    sets = gm.find_all_sets()
+    off_board = [c for c in range(81) if c not in [card.code for card in gm.game.board]][:3]
+    on_board = [card.code for card in gm.game.board]
+    not_a_set = next(
+        [a, b, c] for a in on_board for b in on_board for c in on_board
+        if len({a, b, c}) == 3 and sorted([a, b, c]) not in [sorted(s) for s in sets]
+    )
+    gm.submit_set("mallory", sets[0], 1.0)
+    gm.submit_set("alice", [1, 1, 2], 1.0)
+    gm.submit_set("alice", off_board, 1.0)
+    gm.submit_set("alice", not_a_set, 1.0)
+    gm.submit_set("alice", sets[0], 1.0)
+
+    for reason in before:
+        assert SUBMISSIONS.value(reason) == before[reason] + 1
+
+def test_metrics_endpoint():
+    client.get("/game/state")
+    res = client.get("/metrics")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'set_http_request_duration_seconds_count{method="GET",route="/game/state",status="200"}' in res.text
+    assert "# TYPE set_games gauge" in res.text
@@ -0,0 +1,192 @@
+import pytest
+from sqlalchemy import event, func, select
+
+from app.game_registry import GameRegistry
+from app.persistence import Store, games_table, submissions_table
+
+
+def play_round(gm):
+    sets = gm.find_all_sets()
+    if not sets:
+        return False
+    for i, player in enumerate(gm.game.players):
+        gm.submit_and_resolve(player, sets[0], float(i + 1))
+    return True
+
+
+def make_store(tmp_path, **kwargs):
+    return Store(str(tmp_path / "games.db"), **kwargs)
+
+
+# ----------------------
+# Save / Restore
+# ----------------------
+
+def test_restore_running_game(tmp_path):
+    store = make_store(tmp_path)
+    registry = GameRegistry(store=store)
+    game_id = registry.create_game()
+    gm = registry.get(game_id)
+    gm.join_lobby("alice")
+    gm.join_lobby("bob")
+    gm.start_game()
+    for _ in range(3):
+        play_round(gm)
+    # pending submission in the current round
+    sets = gm.find_all_sets()
+    if sets:
+        gm.submit_set("alice", sets[0], 4.0)
+    store.close()
+
+    restored = make_store(tmp_path).load_games()
+    assert set(restored) == {game_id}
+    again = restored[game_id]
+    assert again.get_state() == gm.get_state()
+    assert again.game.deck == gm.game.deck
+    assert again.game.submissions == gm.game.submissions
+    assert again.seed == gm.seed
+    assert again.deck_order == gm.deck_order
+    restored_stats, live_stats = again.get_stats()["overall"], gm.get_stats()["overall"]
+    assert restored_stats["count"] == live_stats["count"]
+    if live_stats["count"]:
+        assert restored_stats["mean"] == pytest.approx(live_stats["mean"])
+
+def test_restore_lobby_game(tmp_path):
+    store = make_store(tmp_path)
+    registry = GameRegistry(store=store)
+    game_id = registry.create_game()
+    registry.get(game_id).join_lobby("alice")
+    store.close()
+
+    restored = make_store(tmp_path).load_games()
+    assert restored[game_id].get_state() == {"state": "lobby", "players": ["alice"]}
+
+def test_removed_games_are_deleted(tmp_path):
+    store = make_store(tmp_path)
+    registry = GameRegistry(store=store)
+    kept = registry.create_game()
+    dropped = registry.create_game()
+    registry.remove(dropped)
+    store.close()
+
+    assert set(make_store(tmp_path).load_games()) == {kept}
+
+def test_wal_mode(tmp_path):
+    store = make_store(tmp_path)
+    with store.engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+    store.close()
+
+
+# ----------------------
+# Write-behind Batching
+# ----------------------
+
+def test_writes_are_batched(tmp_path):
+    store = make_store(tmp_path, flush_interval=0.2)
+    commits = []
+    event.listen(store.engine, "commit", lambda conn: commits.append(1))
+
+    registry = GameRegistry(store=store)
+    gm = registry.get(registry.create_game())
+    for i in range(50):
+        gm.join_lobby(f"player{i}")
+    gm.start_game()
+    for _ in range(5):
+        play_round(gm)
+    store.flush()
+
+    assert len(commits) <= 2
+    with store.engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(games_table)).scalar() == 1
+        submitted = conn.execute(select(func.count()).select_from(submissions_table)).scalar()
+    assert submitted == 50 * len(gm.game.history)
+    store.close()
+
+
+def test_failed_batch_keeps_writer_alive(tmp_path, caplog):
+    store = make_store(tmp_path, flush_interval=0.01)
+    write_batch = store._write_batch
+    calls = []
+
+    def fail_once(batch):
+        calls.append(batch)
+        if len(calls) == 1:
+            raise RuntimeError("disk full")
+        write_batch(batch)
+
+    store._write_batch = fail_once
+    registry = GameRegistry(store=store)
+    lost = registry.create_game()
+    store.flush(timeout=5)  # returns despite the failure
+    assert "Dropped a batch" in caplog.text
+
+    kept = registry.create_game()
+    store.flush(timeout=5)
+    assert set(store.load_games()) == {kept}
+    assert lost in registry
+    store.close()
+
+
+def test_flush_times_out(tmp_path):
+    store = make_store(tmp_path, flush_interval=0.5)
+    with pytest.raises(TimeoutError):
+        store.flush(timeout=0.01)
+    store.close()
+
+
+# ----------------------
+# Server Restart
+# ----------------------
+
+def test_app_restores_games_on_startup(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    import app.main as main
+    import app.routes.games as games
+    from app.config import settings
+    from app.game_manager import GameManager
+
+    monkeypatch.setattr(settings, "database_path", str(tmp_path / "games.db"))
+    monkeypatch.setattr(main, "gm", GameManager())
+    monkeypatch.setattr(games, "registry", GameRegistry())
+
+    with TestClient(main.app) as client:
+        client.post("/lobby/join", json={"name": "Alice"})
+        game_id = client.post("/games").json()["game_id"]
+        client.post(f"/games/{game_id}/join", json={"name": "Bob"})
+        client.post(f"/games/{game_id}/start")
+        before = client.get(f"/games/{game_id}/state").json()
+
+    monkeypatch.setattr(main, "gm", GameManager())
+    monkeypatch.setattr(games, "registry", GameRegistry())
+
+    with TestClient(main.app) as client:
+        assert client.get("/game/state").json() == {"state": "lobby", "players": ["Alice"]}
+        assert client.get(f"/games/{game_id}/state").json() == before
+
+def test_app_restores_at_most_max_games(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    import app.main as main
+    import app.routes.games as games
+    from app.config import settings
+    from app.game_manager import GameManager
+
+    monkeypatch.setattr(settings, "database_path", str(tmp_path / "games.db"))
+    monkeypatch.setattr(main, "gm", GameManager())
+    monkeypatch.setattr(games, "registry", GameRegistry())
+
+    with TestClient(main.app) as client:
+        game_ids = [client.post("/games").json()["game_id"] for _ in range(6)]
+
+    monkeypatch.setattr(main, "gm", GameManager())
+    monkeypatch.setattr(games, "registry", GameRegistry(max_games=3))
+
+    with TestClient(main.app) as client:
+        assert len(games.registry) == 3
+        # the others are loaded once looked up, after the idle ones make room
+        games.registry.max_idle_seconds = 0
+        for game_id in game_ids:
+            assert client.get(f"/games/{game_id}/state").status_code == 200
+        assert len(games.registry) <= 3
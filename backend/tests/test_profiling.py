@@ -0,0 +1,149 @@
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app import profiling
+from app.config import settings
+from app.game_manager import GameManager
+from app.main import app
+from app.profiling import ProfilerBusy, collapsed, sample_stacks
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(main, "gm", GameManager())
+    profiling.slow_requests.clear()
+    yield
+    profiling.slow_requests.clear()
+
+
+def spin(stop):
+    while not stop.is_set():
+        sum(range(100))
+
+
+# --------------------
+# Sampling Profiler
+# --------------------
+
+def test_sample_stacks_sees_other_threads():
+    stop = threading.Event()
+    worker = threading.Thread(target=spin, args=(stop,), name="spinner")
+    worker.start()
+    try:
+        counts = sample_stacks(0.1, interval=0.002)
+    finally:
+        stop.set()
+        worker.join()
+
+    spinner = {stack: n for stack, n in counts.items() if stack.startswith("spinner;")}
+    assert spinner
+    assert any("spin (test_profiling.py:" in stack for stack in spinner)
+    # the sampling thread never samples itself
+    assert not any("sample_stacks" in stack for stack in counts)
+
+
+def test_only_one_profile_at_a_time():
+    started = threading.Event()
+
+    def run():
+        started.set()
+        sample_stacks(0.2)
+
+    worker = threading.Thread(target=run)
+    worker.start()
+    started.wait()
+    time.sleep(0.02)
+    try:
+        with pytest.raises(ProfilerBusy):
+            sample_stacks(0.01)
+    finally:
+        worker.join()
+
+
+def test_collapsed_format():
+    assert collapsed({"main;a;b": 2, "main;a": 5}) == "main;a 5\nmain;a;b 2\n"
+
+
+# --------------------
+# Slow Requests
+# --------------------
+
+def submit_first_set():
+    client.post("/lobby/join", json={"name": "alice"})
+    client.post("/lobby/start", params={"seed": 1})
+    cards = main.gm.find_all_sets()[0]
+    return client.post("/game/submit", json={"player": "alice", "cards": cards, "elapsed_time": 1.0})
+
+
+def test_slow_request_phases(monkeypatch):
+    monkeypatch.setattr(settings, "slow_request_ms", 0.0)
+    assert submit_first_set().status_code == 200
+
+    entry = profiling.recent_slow_requests()[0]
+    assert entry["method"] == "POST"
+    assert entry["path"] == "/game/submit"
+    assert entry["status"] == 200
+    assert set(entry["phases_ms"]) == {
+        "validation", "lock_wait", "submit_set", "try_resolve_round", "serialization",
+    }
+    assert sum(entry["phases_ms"].values()) <= entry["total_ms"]
+
+
+def test_fast_requests_not_logged(monkeypatch):
+    monkeypatch.setattr(settings, "slow_request_ms", 10_000.0)
+    submit_first_set()
+    assert profiling.recent_slow_requests() == []
+
+
+def test_phases_outside_requests_are_ignored():
+    gm = GameManager()
+    gm.join_lobby("alice")
+    gm.start_game(1)
+    with profiling.phase("anything"):
+        pass
+    with profiling.locked(gm.lock):
+        assert gm.submit_set("alice", gm.find_all_sets()[0], 1.0)
+
+
+# --------------------
+# Admin Endpoints
+# --------------------
+
+def test_admin_endpoints_require_token(monkeypatch):
+    monkeypatch.setattr(settings, "admin_token", "secret")
+    assert client.post("/admin/profile", params={"seconds": 0.01}).status_code == 403
+    res = client.get("/admin/slow-requests", headers={"X-Admin-Token": "wrong"})
+    assert res.status_code == 403
+
+
+def test_profile_endpoint(monkeypatch):
+    monkeypatch.setattr(settings, "admin_token", "secret")
+    res = client.post(
+        "/admin/profile",
+        params={"seconds": 0.05, "interval_ms": 1},
+        headers={"X-Admin-Token": "secret"},
+    )
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain")
+    lines = res.text.splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert ";" in stack and int(count) > 0
+
+
+def test_slow_requests_endpoint(monkeypatch):
+    monkeypatch.setattr(settings, "admin_token", "secret")
+    monkeypatch.setattr(settings, "slow_request_ms", 0.0)
+    submit_first_set()
+
+    res = client.get("/admin/slow-requests", headers={"X-Admin-Token": "secret"})
+    data = res.json()
+    assert data["threshold_ms"] == 0.0
+    # newest first: this request itself is logged only after its headers are sent
+    assert data["requests"][0]["path"] == "/game/submit"
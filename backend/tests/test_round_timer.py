@@ -0,0 +1,137 @@
+import asyncio
+
+from app.game_manager import GameManager
+from app.game_registry import GameRegistry
+from app.round_timer import RoundTimer
+
+
+def running_game(timer, players=("alice", "bob")):
+    gm = GameManager()
+    for name in players:
+        gm.join_lobby(name)
+    gm.attach_timer(timer)
+    gm.start_game(seed=0)
+    return gm
+
+
+def ticks(timer, count):
+    return sum(timer.tick_once() for _ in range(count))
+
+
+# --------------------
+# Wheel
+# --------------------
+
+def test_deadline_fires_after_timeout():
+    timer = RoundTimer(timeout=1.0, tick=0.1, slots=8)
+    gm = object()
+    timer.schedule(gm, 1)
+    assert gm in timer
+    assert not any(timer.advance() for _ in range(9))
+    assert timer.advance() == [(gm, 1)]
+    assert gm not in timer
+
+def test_reschedule_replaces_deadline():
+    timer = RoundTimer(timeout=0.5, tick=0.1, slots=4)
+    gm = object()
+    timer.schedule(gm, 1)
+    timer.advance()
+    timer.schedule(gm, 2)
+    assert len(timer) == 1
+    due = [d for _ in range(5) for d in timer.advance()]
+    assert due == [(gm, 2)]
+
+def test_cancel():
+    timer = RoundTimer(timeout=0.2, tick=0.1)
+    gm = object()
+    timer.schedule(gm, 1)
+    timer.cancel(gm)
+    timer.cancel(gm)
+    assert len(timer) == 0
+    assert not any(timer.advance() for _ in range(5))
+
+
+# --------------------
+# Games
+# --------------------
+
+def test_idle_player_no_longer_stalls_round():
+    timer = RoundTimer(timeout=1.0, tick=0.5)
+    gm = running_game(timer)
+    gm.submit_and_resolve("alice", gm.find_all_sets()[0], 3.0)
+    assert gm.game.round_number == 1
+
+    assert ticks(timer, 2) == 1
+    assert gm.game.round_number == 2
+    assert gm.game.history[-1]["winner"] == "alice"
+    assert gm.game.history[-1]["submissions"] == {"alice": 3.0}
+    # the next round has its own deadline
+    assert gm in timer
+
+def test_round_without_submissions_waits_again():
+    timer = RoundTimer(timeout=1.0, tick=0.5)
+    gm = running_game(timer)
+    assert ticks(timer, 2) == 1
+    assert gm.game.round_number == 1
+    assert gm in timer
+
+def test_full_submission_moves_deadline_to_next_round():
+    timer = RoundTimer(timeout=1.0, tick=0.5)
+    gm = running_game(timer)
+    ticks(timer, 1)
+    sets = gm.find_all_sets()
+    gm.submit_and_resolve("alice", sets[0], 1.0)
+    gm.submit_and_resolve("bob", sets[0], 2.0)
+    assert gm.game.round_number == 2
+    # the old deadline would have expired now, the new one has not
+    assert ticks(timer, 1) == 0
+    assert gm.game.round_number == 2
+
+def test_finished_and_removed_games_are_cancelled():
+    timer = RoundTimer(timeout=1.0)
+    registry = GameRegistry(timer=timer)
+    game_id = registry.create_game()
+    gm = registry.get(game_id)
+    gm.join_lobby("alice")
+    gm.start_game(seed=0)
+    assert gm in timer
+    registry.remove(game_id)
+    assert gm not in timer
+
+    gm = running_game(timer, players=("alice",))
+    while gm.state == "running":
+        gm.submit_and_resolve("alice", gm.find_all_sets()[0], 1.0)
+    assert gm not in timer
+
+def test_failing_game_does_not_stop_others(monkeypatch, caplog):
+    timer = RoundTimer(timeout=1.0, tick=0.5)
+    broken, gm = running_game(timer), running_game(timer)
+    for game in (broken, gm):
+        game.submit_set("alice", game.find_all_sets()[0], 1.0)
+
+    def fail():
+        raise RuntimeError("boom")
+    monkeypatch.setattr(broken, "_resolve_round", fail)
+
+    assert ticks(timer, 2) == 2
+    assert gm.game.round_number == 2
+    assert "Failed to expire round 1" in caplog.text
+    # the broken round is retried at its next deadline
+    assert broken in timer
+
+def test_task_resolves_in_real_time():
+    async def scenario():
+        timer = RoundTimer(timeout=0.05, tick=0.01)
+        gm = running_game(timer)
+        gm.submit_set("alice", gm.find_all_sets()[0], 1.0)
+        timer.start()
+        try:
+            for _ in range(100):
+                if gm.game.round_number == 2:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await timer.stop()
+        return gm.game.round_number
+
+    assert asyncio.run(scenario()) == 2
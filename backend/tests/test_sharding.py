@@ -0,0 +1,88 @@
+import asyncio
+from collections import Counter
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+
+from app.config import settings
+from app.game_registry import GameRegistry
+from app.sharding import DEFAULT_GAME_ID, ShardRouter, owns, shard_for
+
+
+def shard_app(index):
+    app = FastAPI()
+
+    @app.api_route("/{path:path}", methods=["GET", "POST"])
+    async def echo(path: str, request: Request):
+        return {"shard": index, "path": path, "query": request.url.query, "body": (await request.body()).decode()}
+
+    return app
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def request(router, method, url, **kwargs):
+    transport = httpx.ASGITransport(app=router)
+    async with httpx.AsyncClient(transport=transport, base_url="http://router") as client:
+        return await client.request(method, url, **kwargs)
+
+
+# --------------------
+# Partitioning
+# --------------------
+
+def test_shard_for_is_stable_and_spread():
+    assert shard_for("abc", 4) == shard_for("abc", 4)
+    counts = Counter(shard_for(f"game{i}", 4) for i in range(4000))
+    assert set(counts) == {0, 1, 2, 3}
+    assert min(counts.values()) > 800
+
+def test_registry_only_creates_owned_games(monkeypatch):
+    monkeypatch.setattr(settings, "shard_count", 3)
+    monkeypatch.setattr(settings, "shard_index", 1)
+    registry = GameRegistry()
+    ids = [registry.create_game() for _ in range(20)]
+    assert all(shard_for(game_id, 3) == 1 for game_id in ids)
+    assert owns(ids[0])
+
+def test_unsharded_owns_everything():
+    assert owns("anything")
+
+
+# --------------------
+# Router
+# --------------------
+
+def test_router_forwards_to_owning_shard():
+    router = ShardRouter([httpx.ASGITransport(app=shard_app(i)) for i in range(3)])
+
+    res = run(request(router, "POST", "/games/xyz/submit", params={"a": "1"}, content=b"payload"))
+    assert res.status_code == 200
+    assert res.json() == {"shard": shard_for("xyz", 3), "path": "games/xyz/submit", "query": "a=1", "body": "payload"}
+
+    default_shard = shard_for(DEFAULT_GAME_ID, 3)
+    for url in ("/lobby/join", "/game/state", "/stats", "/matchmaking/join"):
+        assert run(request(router, "GET", url)).json()["shard"] == default_shard
+
+    # requests without a game are spread over the shards
+    assert {run(request(router, "POST", "/games")).json()["shard"] for _ in range(3)} == {0, 1, 2}
+
+@pytest.mark.parametrize("url", ["/metrics", "/admin/profile", "/admin/slow-requests"])
+def test_router_pins_per_process_routes(url):
+    router = ShardRouter([httpx.ASGITransport(app=shard_app(i)) for i in range(3)])
+
+    for shard in range(3):
+        res = run(request(router, "GET", url, params={"shard": shard}))
+        assert res.json()["shard"] == shard
+    default_shard = shard_for(DEFAULT_GAME_ID, 3)
+    assert {run(request(router, "GET", url)).json()["shard"] for _ in range(3)} == {default_shard}
+    for shard in ("3", "-1", "x"):
+        assert run(request(router, "GET", url, params={"shard": shard})).status_code == 400
+
+def test_router_reports_unavailable_shard():
+    router = ShardRouter.for_sockets(["/nonexistent/shard-0.sock"])
+    res = run(request(router, "GET", "/games/abc/state"))
+    assert res.status_code == 502
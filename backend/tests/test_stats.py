@@ -0,0 +1,107 @@
+import random
+import statistics
+
+import pytest
+
+from app.game_manager import GameManager
+from app.stats import QuantileSketch, StatsAggregator, TimeStats
+
+
+# --------------------
+# Quantile Sketch
+# --------------------
+
+def test_sketch_relative_accuracy():
+    rng = random.Random(1)
+    values = sorted(rng.lognormvariate(1, 1) for _ in range(10_000))
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for v in values:
+        sketch.add(v)
+
+    for q in (0.5, 0.9, 0.99):
+        exact = values[int(q * (len(values) - 1))]
+        assert sketch.quantile(q) == pytest.approx(exact, rel=0.011)
+
+def test_sketch_empty_and_zero():
+    sketch = QuantileSketch()
+    assert sketch.quantile(0.5) is None
+    sketch.add(0.0)
+    assert sketch.quantile(0.5) == 0.0
+
+
+# --------------------
+# Time Stats
+# --------------------
+
+def test_time_stats_match_exact():
+    rng = random.Random(2)
+    values = [rng.uniform(0.5, 30) for _ in range(1000)]
+    stats = TimeStats()
+    for v in values:
+        stats.add(v)
+
+    assert stats.count == 1000
+    assert stats.min == min(values)
+    assert stats.max == max(values)
+    assert stats.mean == pytest.approx(statistics.fmean(values))
+    assert stats.variance == pytest.approx(statistics.pvariance(values))
+
+def test_time_stats_merge_and_extend():
+    rng = random.Random(3)
+    values = [rng.uniform(0.5, 30) for _ in range(1000)]
+    streamed, merged, bulk = TimeStats(), TimeStats(), TimeStats()
+    for v in values:
+        streamed.add(v)
+    left, right = TimeStats(), TimeStats()
+    for v in values[:300]:
+        left.add(v)
+    for v in values[300:]:
+        right.add(v)
+    merged.merge(left)
+    merged.merge(right)
+    bulk.extend(values)
+
+    for other in (merged, bulk):
+        assert other.count == streamed.count
+        assert other.mean == pytest.approx(streamed.mean)
+        assert other.variance == pytest.approx(streamed.variance)
+        assert other.summary()["p90"] == streamed.summary()["p90"]
+
+def test_empty_summary():
+    assert TimeStats().summary() == {"count": 0}
+
+
+# --------------------
+# Aggregator
+# --------------------
+
+def test_aggregator_record_and_rebuild():
+    records = [("alice", 1.0), ("bob", 2.0), ("alice", 3.0)]
+    streamed = StatsAggregator()
+    for player, t in records:
+        streamed.record(player, t)
+    rebuilt = StatsAggregator()
+    rebuilt.rebuild(records)
+
+    for agg in (streamed, rebuilt):
+        assert agg.player_summary("alice")["mean"] == 2.0
+        assert agg.player_summary("bob")["count"] == 1
+        assert agg.player_summary("carol") is None
+        assert agg.summary()["overall"]["count"] == 3
+        assert agg.summary(include_players=False) == {"overall": agg.overall.summary(), "player_count": 2}
+
+def test_game_records_submission_times():
+    gm = GameManager()
+    gm.join_lobby("alice")
+    gm.join_lobby("bob")
+    gm.start_game()
+    sets = gm.find_all_sets()
+    if not sets:
+        pytest.skip("Generated board has no set")
+    gm.submit_and_resolve("alice", sets[0], 1.0)
+    gm.submit_and_resolve("bob", sets[0], 3.0)
+
+    stats = gm.get_stats()
+    assert stats["overall"]["count"] == 2
+    assert stats["overall"]["mean"] == 2.0
+    assert stats["players"]["bob"]["max"] == 3.0
@@ -0,0 +1,62 @@
+import pytest
+
+from app.game_manager import GameManager
+from app.wire import (
+    decode_state, decode_submission, encode_state, encode_submission, read_varint,
+    write_varint,
+)
+
+
+def running_game():
+    gm = GameManager()
+    gm.join_lobby("alice")
+    gm.join_lobby("bøb")
+    gm.start_game(seed=0)
+    return gm
+
+
+def without_history(state):
+    return {k: v for k, v in state.items() if k != "history"}
+
+
+# --------------------
+# Primitives
+# --------------------
+
+@pytest.mark.parametrize("value", [0, 1, 127, 128, 300, 2**32, 2**63 - 1])
+def test_varint_roundtrip(value):
+    out = bytearray()
+    write_varint(out, value)
+    assert read_varint(bytes(out) + b"x", 0) == (value, len(out))
+
+def test_truncated_varint():
+    with pytest.raises(ValueError):
+        read_varint(b"\x80\x80", 0)
+
+
+# --------------------
+# State / Submissions
+# --------------------
+
+def test_lobby_state_roundtrip():
+    gm = GameManager()
+    gm.join_lobby("alice")
+    assert decode_state(encode_state(gm)) == gm.get_state()
+
+def test_running_state_roundtrip():
+    gm = running_game()
+    sets = gm.find_all_sets()
+    gm.submit_and_resolve("alice", sets[0], 1234.0)
+    gm.submit_and_resolve("bøb", sets[0], 2345.0)
+
+    encoded = encode_state(gm)
+    assert decode_state(encoded) == without_history(gm.get_state())
+    # one byte per board card, far below the JSON encoding
+    assert len(encoded) * 4 < len(gm.get_state_bytes()[0])
+
+def test_submission_roundtrip():
+    encoded = encode_submission("alice", [3, 40, 80], 8123.0)
+    assert len(encoded) == 3 + 2 + len("alice")
+    assert decode_submission(encoded) == ("alice", [3, 40, 80], 8123.0)
+    with pytest.raises(ValueError):
+        decode_submission(b"\x01\x02")
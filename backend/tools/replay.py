@@ -0,0 +1,42 @@
+"""
+Reconstructs a game from its event log.
+
+    python -m tools.replay logs/abc123.log                 # final state
+    python -m tools.replay logs/abc123.log --round 5       # state at the start of round 5
+    python -m tools.replay logs/abc123.log --verify        # full replay vs snapshot recovery
+    python -m tools.replay logs/abc123.log --events        # dump the decoded events
+"""
+import argparse
+import json
+import sys
+
+from app.event_log import EventLog, decode_events, replay, verify
+
+_NAMES = {1: "join", 2: "start", 3: "submit", 4: "resolve"}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("log", help="path of the game's .log file")
+    parser.add_argument("--round", type=int, help="stop when this round is reached")
+    parser.add_argument("--verify", action="store_true", help="check that replay is deterministic")
+    parser.add_argument("--events", action="store_true", help="print the decoded events")
+    args = parser.parse_args()
+
+    log = EventLog.open(args.log)
+    if args.events:
+        for offset, (kind, value) in decode_events(log.buffer):
+            print(json.dumps({"end": offset, "type": _NAMES[kind], "value": value}))
+        return 0
+
+    if args.verify:
+        report = verify(log)
+        print(json.dumps(report, indent=2))
+        return 0 if report["deterministic"] else 1
+
+    print(json.dumps(replay(log, args.round).get_state(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())